@@ -1,26 +1,33 @@
+import os
+import asyncio
 from typing import List
 import time
 import logging
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from ai_operations.chains import *
-from ai_operations.utility_function import create_resume_score, get_summary_overview, \
-                                           extract_yoe, extract_recruiters_overview, \
-                                           company_extractor
+from starlette.datastructures import MutableHeaders
+from ai_operations.analysis_engine import run_section, stream_analysis, ANALYSIS_SECTIONS
+from ai_operations.chains import warm_up, chains_status
+from ai_operations.llm_cache import llm_cache
+from ai_operations.execution import scheduler_status, execution_stats
+from ai_operations.text_preprocessing import preprocessing_stats
+from ai_operations.fast_path import fast_path_stats
+from ai_operations.model_router import router_stats
+from ai_operations.single_flight import single_flight
+from ai_operations.bulk_jobs import bulk_import_jobs
+from ai_operations.utils import prompt_registry
 from db_operations.utility_db import *
+from db_operations.records import dumps_json
+from db_operations.database import async_engine, pool_status
 import structlog
 structlogger = structlog.get_logger(__name__)
 
 # Configure logging to suppress socket.io 404 logs
 logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
 
-resume_score_agent, resume_score_prompt = create_resume_score()
-summary_agent, summary_prompt = get_summary_overview()
-yoe_agent, yoe_prompt = extract_yoe()
-recruiters_overview_agent, recruiters_overview_prompt = extract_recruiters_overview()
-company_extractor_agent, company_extractor_prompt = company_extractor()
-
 # Create custom middleware to filter out socket.io requests from logs
 class SocketIOFilterMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -29,6 +36,64 @@ class SocketIOFilterMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
         return await call_next(request)
 
+class StreamingGZipMiddleware:
+    """
+    GZip, except for streams read as they arrive: SSE, and NDJSON from `live_paths`. Those
+    go out uncompressed, since gzip holds small chunks back until its buffer fills, so
+    streamed sections would arrive together at the end instead of as each one finishes.
+    Bulk NDJSON exports (e.g. /getAllCandidates) are still compressed.
+    """
+    LIVE_TYPES = ("text/event-stream",)
+    LIVE_PATH_TYPES = ("application/x-ndjson",)
+
+    def __init__(self, app, minimum_size: int = 1024, live_paths = ("/analyzeResume",)):
+        self.app = app
+        self.live_paths = tuple(live_paths)
+        # GZipMiddleware passes through responses that already have a Content-Encoding, so
+        # streams are marked "identity" on the way in and unmarked on the way out
+        self.gzip = GZipMiddleware(self.mark_streams, minimum_size=minimum_size)
+
+    @staticmethod
+    def _start_headers(message):
+        return MutableHeaders(raw=list(message["headers"]))
+
+    async def mark_streams(self, scope, receive, send):
+
+        live_types = self.LIVE_TYPES + (self.LIVE_PATH_TYPES if scope["path"] in self.live_paths else ())
+
+        async def send_marked(message):
+            if message["type"] == "http.response.start":
+                headers = self._start_headers(message)
+                if headers.get("content-type", "").startswith(live_types):
+                    headers["content-encoding"] = "identity"
+                    message = {**message, "headers": headers.raw}
+            await send(message)
+
+        await self.app(scope, receive, send_marked)
+
+    async def __call__(self, scope, receive, send):
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_unmarked(message):
+            if message["type"] == "http.response.start":
+                headers = self._start_headers(message)
+                if headers.get("content-encoding") == "identity":
+                    del headers["content-encoding"]
+                    message = {**message, "headers": headers.raw}
+            await send(message)
+
+        await self.gzip(scope, receive, send_unmarked)
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson when available, skipping FastAPI's jsonable_encoder pass.
+    """
+    def render(self, content) -> bytes:
+        return dumps_json(content)
+
 app = FastAPI(docs_url=None, redoc_url=None)  # Disable automatic docs to reduce noise
 
 # Add CORS middleware
@@ -38,423 +103,232 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor"],  # Candidates page cursor
 )
 
 # Add socket.io filter middleware
 app.add_middleware(SocketIOFilterMiddleware)
 
+# Compress responses (event streams and the /analyzeResume NDJSON stream are left uncompressed)
+app.add_middleware(StreamingGZipMiddleware, minimum_size=1024)
+
 @app.post("/test")
 def test_endpoint():
     return {"status": "success", "message": "Server is working!"}
 
+@app.on_event("startup")
+async def load_candidate_index():
+    await asyncio.to_thread(get_candidate_index)
+    # Rows accepted before a crash or restart are still in the spill files
+    await candidate_write_buffer.recover()
+    # Chains are otherwise built on their first request; opt in to build them while the worker starts
+    if os.getenv("WARMUP_ON_STARTUP", "false").lower() == "true":
+        asyncio.create_task(asyncio.to_thread(warm_up))
+
+@app.on_event("shutdown")
+async def persist_candidate_index():
+    await candidate_write_buffer.close()
+    save_candidate_index()
+    await async_engine.dispose()
+
+@app.get("/schedulerStats")
+def scheduler_stats():
+    structlogger.debug("API: /schedulerStats - Received request")
+    return scheduler_status()
+
+@app.get("/cacheStats")
+def cache_stats():
+    structlogger.debug("API: /cacheStats - Received request")
+    return llm_cache.stats()
+
+@app.get("/executionStats")
+def get_execution_stats():
+    structlogger.debug("API: /executionStats - Received request")
+    return dict(execution_stats)
+
+@app.get("/preprocessingStats")
+def get_preprocessing_stats():
+    structlogger.debug("API: /preprocessingStats - Received request")
+    return preprocessing_stats.snapshot()
+
+@app.get("/fastPathStats")
+def get_fast_path_stats():
+    structlogger.debug("API: /fastPathStats - Received request")
+    return fast_path_stats.snapshot()
+
+@app.get("/modelRouterStats")
+def get_model_router_stats():
+    structlogger.debug("API: /modelRouterStats - Received request")
+    return router_stats.snapshot()
+
+@app.get("/singleFlightStats")
+def get_single_flight_stats():
+    structlogger.debug("API: /singleFlightStats - Received request")
+    return single_flight.stats()
+
+@app.post("/warmup")
+async def warmup():
+    try:
+        structlogger.debug("API: /warmup - Received request")
+        timings = await asyncio.to_thread(warm_up)
+        return {"response": "Warm-up completed", "build_ms": timings, "built": chains_status()}
+    except Exception as e:
+        structlogger.debug("API: /warmup - Exception occurred", details=e)
+        return {"response": "Failed to warm up", "error": "An error occurred while processing your request", "status": 500}
+
+@app.post("/reloadPrompts")
+def reload_prompts():
+    try:
+        structlogger.debug("API: /reloadPrompts - Received request")
+        changed = prompt_registry.reload()
+        return {"response": "Prompts reloaded", "changed": changed, **prompt_registry.status()}
+    except Exception as e:
+        structlogger.debug("API: /reloadPrompts - Exception occurred", details=e)
+        return {"response": "Failed to reload prompts", "error": str(e), "status": 500}
+
+@app.get("/dbPoolStats")
+def get_db_pool_stats():
+    structlogger.debug("API: /dbPoolStats - Received request")
+    return pool_status()
+
+@app.get("/writeBufferStats")
+def get_write_buffer_stats():
+    structlogger.debug("API: /writeBufferStats - Received request")
+    return candidate_write_buffer.stats()
+
+async def stream_sections(data: dict, names: list, output_format: str):
+    """
+    Sections as NDJSON lines or Server-Sent Events in the order they finish, then a summary.
+    """
+    start = time.perf_counter()
+    failed = []
+
+    def encode(event_id: int, event: str, payload: dict) -> bytes:
+        if output_format == "sse":
+            return f"id: {event_id}\nevent: {event}\ndata: ".encode() + dumps_json(payload) + b"\n\n"
+        return dumps_json(payload) + b"\n"
+
+    analyses = stream_analysis(data, names)
+    try:
+        event_id = 0
+        async for name, payload, error in analyses:
+            event = {"section": name, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+            if error is None:
+                event["data"] = payload
+            else:
+                failed.append(name)
+                event["error"] = "An error occurred while processing this section"
+            yield encode(event_id, "section", event)
+            event_id += 1
+    finally:
+        await analyses.aclose()
+
+    summary = {"done": True, "sections": len(names), "failed": failed,
+               "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)}
+    yield encode(len(names), "done", summary)
+    structlogger.debug("API: /analyzeResume - Streamed sections", sections=len(names), elapsed_ms=summary["elapsed_ms"])
+
+@app.post("/analyzeResume")
+async def analyze_resume_sections(data: dict, fields: str = None, format: str = "ndjson"):
+    """
+    Run several analyses on one resume, sent once. `fields` (comma separated query parameter
+    or a list in the body) selects the sections, all by default. Sections are streamed as
+    they finish: `format=ndjson` (default) writes one JSON object per line, `format=sse`
+    Server-Sent Events, and `format=json` returns all sections in one object.
+    """
+    structlogger.debug("API: /analyzeResume - Received request", fields=fields, format=format)
+    requested = fields.split(",") if fields else data.get("fields", None) or list(ANALYSIS_SECTIONS)
+    names = list(dict.fromkeys(name.strip() for name in requested if name.strip()))
+    unknown = [name for name in names if name not in ANALYSIS_SECTIONS]
+    if unknown or not names:
+        return {"response": "Invalid fields", "error": f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(ANALYSIS_SECTIONS)}",
+                "status": 400}
+
+    if format == "json":
+        results = {}
+        async for name, payload, error in stream_analysis(data, names):
+            results[name] = payload if error is None else {"error": "An error occurred while processing this section"}
+        return {name: results[name] for name in names}
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(stream_sections(data, names, format), media_type=media_type,
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.post("/getNames")
-def getNames(data: dict):
+async def getNames(data: dict):
     structlogger.debug("API: /getNames - Received request")
-    resumeText = data.get("resumeText", "")
-    email_id = data.get("email_id", "")
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            names = name_extractor_chain.invoke({"resume_text": resumeText, "email_id": email_id})
-            if isinstance(names, dict):
-                if 'name' in names:
-                    structlogger.debug("API: /getNames - Request completed")
-                    return names
-
-            structlogger.debug("API: /getNames - Response data:", response=names)
-        except Exception as e:
-            structlogger.debug("API: /getNames - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getNames - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {"name": "Failed"}
+    return await run_section("getNames", data)
 
 @app.post("/scoreResume")
-def scoreResume(data: dict):
+async def scoreResume(data: dict):
     structlogger.debug("API: /scoreResume - Received request")
-    resumeText = data.get("resumeText", "")
-    jobRole = data.get("jobRole", "")
-    jobDescription = data.get("jobDescription", "")
-    resume_score_prompt_formatted = resume_score_prompt.format(jobRole = jobRole, 
-                                                               jobDescription = jobDescription, 
-                                                               resume = resumeText)
-
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            response_scoring = resume_score_agent.invoke({"messages": [{"role": "user", "content": resume_score_prompt_formatted.format()}]})
-            #scores_resume = scoring_chain.invoke({"resume": resumeText, "jobRole": jobRole, "jobDescription": jobDescription})#.get("properties")
-            response = response_scoring.get("structured_response", None).model_dump()
-
-            if isinstance(response, dict):
-                if all(key in response for key in ['score', 'items']):
-                    structlogger.debug("API: /scoreResume - Request completed")
-                    return {
-                            "score": response['score'],
-                            "jobRole": jobRole,
-                            "items": response['items']
-                            }
-
-            structlogger.debug("API: /scoreResume - Response data:", response=response)
-        except Exception as e:
-            structlogger.debug("API: /scoreResume - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /scoreResume - Retrying. Ended Iteration:", details=iteration)    
-
-    return {    
-        "score": 0.1,
-        "jobRole": jobRole,
-        "items": []
-    }
-    
+    return await run_section("scoreResume", data)
+
 @app.post("/getContacts")
-def getContacts(data: dict):
+async def getContacts(data: dict):
     structlogger.debug("API: /getContacts - Received request")
-    resumeText = data.get("resumeText")
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            contact_info = contact_extractor_chain.invoke({"resume_text": resumeText})
-            keys_to_check = ['color', 'comment', 'email_id', 'mobile_number']
-            if isinstance(contact_info, dict):
-                
-                if all(key in contact_info for key in keys_to_check):
-                    structlogger.debug("API: /getContacts - Request completed")
-                    return contact_info
-
-            structlogger.debug("API: /getContacts - Response data:", response=contact_info)
-        except Exception as e:
-            structlogger.debug("API: /getContacts - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("Retrying. Ended Iteration:", details=iteration)    
-        
-    return {    
-        "color": "red",
-        "comment": "Issue in Processing",
-        "email_id": "",
-        "mobile_number": ""
-    }
+    return await run_section("getContacts", data)
 
 @app.post("/getSummaryOverview")
-def getSummaryOverview(data: dict):
+async def getSummaryOverview(data: dict):
     structlogger.debug("API: /getSummaryOverview - Received request")
-    resumeText = data.get("resumeText")
-    jobRole = data.get("jobRole", "")
-    resume_score_prompt_formatted = summary_prompt.format(resume = resumeText, job_role = jobRole)
-
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            summary_info = summary_agent.invoke({"messages": [{"role": "user", "content": resume_score_prompt_formatted.format()}]})
-            summary_response = summary_info.get("structured_response", None).model_dump()
-            keys_to_check = ['color', 'score', 'label', 'comment', 'summary']
-            if isinstance(summary_response, dict):
-                if all(key in summary_response for key in keys_to_check) and isinstance(summary_response['summary'], list):
-                    structlogger.debug("API: /getSummaryOverview - Request completed")
-                    return summary_response
-
-            structlogger.debug("API: /getSummaryOverview - Response data:", response=summary_info)
-        except Exception as e:
-            structlogger.debug("API: /getSummaryOverview - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getSummaryOverview - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'score': 0,
-            'color': 'red',
-            'label': 'critical',
-            'comment': 'Issue in Processing'}
+    return await run_section("getSummaryOverview", data)
 
 @app.post("/getCustomScores")
-def getCustomScores(data: dict):
+async def getCustomScores(data: dict):
     structlogger.debug("API: /getCustomScores - Received request")
-    resumeText = data.get("resumeText")
-    jobRole = data.get("jobRole", "")
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            custom_scores_info = custom_score_chain.invoke({"resume_text": resumeText, "job_role": jobRole})
-            keys_to_check = ['searchibility_score', 'hard_skills_score', 'soft_skill_score', 'formatting_score']
-            if isinstance(custom_scores_info, dict):
-                if all(key in custom_scores_info for key in keys_to_check):
-                    structlogger.debug("API: /getCustomScores - Request completed")
-                    return custom_scores_info
-
-            structlogger.debug("API: /getCustomScores - Response data:", response=custom_scores_info)
-        except Exception as e:
-            structlogger.debug("API: /getCustomScores - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getCustomScores - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'searchibility_score': 0,
-            'hard_skills_score': 0,
-            'soft_skill_score': 0,
-            'formatting_score': 0}
+    return await run_section("getCustomScores", data)
 
 @app.post("/getOtherComments")
-def getOtherComments(data: dict):
+async def getOtherComments(data: dict):
     structlogger.debug("API: /getOtherComments - Received request")
-    resumeText = data.get("resumeText")
-    jobRole = data.get("jobRole", "")
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            other_comments_info = other_comments_chain.invoke({"resume_text": resumeText, "job_role": jobRole})
-            keys_to_check = ['headings_feedback', 'title_match', 'formatting_feedback']
-            if isinstance(other_comments_info, dict):
-                if all(key in other_comments_info for key in keys_to_check):
-                    structlogger.debug("API: /getOtherComments - Request completed")
-                    return other_comments_info
-
-            structlogger.debug("API: /getOtherComments - Response data:", response=other_comments_info)
-        except Exception as e:
-            structlogger.debug("API: /getOtherComments - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getOtherComments - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'headings_feedback': '',
-            'title_match': '',
-            'formatting_feedback': ''}
+    return await run_section("getOtherComments", data)
 
 @app.post("/getFunctionalConstituent")
-def getFunctionalConstituent(data: dict):
+async def getFunctionalConstituent(data: dict):
     structlogger.debug("API: /getFunctionalConstituent - Received request")
-    resumeText = data.get("resumeText")
-    jobRole = data.get("jobRole", "")
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            functional_constituent_info = functional_constituent_chain.invoke({"resume_text": resumeText, "job_role": jobRole})
-            keys_to_check = ['constituent', 'industries', 'has_industry_experience', 'has_completed_college']
-            if isinstance(functional_constituent_info, dict):
-                if all(key in functional_constituent_info for key in keys_to_check):
-                    structlogger.debug("API: /getFunctionalConstituent - Request completed")
-                    return functional_constituent_info
-
-            structlogger.debug("API: /getFunctionalConstituent - Response data:", response=functional_constituent_info)
-        except Exception as e:
-            structlogger.debug("API: /getFunctionalConstituent - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getFunctionalConstituent - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'constituent': '',
-            'industries': '', 
-            'has_industry_experience': '',
-            'has_completed_college': ''}
+    return await run_section("getFunctionalConstituent", data)
 
 @app.post("/getTechnicalConstituent")
-def getTechnicalConstituent(data: dict):
+async def getTechnicalConstituent(data: dict):
     structlogger.debug("API: /getTechnicalConstituent - Received request")
-    resumeText = data.get("resumeText")
-    jobRole = data.get("jobRole", "")
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            technical_constituent_info = technical_constituent_chain.invoke({"resume_text": resumeText, "job_role": jobRole})
-            keys_to_check = ['high', 'medium', 'low']
-            if isinstance(technical_constituent_info, dict):
-                if all(key in technical_constituent_info for key in keys_to_check):
-                    structlogger.debug("API: /getTechnicalConstituent - Request completed")
-                    return technical_constituent_info
-
-            structlogger.debug("API: /getTechnicalConstituent - Response data:", response=technical_constituent_info)
-        except Exception as e:
-            structlogger.debug("API: /getTechnicalConstituent - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getTechnicalConstituent - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'technical_exposure': ''}
+    return await run_section("getTechnicalConstituent", data)
 
 @app.post("/getEducation")
-def getEducation(data: dict):
+async def getEducation(data: dict):
     structlogger.debug("API: /getEducation - Received request")
-    resumeText = data.get("resumeText")
-    schema_iteration_check = 0
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            education_info = education_extractor_chain.invoke({"resume_text": resumeText})
-            for ent in education_info:
-                keys_to_check = ['degree', 'institution', 'start_year', 'end_year']
-                if isinstance(ent, dict):
-                    if all(key in ent for key in keys_to_check):
-                        schema_iteration_check += 1
-
-            if schema_iteration_check == len(education_info):
-                structlogger.debug("API: /getEducation - Request completed")
-                return education_info
-    
-            structlogger.debug("API: /getEducation - Response data:", response=education_info)
-        except Exception as e:
-            structlogger.debug("API: /getEducation - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getEducation - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'education_history': []}
+    return await run_section("getEducation", data)
 
 @app.post("/getProjects")
-def getProjects(data: dict):
+async def getProjects(data: dict):
     structlogger.debug("API: /getProjects - Received request")
-    resumeText = data.get("resumeText")
-    jobRole = data.get("jobRole", "")
-    schema_iteration_check = 0
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            project_info = project_extractor_chain.invoke({"resume_text": resumeText, "job_role": jobRole})
-            if isinstance(project_info['projects'], list):
-                for ent in project_info['projects']:
-                    keys_to_check = ['title', 'description', 'technologies', 'score', 'color', 'comment', 'stage']
-                    if isinstance(ent, dict):
-                        if all(key in ent for key in keys_to_check):
-                            schema_iteration_check += 1
-
-            if schema_iteration_check == len(project_info['projects']):
-                structlogger.debug("API: /getProjects - Request completed")
-                return project_info
-    
-            structlogger.debug("API: /getProjects - Response data:", response=project_info)
-        except Exception as e:
-            structlogger.debug("API: /getProjects - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getProjects - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'projects': []}
-        
+    return await run_section("getProjects", data)
+
 @app.post("/getCompany")
-def getCompany(data: dict):
+async def getCompany(data: dict):
     structlogger.debug("API: /getCompany - Received request")
-    resumeText = data.get("resumeText")
-    schema_iteration_check = 0
-    company_extractor_prompt_formatted = company_extractor_prompt.format(resume = resumeText)
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            company_info = company_extractor_agent.invoke({"messages": [{"role": "user", "content": company_extractor_prompt_formatted}]})
-            company_info = company_info.get("structured_response", None).model_dump()
-            if isinstance(company_info['employment_history'], list):
-                for ent in company_info['employment_history']:
-                    keys_to_check = ['company', 'position', 'start_year', 'end_year', 'employment_type']
-                    if isinstance(ent, dict):
-                        if all(key in ent for key in keys_to_check):
-                            schema_iteration_check += 1
-
-            if schema_iteration_check == len(company_info['employment_history']):
-                structlogger.debug("API: /getCompany - Request completed")
-                return company_info
-    
-            structlogger.debug("API: /getCompany - Response data:", response=company_info)
-        except Exception as e:
-            structlogger.debug("API: /getCompany - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getCompany - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'employment_history': []}
+    return await run_section("getCompany", data)
 
 @app.post("/getYoe")
-def getYoe(data: dict):
+async def getYoe(data: dict):
     structlogger.debug("API: /getYoe - Received request")
-    resumeText = data.get("resumeText")
-    jobRole = data.get("jobRole", "")
-    yoe_prompt_formatted = yoe_prompt.format(resume = resumeText, job_role = jobRole)
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            yoe_info = yoe_agent.invoke({"messages": [{"role": "user", "content": yoe_prompt_formatted.format()}]})
-            yoe_info = yoe_info.get("structured_response", None).model_dump()
-            keys_to_check = ['yoe', 'ryoe']
-            if isinstance(yoe_info, dict):
-                if all(key in yoe_info for key in keys_to_check):
-                    structlogger.debug("API: /getYoe - Request completed")
-                    return yoe_info
-
-            structlogger.debug("API: /getYoe - Response data:", response=yoe_info)
-        except Exception as e:
-            structlogger.debug("API: /getYoe - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getYoe - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'yoe': 0, 'ryoe': 0}
+    return await run_section("getYoe", data)
 
 @app.post("/getRecruitersOverview")
-def getRecruitersOverview(data: dict):
+async def getRecruitersOverview(data: dict):
     structlogger.debug("API: /getRecruitersOverview - Received request")
-    resumeText = data.get("resumeText")
-    jobRole = data.get("jobRole", "")
-    recruiters_overview_prompt_formatted = recruiters_overview_prompt.format(resume = resumeText, job_role = jobRole)
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            recruiters_overview_info = recruiters_overview_agent.invoke({"messages": [{"role": "user", "content": recruiters_overview_prompt_formatted}]})
-            recruiters_overview_info = recruiters_overview_info.get("structured_response", None).model_dump()
-            keys_to_check = ['bullets', 'relevant_experience', 'technical_proficiency']
-            if isinstance(recruiters_overview_info, dict):
-                if all(key in recruiters_overview_info for key in keys_to_check):
-                    if isinstance(recruiters_overview_info['bullets'], list) and \
-                       isinstance(recruiters_overview_info['technical_proficiency'], list):
-                        structlogger.debug("API: /getRecruitersOverview - Request completed")
-                        return recruiters_overview_info
-
-            structlogger.debug("API: /getRecruitersOverview - Response data:", response=recruiters_overview_info)
-        except Exception as e:
-            structlogger.debug("API: /getRecruitersOverview - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getRecruitersOverview - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'bullets': [], 'relevant_experience': '', 'technical_proficiency': []}
+    return await run_section("getRecruitersOverview", data)
 
 @app.post("/getDesignation")
-def getDesignation(data: dict):
+async def getDesignation(data: dict):
     structlogger.debug("API: /getDesignation - Received request")
-    resumeText = data.get("resumeText")
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            designation_info = designation_extractor_chain.invoke({"resume": resumeText})
-            keys_to_check = ['current_designation', 'previous_designation']
-            if isinstance(designation_info, dict):
-                if all(key in designation_info for key in keys_to_check):
-                    structlogger.debug("API: /getDesignation - Request completed")
-                    return designation_info
-
-            structlogger.debug("API: /getDesignation - Response data:", response=designation_info)
-        except Exception as e:
-            structlogger.debug("API: /getDesignation - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getDesignation - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'current_designation': '', 'previous_designation': ''}
+    return await run_section("getDesignation", data)
 
 @app.post("/assembleData")
-def assembleData(data: dict):
+async def assembleData(data: dict):
     try:
         structlogger.debug("API: /assembleData - Received request")
-        status = insert_data(data)
+        status = await ainsert_data(data)
         structlogger.debug("API: /assembleData - Request completed")
         return status
     except Exception as e:
@@ -479,12 +353,49 @@ async def process_bulk_import(data: dict):
                     "parsed_status": "UnSuccessful"
                 }
 
+@app.post("/bulkImportJobs")
+async def create_bulk_import_job(data: dict):
+    try:
+        structlogger.debug("API: /bulkImportJobs - Received request")
+        resumes = data.get("resumes", [])
+        if not resumes:
+            return {"response": "No resumes provided", "error": "Request must contain a non-empty 'resumes' list", "status": 400}
+
+        defaults = {key: value for key, value in data.items() if key != "resumes"}
+        job = bulk_import_jobs.create(resumes, defaults)
+        structlogger.debug("API: /bulkImportJobs - Request completed", job_id=job.job_id)
+        return job.snapshot(include_results=False)
+    except Exception as e:
+        structlogger.debug("API: /bulkImportJobs - Exception occurred", details=e)
+        return {"response": "Failed to create bulk import job", "error": "An error occurred while processing your request", "status": 500}
+
+@app.get("/bulkImportJobs/{job_id}")
+def get_bulk_import_job(job_id: str):
+    structlogger.debug("API: /bulkImportJobs/{job_id} - Received request", job_id=job_id)
+    job = bulk_import_jobs.get(job_id)
+    if job is None:
+        return {"response": "Job not found", "error": "Bulk Import Job Not Found", "status": 404}
+    return job.snapshot()
+
+@app.get("/bulkImportJobs/{job_id}/events")
+async def stream_bulk_import_job(job_id: str, request: Request, lastEventId: int = -1):
+    structlogger.debug("API: /bulkImportJobs/{job_id}/events - Received request", job_id=job_id)
+    job = bulk_import_jobs.get(job_id)
+    if job is None:
+        return {"response": "Job not found", "error": "Bulk Import Job Not Found", "status": 404}
+
+    # EventSource sends Last-Event-ID on reconnect; the query parameter covers manual resumes
+    last_event_id = int(request.headers.get("last-event-id", lastEventId))
+    return StreamingResponse(job.stream(last_event_id),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.post("/extractData")
-def extract_data_db(data: dict):
+async def extract_data_db(data: dict):
     try:
         email_id = data.get("email_id", None)
         
-        return_payload = extract_data(email_id)
+        return_payload = await aextract_data(email_id)
         
         if len(return_payload) == 0:
             return {"response": "Candidate not found", "error": "Relevant Candidate Not Found", "status": 404}
@@ -492,38 +403,19 @@ def extract_data_db(data: dict):
         # Return the first candidate
         result = return_payload[0]
         structlogger.debug("API: /extractData - Request completed")
-        return result
+        return FastJSONResponse(result)
 
     except Exception as e:
         structlogger.debug("API: /extractData - Exception occurred", details=e)
         return {"response": "Failed to extract data", "error": "An error occurred while processing your request", "status": 500}
 
 @app.post("/getLocation")
-def get_location(data: dict):
+async def get_location(data: dict):
     structlogger.debug("API: /getLocation - Received request")
-    resumeText = data.get("resumeText")
-    
-    max_iter = 5
-    for iteration in range(max_iter):
-        try:
-            location_info = location_extractor_chain.invoke({"resume_text": resumeText})
-            keys_to_check = ['location', 'confidence_score']
-            if isinstance(location_info, dict):
-                if all(key in location_info for key in keys_to_check):
-                    structlogger.debug("API: /getLocation - Request completed")
-                    return location_info
-
-            structlogger.debug("API: /getLocation - Response data:", response=location_info)
-        except Exception as e:
-            structlogger.debug("API: /getLocation - Exception occurred", details=e)
-            pass
-
-        structlogger.debug("API: /getLocation - Retrying. Ended Iteration:", details=iteration)    
-        
-    return {'location': '', 'confidence_score': 0}
+    return await run_section("getLocation", data)
 
 @app.post("/filterCandidate")
-def filter_candidate(data: dict):
+async def filter_candidate(data: dict):
     try:
         structlogger.debug("API: /filterCandidate - Received request")
         wordList = data.get("wordList", None)
@@ -532,32 +424,88 @@ def filter_candidate(data: dict):
         experience = data.get("experienceFilter", None)
         recentResumeCount = data.get("recentResumeCount", None)
         
-        return refined_resume(wordList, jobRole, jobDescription, experience, recentResumeCount)
+        return FastJSONResponse(await arefined_resume(wordList, jobRole, jobDescription, experience, recentResumeCount))
 
     except Exception as e:
         structlogger.debug("API: /filterCandidate - Exception occurred", details=e)
         return {"response": "Failed to filter candidate", "error": "An error occurred while processing your request", "status": 500}
 
+@app.post("/backfillEmbeddings")
+def backfill_embeddings_api(background_tasks: BackgroundTasks, data: dict = None):
+    try:
+        structlogger.debug("API: /backfillEmbeddings - Received request")
+        batch_size = (data or {}).get("batchSize", None)
+        background_tasks.add_task(backfill_embeddings, batch_size)
+        return {"response": "Embedding backfill started"}
+    except Exception as e:
+        structlogger.debug("API: /backfillEmbeddings - Exception occurred", details=e)
+        return {"response": "Failed to start embedding backfill", "error": "An error occurred while processing your request", "status": 500}
+
+async def stream_records(first, rest, output_format: str, chunk_size: int = 64 * 1024):
+    """
+    Serialize rows as a JSON array or NDJSON, flushing roughly `chunk_size` bytes at a time.
+    """
+    ndjson = output_format == "ndjson"
+    buffer, size, count = [b"" if ndjson else b"["], 1, 0
+
+    async def records():
+        if first is None:
+            return
+        yield first
+        async for record in rest:
+            yield record
+
+    try:
+        async for record in records():
+            line = dumps_json(record)
+            buffer.append(line + b"\n" if ndjson else (b"," if count else b"") + line)
+            size += len(line) + 1
+            count += 1
+            if size >= chunk_size:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+    finally:
+        # Hands the connection back to the pool when the client goes away mid-stream
+        await rest.aclose()
+
+    buffer.append(b"" if ndjson else b"]")
+    yield b"".join(buffer)
+    structlogger.debug(f"API: /getAllCandidates - Streamed {count} candidates")
+
 @app.get("/getAllCandidates")
-def get_all_candidates():
+async def get_all_candidates(limit: int = None, cursor: str = None, fields: str = None, format: str = "json"):
+    """
+    Candidates ordered by email_id (rows without one last). Pass `limit` for a page and the
+    `X-Next-Cursor` header of a page as `cursor` for the next one; the last page has no
+    such header. `fields` (comma separated) limits the columns read. `format=ndjson`
+    streams one JSON object per line instead of a JSON array.
+    """
     try:
-        structlogger.debug("API: /getAllCandidates - Received request")
-        candidates = extract_all_resumes()
-        structlogger.debug(f"API: /getAllCandidates - Returning {len(candidates)} candidates")
-        structlogger.debug("API: /getAllCandidates - Request completed")
-        return candidates
+        structlogger.debug("API: /getAllCandidates - Received request", limit=limit, cursor=cursor, fields=fields)
+        field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+        next_cursor = await anext_candidates_cursor(limit, cursor) if limit else None
+        if next_cursor:
+            rows = aiter_candidates(field_list, cursor = cursor, until = next_cursor)
+        else:
+            rows = aiter_candidates(field_list, limit, cursor)
+
+        # Pull the first row here so query errors become a normal error response
+        first = await anext(rows, None)
+        media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return StreamingResponse(stream_records(first, rows, format), media_type=media_type, headers=headers)
     except Exception as e:
         structlogger.debug("API: /getAllCandidates - Exception occurred", details=e)
         return {"response": "Failed to retrieve candidates", "error": "An error occurred while processing your request", "status": 500}
 
 @app.get("/getAllCandidatesDropdown")
-def get_candidates_dropdown_api():
+async def get_candidates_dropdown_api():
     try:
         structlogger.debug("API: /getAllCandidatesDropdown - Received request")
-        candidates = get_all_candidates_dropdown()
+        candidates = await aget_all_candidates_dropdown()
         structlogger.debug(f"API: /getAllCandidatesDropdown - Returning {len(candidates)} candidates")
         structlogger.debug("API: /getAllCandidatesDropdown - Request completed")
-        return candidates
+        return FastJSONResponse(candidates)
     except Exception as e:
         structlogger.debug("API: /getAllCandidatesDropdown - Exception occurred", details=e)
         return {"response": "Failed to retrieve candidates", "error": "An error occurred while processing your request", "status": 500}
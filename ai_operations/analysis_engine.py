@@ -0,0 +1,346 @@
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable
+import json
+import time
+import asyncio
+from ai_operations.chains import *
+from ai_operations.execution import invoke_with_retries, ainvoke_limited, path_schema
+from ai_operations.llm_cache import llm_cache, cache_key
+from ai_operations.utils import prompt_version, schema_version
+from ai_operations.text_preprocessing import preprocess_input, report_resume
+from ai_operations.fast_path import run_fast_path, fast_contacts, fast_names
+from ai_operations.model_router import task_model, task_fallbacks, router_stats
+from ai_operations.single_flight import single_flight, request_key, SINGLE_FLIGHT_ENABLED
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+
+
+@dataclass
+class AnalysisSection:
+    """
+    One resume analysis as exposed by an API route.
+
+    Attributes:
+        prompt_name: Prompt in prompts.yml the runnable is built from
+        cache_fields: Request fields the output depends on (used for the result cache key)
+        runnable: The chain or agent doing the work
+        build_input: Maps the request payload to the runnable's input
+        parse_output: Maps the runnable's raw output to the section payload
+        is_valid: Schema check applied to the parsed output before it is accepted
+        fallback: Payload returned once every attempt has failed
+        finalize: Optional transformation of the accepted payload (request payload is passed along)
+        fast_path: Optional deterministic extractor (request payload, prepared text) -> (payload, confidence)
+            tried before the runnable
+    """
+    prompt_name: str
+    cache_fields: tuple
+    runnable: Any
+    build_input: Callable[[dict], dict]
+    parse_output: Callable[[Any], Any]
+    is_valid: Callable[[Any], bool]
+    fallback: Callable[[dict], Any]
+    finalize: Callable[[Any, dict], Any] = lambda output, data: output
+    fast_path: Callable[[dict, str], tuple] = None
+
+
+def _as_is(output):
+    return output
+
+def _structured_response(output):
+    return output.get("structured_response", None).model_dump()
+
+def _agent_input(prompt, **variables):
+    return {"messages": [{"role": "user", "content": prompt.format(**variables)}]}
+
+def _has_keys(*keys):
+    return lambda output: isinstance(output, dict) and all(key in output for key in keys)
+
+def _has_entries(list_key, *keys):
+
+    def check(output):
+        entries = output if list_key is None else output.get(list_key) if isinstance(output, dict) else None
+        if not isinstance(entries, list):
+            return False
+        return all(isinstance(ent, dict) and all(key in ent for key in keys) for ent in entries)
+
+    return check
+
+
+ANALYSIS_SECTIONS = {
+    "getContacts": AnalysisSection(
+        prompt_name = "get_contact_information",
+        cache_fields = ("resumeText",),
+        runnable = contact_extractor_chain,
+        build_input = lambda data: {"resume_text": data.get("resumeText", "")},
+        parse_output = _as_is,
+        is_valid = _has_keys('color', 'comment', 'email_id', 'mobile_number'),
+        fallback = lambda data: {"color": "red", "comment": "Issue in Processing", "email_id": "", "mobile_number": ""},
+        fast_path = fast_contacts,
+    ),
+    "getNames": AnalysisSection(
+        prompt_name = "extract_names",
+        cache_fields = ("resumeText", "email_id"),
+        runnable = name_extractor_chain,
+        build_input = lambda data: {"resume_text": data.get("resumeText", ""), "email_id": data.get("email_id", "")},
+        parse_output = _as_is,
+        is_valid = _has_keys('name'),
+        fallback = lambda data: {"name": "Failed"},
+        fast_path = fast_names,
+    ),
+    "getCustomScores": AnalysisSection(
+        prompt_name = "get_custom_scores",
+        cache_fields = ("resumeText", "jobRole"),
+        runnable = custom_score_chain,
+        build_input = lambda data: {"resume_text": data.get("resumeText", ""), "job_role": data.get("jobRole", "")},
+        parse_output = _as_is,
+        is_valid = _has_keys('searchibility_score', 'hard_skills_score', 'soft_skill_score', 'formatting_score'),
+        fallback = lambda data: {'searchibility_score': 0, 'hard_skills_score': 0, 'soft_skill_score': 0, 'formatting_score': 0},
+    ),
+    "getSummaryOverview": AnalysisSection(
+        prompt_name = "get_summary_overview",
+        cache_fields = ("resumeText", "jobRole"),
+        runnable = summary_agent,
+        build_input = lambda data: _agent_input(summary_prompt, resume = data.get("resumeText", ""), job_role = data.get("jobRole", "")),
+        parse_output = _structured_response,
+        is_valid = lambda output: _has_keys('color', 'score', 'label', 'comment', 'summary')(output) and isinstance(output['summary'], list),
+        fallback = lambda data: {'score': 0, 'color': 'red', 'label': 'critical', 'comment': 'Issue in Processing'},
+    ),
+    "getFunctionalConstituent": AnalysisSection(
+        prompt_name = "functional_constituent",
+        cache_fields = ("resumeText", "jobRole"),
+        runnable = functional_constituent_chain,
+        build_input = lambda data: {"resume_text": data.get("resumeText", ""), "job_role": data.get("jobRole", "")},
+        parse_output = _as_is,
+        is_valid = _has_keys('constituent', 'industries', 'has_industry_experience', 'has_completed_college'),
+        fallback = lambda data: {'constituent': '', 'industries': '', 'has_industry_experience': '', 'has_completed_college': ''},
+    ),
+    "getOtherComments": AnalysisSection(
+        prompt_name = "get_other_comments",
+        cache_fields = ("resumeText", "jobRole"),
+        runnable = other_comments_chain,
+        build_input = lambda data: {"resume_text": data.get("resumeText", ""), "job_role": data.get("jobRole", "")},
+        parse_output = _as_is,
+        is_valid = _has_keys('headings_feedback', 'title_match', 'formatting_feedback'),
+        fallback = lambda data: {'headings_feedback': '', 'title_match': '', 'formatting_feedback': ''},
+    ),
+    "getEducation": AnalysisSection(
+        prompt_name = "education_extractor",
+        cache_fields = ("resumeText",),
+        runnable = education_extractor_chain,
+        build_input = lambda data: {"resume_text": data.get("resumeText", "")},
+        parse_output = _as_is,
+        is_valid = _has_entries(None, 'degree', 'institution', 'start_year', 'end_year'),
+        fallback = lambda data: {'education_history': []},
+    ),
+    "scoreResume": AnalysisSection(
+        prompt_name = "create_resume_score",
+        cache_fields = ("resumeText", "jobRole", "jobDescription"),
+        runnable = resume_score_agent,
+        build_input = lambda data: _agent_input(resume_score_prompt,
+                                                jobRole = data.get("jobRole", ""),
+                                                jobDescription = data.get("jobDescription", ""),
+                                                resume = data.get("resumeText", "")),
+        parse_output = _structured_response,
+        is_valid = _has_keys('score', 'items'),
+        fallback = lambda data: {"score": 0.1, "jobRole": data.get("jobRole", ""), "items": []},
+        finalize = lambda output, data: {"score": output['score'], "jobRole": data.get("jobRole", ""), "items": output['items']},
+    ),
+    "getTechnicalConstituent": AnalysisSection(
+        prompt_name = "technical_constituent",
+        cache_fields = ("resumeText", "jobRole"),
+        runnable = technical_constituent_chain,
+        build_input = lambda data: {"resume_text": data.get("resumeText", ""), "job_role": data.get("jobRole", "")},
+        parse_output = _as_is,
+        is_valid = _has_keys('high', 'medium', 'low'),
+        fallback = lambda data: {'technical_exposure': ''},
+    ),
+    "getCompany": AnalysisSection(
+        prompt_name = "company_extractor",
+        cache_fields = ("resumeText",),
+        runnable = company_extractor_agent,
+        build_input = lambda data: _agent_input(company_extractor_prompt, resume = data.get("resumeText", "")),
+        parse_output = _structured_response,
+        is_valid = _has_entries('employment_history', 'company', 'position', 'start_year', 'end_year', 'employment_type'),
+        fallback = lambda data: {'employment_history': []},
+    ),
+    "getProjects": AnalysisSection(
+        prompt_name = "project_extractor",
+        cache_fields = ("resumeText", "jobRole"),
+        runnable = project_extractor_chain,
+        build_input = lambda data: {"resume_text": data.get("resumeText", ""), "job_role": data.get("jobRole", "")},
+        parse_output = _as_is,
+        is_valid = _has_entries('projects', 'title', 'description', 'technologies', 'score', 'color', 'comment', 'stage'),
+        fallback = lambda data: {'projects': []},
+    ),
+    "getYoe": AnalysisSection(
+        prompt_name = "extract_yoe",
+        cache_fields = ("resumeText", "jobRole"),
+        runnable = yoe_agent,
+        build_input = lambda data: _agent_input(yoe_prompt, resume = data.get("resumeText", ""), job_role = data.get("jobRole", "")),
+        parse_output = _structured_response,
+        is_valid = _has_keys('yoe', 'ryoe'),
+        fallback = lambda data: {'yoe': 0, 'ryoe': 0},
+    ),
+    "getLocation": AnalysisSection(
+        prompt_name = "extract_location",
+        cache_fields = ("resumeText",),
+        runnable = location_extractor_chain,
+        build_input = lambda data: {"resume_text": data.get("resumeText", "")},
+        parse_output = _as_is,
+        is_valid = _has_keys('location', 'confidence_score'),
+        fallback = lambda data: {'location': '', 'confidence_score': 0},
+    ),
+    "getRecruitersOverview": AnalysisSection(
+        prompt_name = "extract_recruiters_overview",
+        cache_fields = ("resumeText", "jobRole"),
+        runnable = recruiters_overview_agent,
+        build_input = lambda data: _agent_input(recruiters_overview_prompt, resume = data.get("resumeText", ""), job_role = data.get("jobRole", "")),
+        parse_output = _structured_response,
+        is_valid = lambda output: _has_keys('bullets', 'relevant_experience', 'technical_proficiency')(output) and \
+                                  isinstance(output['bullets'], list) and isinstance(output['technical_proficiency'], list),
+        fallback = lambda data: {'bullets': [], 'relevant_experience': '', 'technical_proficiency': []},
+    ),
+    "getDesignation": AnalysisSection(
+        prompt_name = "designation_extractor",
+        cache_fields = ("resumeText",),
+        runnable = designation_extractor_chain,
+        build_input = lambda data: {"resume": data.get("resumeText", "")},
+        parse_output = _as_is,
+        is_valid = _has_keys('current_designation', 'previous_designation'),
+        fallback = lambda data: {'current_designation': '', 'previous_designation': ''},
+    ),
+}
+
+
+def section_cache_key(name: str, data: dict):
+
+    section = ANALYSIS_SECTIONS[name]
+    return cache_key(prompt_name = section.prompt_name,
+                     prompt_version = prompt_version(section.prompt_name, filename = "prompts.yml"),
+                     model_name = task_model(section.prompt_name),
+                     fields = {field: data.get(field, "") for field in section.cache_fields},
+                     schema_version = schema_version(SECTION_SCHEMAS.get(name)))
+
+
+async def reask_fields(name: str, data: dict, output, paths: list):
+    """
+    Ask the model again for just the `paths` of a section that came back invalid (top-level
+    fields or single list entries), instead of regenerating the whole section.
+    """
+    schema = SECTION_SCHEMAS[name].model_json_schema()
+    field_schema = {
+        "properties": {path: path_schema(schema, path) for path in paths if path_schema(schema, path) is not None},
+        "$defs": schema.get("$defs", {}),
+    }
+    payload = {
+        "section": name,
+        "fields": ", ".join(paths),
+        "partial_output": json.dumps(output, default=str),
+        "field_schema": json.dumps(field_schema),
+        "job_role": data.get("jobRole", ""),
+        "job_description": data.get("jobDescription", ""),
+        "resume_text": data.get("resumeText", ""),
+    }
+    return await ainvoke_limited(field_reask_chain, payload, task_model("repair_fields"), task_fallbacks("repair_fields"))
+
+
+def fast_path_output(name: str, data: dict):
+    """
+    Deterministic payload of a section, or None when it has no fast path or is not confident.
+    """
+    section = ANALYSIS_SECTIONS[name]
+    if section.fast_path is None:
+        return None
+    return run_fast_path(name, section.fast_path, data)
+
+
+async def run_section(name: str, data: dict, max_iter: int = 5):
+    """
+    Payload of one analysis section. Concurrent identical requests (same section and
+    normalized input fields, e.g. the same resume open in several tabs) share one run.
+    """
+    if not SINGLE_FLIGHT_ENABLED:
+        return await _run_section(name, data, max_iter)
+
+    key = request_key(name, data, ANALYSIS_SECTIONS[name].cache_fields)
+    return await single_flight.run(key, partial(_run_section, name, data, max_iter))
+
+
+async def _run_section(name: str, data: dict, max_iter: int = 5):
+
+    section = ANALYSIS_SECTIONS[name]
+    output = fast_path_output(name, data)
+    if output is not None:
+        return section.finalize(output, data)
+
+    # Normalized and budgeted text is both sent and cache-keyed, so extraction noise does not miss the cache
+    data = preprocess_input(section.prompt_name, data)
+    key = section_cache_key(name, data)
+
+    label = f"API: /{name}"
+
+    output = await llm_cache.aget(key)
+    if output is not None:
+        structlogger.debug(f"{label} - Served from cache")
+        router_stats.record(section.prompt_name, label, cache_hit = True)
+        return section.finalize(output, data)
+
+    start = time.perf_counter()
+    output = await invoke_with_retries(section.runnable, section.build_input(data),
+                                       parse_output = section.parse_output,
+                                       is_valid = section.is_valid,
+                                       label = label,
+                                       model_name = task_model(section.prompt_name),
+                                       fallbacks = task_fallbacks(section.prompt_name),
+                                       max_iter = max_iter,
+                                       schema = SECTION_SCHEMAS.get(name),
+                                       reask = partial(reask_fields, name, data))
+    router_stats.record(section.prompt_name, label, latency = time.perf_counter() - start, succeeded = output is not None)
+    if output is None:
+        return section.fallback(data)
+
+    await llm_cache.aset(key, output)
+    return section.finalize(output, data)
+
+
+async def analyze_resume(data: dict, sections = None):
+    """
+    Run the requested analyses for one resume concurrently, in-process.
+
+    Returns:
+        Dict of section name -> payload, in the same shape the API routes return
+    """
+    names = list(sections or ANALYSIS_SECTIONS.keys())
+    report_resume(data, [ANALYSIS_SECTIONS[name].prompt_name for name in names])
+    results = await asyncio.gather(*(run_section(name, data) for name in names))
+    return dict(zip(names, results))
+
+
+async def stream_analysis(data: dict, sections = None):
+    """
+    Run the requested analyses for one resume concurrently and yield each one as it finishes.
+
+    Yields:
+        (section name, payload, error): error is the exception for a section that raised
+        (payload is then None). Closing the generator early, e.g. when the client goes
+        away, cancels the sections still running
+    """
+    names = list(sections or ANALYSIS_SECTIONS.keys())
+    report_resume(data, [ANALYSIS_SECTIONS[name].prompt_name for name in names])
+
+    async def run(name):
+        try:
+            return name, await run_section(name, data), None
+        except Exception as e:
+            structlogger.debug(f"API: /{name} - Exception occurred", details=e)
+            return name, None, e
+
+    tasks = [asyncio.create_task(run(name)) for name in names]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
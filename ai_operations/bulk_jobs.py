@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from dotenv import load_dotenv
+from db_operations.utility_db import process_individual_resume
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+load_dotenv()
+
+BULK_IMPORT_CONCURRENCY = int(os.getenv("BULK_IMPORT_CONCURRENCY", 4))
+BULK_IMPORT_MAX_JOBS = int(os.getenv("BULK_IMPORT_MAX_JOBS", 50))
+
+
+def summarize_result(payload: dict):
+
+    contacts = payload.get("getContacts", {}) or {}
+    input_data = payload.get("input_data", {}) or {}
+    summary = payload.get("getSummaryOverview", {}) or {}
+
+    return {
+        "email_id": contacts.get("email_id", payload.get("email_id", "")),
+        "contact_number": contacts.get("mobile_number", payload.get("contact_number", "")),
+        "name": input_data.get("name", payload.get("name", "")),
+        "summary_overview": summary.get("comment", ""),
+        "score_resume": payload.get("scoreResume", None),
+        "parsed_status": payload.get("parsed_status", "UnSuccessful"),
+    }
+
+
+class BulkImportJob:
+    """
+    Server-side bulk import of many resumes with bounded concurrency.
+
+    Every state change is appended to `events`, so a client can disconnect and
+    replay the stream from the last event id it has seen.
+    """
+
+    def __init__(self, resumes: list, defaults: dict, concurrency: int):
+
+        self.job_id = uuid.uuid4().hex
+        self.created_at = time.time()
+        self.finished_at = None
+        self.status = "queued"
+        self.concurrency = concurrency
+        self.items = [{"index": idx,
+                       "fileName": resume.get("fileName", f"resume-{idx + 1}"),
+                       "status": "queued",
+                       "result": None} for idx, resume in enumerate(resumes)]
+        self.events = []
+        self._requests = [{**defaults, **resume} for resume in resumes]
+        self._changed = asyncio.Condition()
+        self._task = None
+
+    @property
+    def done(self):
+        return self.status in ("completed", "failed")
+
+    def counts(self):
+
+        counts = {"total": len(self.items), "queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        for item in self.items:
+            counts[item["status"]] += 1
+        return counts
+
+    def snapshot(self, include_results: bool = True):
+
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "concurrency": self.concurrency,
+            **self.counts(),
+            "items": self.items if include_results else None,
+        }
+
+    async def _publish(self, event: str, data: dict):
+
+        async with self._changed:
+            self.events.append({"id": len(self.events), "event": event, "data": data})
+            self._changed.notify_all()
+
+    async def _process(self, idx: int, limit: asyncio.Semaphore):
+
+        item = self.items[idx]
+        async with limit:
+            item["status"] = "running"
+            await self._publish("started", {"index": idx, "fileName": item["fileName"]})
+
+            try:
+                payload = await process_individual_resume(self._requests[idx])
+            except Exception as e:
+                structlogger.debug("Bulk import job - Exception occurred", job_id=self.job_id, index=idx, details=e)
+                payload = {"parsed_status": "UnSuccessful", "error": str(e)}
+
+            item["result"] = summarize_result(payload)
+            item["status"] = "succeeded" if item["result"]["parsed_status"] == "Successful" else "failed"
+            self._requests[idx] = None  # release the resume text once processed
+
+        await self._publish("result", {**item, **self.counts()})
+
+    async def run(self):
+
+        self.status = "running"
+        await self._publish("status", self.snapshot(include_results=False))
+
+        limit = asyncio.Semaphore(self.concurrency)
+        try:
+            await asyncio.gather(*(self._process(idx, limit) for idx in range(len(self.items))))
+            self.status = "completed"
+        except Exception as e:
+            structlogger.debug("Bulk import job - Job failed", job_id=self.job_id, details=e)
+            self.status = "failed"
+
+        self.finished_at = time.time()
+        await self._publish("completed", self.snapshot(include_results=False))
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stream(self, last_event_id: int = -1):
+        """
+        Yield Server-Sent Events after `last_event_id` until the job is finished.
+        """
+        cursor = last_event_id + 1
+        while True:
+            async with self._changed:
+                if cursor >= len(self.events) and not self.done:
+                    await self._changed.wait()
+                pending = self.events[cursor:]
+
+            for event in pending:
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+            cursor += len(pending)
+
+            if self.done and cursor >= len(self.events):
+                break
+
+
+class BulkImportJobStore:
+
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+
+    def create(self, resumes: list, defaults: dict, concurrency: int = None):
+
+        job = BulkImportJob(resumes, defaults, concurrency or BULK_IMPORT_CONCURRENCY)
+        self._jobs[job.job_id] = job
+
+        # Forget the oldest finished jobs once the store is full
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id].done:
+                del self._jobs[job_id]
+
+        job.start()
+        structlogger.debug("Bulk import job - Created", job_id=job.job_id, total=len(resumes))
+        return job
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+
+bulk_import_jobs = BulkImportJobStore(BULK_IMPORT_MAX_JOBS)
@@ -1,22 +1,117 @@
 from ai_operations.utility_function import *
-                                        
+
 from dotenv import load_dotenv
+from langchain_core.runnables import Runnable
+import threading
+import time
 
 load_dotenv(override=True)
 
-scoring_chain = create_resume_score()
-contact_extractor_chain = get_contact_information()
-summary_chain = get_summary_overview()
-custom_score_chain = get_custom_scores()
-other_comments_chain = get_other_comments()
-functional_constituent_chain = functional_constituent()
-technical_constituent_chain = technical_constituent()
-education_extractor_chain = education_extractor()
-project_extractor_chain = project_extractor()
-company_extractor_chain = company_extractor()
-name_extractor_chain = extract_names()
-yoe_extractor_chain = extract_yoe()
-recruiters_overview_chain = extract_recruiters_overview()
-location_extractor_chain = extract_location()
-designation_extractor_chain = designation_extractor()
 
+def memoized(factory):
+    """
+    Zero-argument version of `factory` that builds once (thread-safe) and then returns the same result.
+    """
+    lock = threading.Lock()
+    built = []
+
+    def get():
+        if not built:
+            with lock:
+                if not built:
+                    built.append(factory())
+        return built[0]
+
+    get.built = lambda: bool(built)
+    return get
+
+
+class LazyRunnable(Runnable):
+    """
+    Chain, agent or prompt built by its factory the first time it is used. For factories
+    returning an (agent, prompt) pair, `item` selects the element.
+    """
+
+    def __init__(self, factory, item: int = None):
+        self.factory = factory
+        self.item = item
+
+    @property
+    def runnable(self):
+        built = self.factory()
+        return built if self.item is None else built[self.item]
+
+    def format(self, **kwargs) -> str:
+        return self.runnable.format(**kwargs)
+
+    def invoke(self, input, config = None, **kwargs):
+        return self.runnable.invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config = None, **kwargs):
+        return await self.runnable.ainvoke(input, config, **kwargs)
+
+
+CHAIN_FACTORIES = {
+    "resume_score": memoized(create_resume_score),
+    "contact_extractor": memoized(get_contact_information),
+    "summary": memoized(get_summary_overview),
+    "custom_score": memoized(get_custom_scores),
+    "other_comments": memoized(get_other_comments),
+    "functional_constituent": memoized(functional_constituent),
+    "technical_constituent": memoized(technical_constituent),
+    "education_extractor": memoized(education_extractor),
+    "project_extractor": memoized(project_extractor),
+    "company_extractor": memoized(company_extractor),
+    "name_extractor": memoized(extract_names),
+    "yoe": memoized(extract_yoe),
+    "recruiters_overview": memoized(extract_recruiters_overview),
+    "location_extractor": memoized(extract_location),
+    "designation_extractor": memoized(designation_extractor),
+    "field_reask": memoized(field_reasker),
+}
+
+def agent_and_prompt(name: str):
+    return LazyRunnable(CHAIN_FACTORIES[name], 0), LazyRunnable(CHAIN_FACTORIES[name], 1)
+
+resume_score_agent, resume_score_prompt = agent_and_prompt("resume_score")
+contact_extractor_chain = LazyRunnable(CHAIN_FACTORIES["contact_extractor"])
+summary_agent, summary_prompt = agent_and_prompt("summary")
+custom_score_chain = LazyRunnable(CHAIN_FACTORIES["custom_score"])
+other_comments_chain = LazyRunnable(CHAIN_FACTORIES["other_comments"])
+functional_constituent_chain = LazyRunnable(CHAIN_FACTORIES["functional_constituent"])
+technical_constituent_chain = LazyRunnable(CHAIN_FACTORIES["technical_constituent"])
+education_extractor_chain = LazyRunnable(CHAIN_FACTORIES["education_extractor"])
+project_extractor_chain = LazyRunnable(CHAIN_FACTORIES["project_extractor"])
+company_extractor_agent, company_extractor_prompt = agent_and_prompt("company_extractor")
+name_extractor_chain = LazyRunnable(CHAIN_FACTORIES["name_extractor"])
+yoe_agent, yoe_prompt = agent_and_prompt("yoe")
+recruiters_overview_agent, recruiters_overview_prompt = agent_and_prompt("recruiters_overview")
+location_extractor_chain = LazyRunnable(CHAIN_FACTORIES["location_extractor"])
+designation_extractor_chain = LazyRunnable(CHAIN_FACTORIES["designation_extractor"])
+field_reask_chain = LazyRunnable(CHAIN_FACTORIES["field_reask"])
+
+
+def warm_up(names = None):
+    """
+    Build the embedding client and the given chains, with the chat models of their tiers
+    (all by default), ahead of the first request.
+
+    Returns:
+        Dict of name -> build time in ms (0 for ones already built)
+    """
+    timings = {}
+    start = time.perf_counter()
+    get_embeddings()
+    timings["embeddings"] = round((time.perf_counter() - start) * 1000, 2)
+
+    for name in names or CHAIN_FACTORIES:
+        start = time.perf_counter()
+        CHAIN_FACTORIES[name]()
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    structlogger.info("Chains warmed up", total_ms=round(sum(timings.values()), 2))
+    return timings
+
+
+def chains_status():
+    return {name: factory.built() for name, factory in CHAIN_FACTORIES.items()}
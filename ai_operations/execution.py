@@ -0,0 +1,290 @@
+import os
+import re
+import json
+import random
+import asyncio
+from collections import defaultdict
+from pydantic import ValidationError, RootModel
+from langchain_core.exceptions import OutputParserException
+from dotenv import load_dotenv
+from ai_operations.scheduler import llm_scheduler, estimate_tokens, classify_error
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+load_dotenv()
+
+# Upper bound on LLM calls in flight per worker process; tune with LLM_MAX_INFLIGHT
+LLM_MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", 64))
+_inflight_limit = asyncio.Semaphore(LLM_MAX_INFLIGHT)
+
+
+async def ainvoke_limited(runnable, payload, model_name: str = "default", fallbacks = ()):
+    """
+    Invoke a chain/agent through the per-model scheduler (rate limits and adaptive
+    concurrency) and the per-worker in-flight cap.
+
+    When the model is throttled or failing (429/5xx), the call is repeated on each of
+    `fallbacks` in turn, selected through the "model" configurable (see
+    `model_router.ModelAlternatives`) and scheduled under that model's own limits.
+    """
+    models = [model_name] + [model for model in fallbacks if model != model_name]
+    estimated_tokens = estimate_tokens(payload)
+
+    for position, model in enumerate(models):
+
+        async def call():
+            async with _inflight_limit:
+                return await runnable.ainvoke(payload, config = {"configurable": {"model": model}})
+
+        try:
+            return await llm_scheduler.run(model, call, estimated_tokens = estimated_tokens)
+        except Exception as error:
+            outcome = classify_error(error)
+            if outcome not in ("throttled", "server_error") or position == len(models) - 1:
+                raise
+            structlogger.warning("Falling back to another model", model=model, fallback=models[position + 1],
+                                 outcome=outcome, error=str(error))
+
+
+def scheduler_status():
+
+    return {
+        "max_inflight": LLM_MAX_INFLIGHT,
+        "inflight": LLM_MAX_INFLIGHT - _inflight_limit._value,
+        "models": llm_scheduler.stats(),
+    }
+
+
+# Exponential backoff with full jitter, applied only to transport/provider errors
+RETRY_BACKOFF_BASE = float(os.getenv("LLM_RETRY_BACKOFF_BASE", 0.5))
+RETRY_BACKOFF_CAP = float(os.getenv("LLM_RETRY_BACKOFF_CAP", 8.0))
+
+execution_stats = defaultdict(lambda: {"calls": 0, "llm_calls": 0, "succeeded": 0, "failed": 0, "local_repairs": 0,
+                                       "partial_reasks": 0, "lenient_accepts": 0, "transport_retries": 0, "full_retries": 0})
+
+# Path of one entry of a list-shaped output: "projects[2]", or "[2]" for a list at the top level
+ENTRY_PATH = re.compile(r"^(\w*)\[(\d+)\]$")
+
+
+def backoff_delay(attempt: int) -> float:
+    return random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+
+def repair_json(text):
+    """
+    Best-effort local repair of almost-JSON model output (code fences, prose around
+    the object, trailing commas, Python literals, unclosed brackets).
+
+    Returns:
+        The parsed value, or None if the text could not be repaired
+    """
+    if not isinstance(text, str):
+        return None
+
+    candidate = re.sub(r"^```(?:json)?|```$", "", text.strip(), flags=re.MULTILINE).strip()
+    starts = [idx for idx in (candidate.find("{"), candidate.find("[")) if idx >= 0]
+    if not starts:
+        return None
+    candidate = candidate[min(starts):]
+
+    for literal, replacement in (("True", "true"), ("False", "false"), ("None", "null")):
+        candidate = re.sub(rf"([:\[,]\s*){literal}\b", rf"\g<1>{replacement}", candidate)
+    candidate = re.sub(r",\s*([}\]])", r"\1", candidate)
+
+    # Close brackets left open by a truncated response
+    stack, in_string, escaped, end = [], False, False, len(candidate)
+    for idx, char in enumerate(candidate):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+            if not stack:
+                end = idx + 1
+                break
+    candidate = candidate[:end].rstrip().rstrip(",") + ('"' if in_string else "") + "".join(reversed(stack))
+
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        return None
+
+
+def invalid_fields(schema, output):
+    """
+    Parts of `output` that are missing or fail validation against `schema`: top-level
+    field names, or single list entries ("projects[2]", "[2]" for a list schema) when
+    only some entries of a list are invalid.
+
+    Returns:
+        List of paths (empty when valid), or None when the output cannot be checked
+        part by part (wrong type)
+    """
+    if schema is None:
+        return []
+
+    try:
+        schema.model_validate(output)
+        return []
+    except ValidationError as e:
+        errors = e.errors()
+
+    root = issubclass(schema, RootModel)
+    if (root and not isinstance(output, list)) or (not root and not isinstance(output, dict)):
+        return None
+
+    paths = set() if root else {field for field in schema.model_fields if field not in output}
+    for error in errors:
+        loc = error["loc"]
+        if root and loc and isinstance(loc[0], int):
+            paths.add(f"[{loc[0]}]")
+        elif root:
+            return None
+        elif loc and loc[0] in schema.model_fields:
+            paths.add(f"{loc[0]}[{loc[1]}]" if len(loc) > 1 and isinstance(loc[1], int) else loc[0])
+    # A field that is wrong as a whole covers its entries
+    return sorted(path for path in paths if "[" not in path or path.split("[")[0] not in paths)
+
+
+def is_partial(schema, paths) -> bool:
+    """
+    Whether `paths` leave part of the output intact, so re-asking for them is cheaper than a full call.
+    """
+    if not paths:
+        return False
+    if any(ENTRY_PATH.match(path) for path in paths):
+        return True
+    return not issubclass(schema, RootModel) and len(paths) < len(schema.model_fields)
+
+
+def path_schema(json_schema: dict, path: str):
+    """
+    JSON schema of one path reported by `invalid_fields`, resolved against the output's JSON schema.
+    """
+    entry = ENTRY_PATH.match(path)
+    if entry is None:
+        return json_schema.get("properties", {}).get(path)
+    container = json_schema if not entry.group(1) else json_schema.get("properties", {}).get(entry.group(1), {})
+    return container.get("items")
+
+
+def apply_patch(output, paths, patch):
+    """
+    Copy of `output` with every path found in `patch` replaced by its re-asked value.
+    """
+    if not isinstance(patch, dict):
+        return output
+
+    patched = list(output) if isinstance(output, list) else {key: list(value) if isinstance(value, list) else value
+                                                               for key, value in output.items()}
+    for path in paths:
+        if path not in patch:
+            continue
+        entry = ENTRY_PATH.match(path)
+        if entry is None:
+            patched[path] = patch[path]
+            continue
+        container = patched if not entry.group(1) else patched.get(entry.group(1))
+        if isinstance(container, list) and int(entry.group(2)) < len(container):
+            container[int(entry.group(2))] = patch[path]
+    return patched
+
+
+async def invoke_with_retries(runnable, payload, parse_output, is_valid, label: str, model_name: str = "default",
+                              fallbacks = (), max_iter: int = 5, schema = None, reask = None):
+    """
+    Invoke a chain/agent until its parsed output passes `is_valid` and `schema`.
+
+    Recovery is tried cheapest first: malformed JSON is repaired locally, outputs with
+    only some invalid fields or list entries are patched through `reask`, and the full
+    call is repeated only when neither works. `is_valid` is the hard requirement; an
+    output that passes it but still fails `schema` after the re-ask is accepted as it
+    is rather than paid for again. Backoff (with jitter) is applied to transport errors only.
+
+    Args:
+        runnable: Chain or agent exposing `ainvoke`
+        payload: Input passed to the runnable on every attempt
+        parse_output: Maps the raw output to the payload that gets validated
+        is_valid: Acceptance check on the parsed output
+        label: Name used in log lines and execution stats
+        model_name: Model the runnable calls, used for rate limiting
+        fallbacks: Models tried in turn when the model is throttled or failing
+        max_iter: Maximum number of LLM calls (full calls and re-asks)
+        schema: Optional pydantic model the output must validate against
+        reask: Optional coroutine `(output, paths) -> dict` returning replacement values keyed by path
+
+    Returns:
+        The first valid parsed output, or None if every attempt failed
+    """
+    stats = execution_stats[label]
+    stats["calls"] += 1
+    attempts = []
+    output = None
+    llm_calls = 0
+
+    def succeed(result, lenient: bool = False):
+        stats["succeeded"] += 1
+        stats["lenient_accepts"] += lenient
+        stats["llm_calls"] += llm_calls
+        structlogger.debug(f"{label} - Request completed", attempts=attempts, lenient=lenient)
+        return result
+
+    while llm_calls < max_iter:
+        if output is None:
+            llm_calls += 1
+            try:
+                output = parse_output(await ainvoke_limited(runnable, payload, model_name, fallbacks))
+                attempts.append("call")
+            except OutputParserException as e:
+                output = repair_json(getattr(e, "llm_output", None))
+                attempts.append("call+local_repair" if output is not None else "call+parse_error")
+                stats["local_repairs"] += output is not None
+            except Exception as e:
+                kind = classify_error(e)
+                attempts.append(f"call+{kind}")
+                structlogger.debug(f"{label} - Exception occurred", details=e, kind=kind)
+                if kind in ("throttled", "server_error", "transport"):
+                    stats["transport_retries"] += 1
+                    await asyncio.sleep(backoff_delay(len(attempts) - 1))
+                continue
+
+        paths = invalid_fields(schema, output) if output is not None else None
+        if output is not None and is_valid(output) and paths == []:
+            return succeed(output)
+
+        if reask is not None and is_partial(schema, paths) and llm_calls < max_iter:
+            llm_calls += 1
+            stats["partial_reasks"] += 1
+            try:
+                patched = apply_patch(output, paths, await reask(output, paths))
+                attempts.append(f"reask:{','.join(paths)}")
+                if is_valid(patched) and invalid_fields(schema, patched) == []:
+                    return succeed(patched)
+                if is_valid(patched):
+                    output = patched
+            except Exception as e:
+                attempts.append("reask+error")
+                structlogger.debug(f"{label} - Re-ask failed", details=e)
+
+        if output is not None and is_valid(output):
+            # Values the schema rejects (a null year, an unknown stage) are not worth a full call
+            structlogger.debug(f"{label} - Accepted with schema errors", invalid=invalid_fields(schema, output))
+            return succeed(output, lenient = True)
+
+        structlogger.debug(f"{label} - Retrying. Response data:", response=output, attempts=attempts)
+        stats["full_retries"] += llm_calls < max_iter
+        output = None
+
+    stats["failed"] += 1
+    stats["llm_calls"] += llm_calls
+    structlogger.debug(f"{label} - All attempts failed", attempts=attempts)
+    return None
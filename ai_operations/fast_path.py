@@ -0,0 +1,179 @@
+import os
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from dotenv import load_dotenv
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+load_dotenv()
+
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+# Deterministic results below this confidence go to the LLM chain instead
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", 0.8))
+
+EMAIL = re.compile(r"(?<![\w.+-])[A-Za-z0-9][\w.+-]*@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}(?![\w-])")
+PHONE = re.compile(r"(?<![\w+])(\+?\(?\d[\d\s().-]{7,}\d)(?![\w])")
+NAME_TOKEN = re.compile(r"^[A-Z][A-Za-z'\-]*\.?$|^[A-Z]\.$")
+
+# Leading words that end a header name ("Jane Doe Senior Data Engineer", "Curriculum Vitae")
+NOT_NAME_WORDS = {
+    "resume", "curriculum", "vitae", "cv", "profile", "summary", "contact", "page", "of", "and", "the", "at",
+    "engineer", "developer", "manager", "senior", "junior", "software", "data", "analyst", "consultant",
+    "designer", "intern", "scientist", "architect", "lead", "head", "director", "specialist", "associate",
+    "email", "phone", "mobile", "address", "linkedin", "github", "objective", "experience", "education", "skills",
+}
+
+
+def find_phones(text: str) -> list:
+
+    phones = []
+    for match in PHONE.finditer(text):
+        candidate = match.group(1).strip()
+        digits = re.sub(r"\D", "", candidate)
+        # Year ranges and dates ("2018 - 2020", "01.02.2019") have too few digits
+        if 10 <= len(digits) <= 15 and not re.fullmatch(r"(19|20)\d{2}\D+(19|20)\d{2}", candidate):
+            phones.append(" ".join(candidate.split()))
+    return phones
+
+
+def extract_contacts(text: str):
+    """
+    Email address and phone number by pattern.
+
+    Returns:
+        (payload in the getContacts shape, confidence): confident when exactly one distinct email
+        and one distinct phone number are found; several candidates or a missing one are left
+        to the LLM, which can also read obfuscated forms ("jane at example dot com")
+    """
+    emails = list(dict.fromkeys(email.lower() for email in EMAIL.findall(text)))
+    phones = list(dict.fromkeys(find_phones(text)))
+    phone_digits = {re.sub(r"\D", "", phone)[-10:] for phone in phones}
+
+    email_id = emails[0] if emails else ""
+    mobile_number = phones[0] if phones else ""
+
+    if len(emails) == 1 and len(phone_digits) == 1:
+        confidence = 1.0
+    elif emails and phones:
+        # Several addresses or numbers: the first one is usually the candidate's own
+        confidence = 0.6
+    else:
+        confidence = 0.3
+
+    if email_id and mobile_number:
+        color, comment = "green", "Both contact number and email ID are present."
+    elif email_id:
+        color, comment = "red", "Phone number is missing."
+    elif mobile_number:
+        color, comment = "red", "Email ID is missing."
+    else:
+        color, comment = "red", "Both are missing."
+
+    return {"color": color, "comment": comment, "email_id": email_id, "mobile_number": mobile_number}, confidence
+
+
+def header_name(text: str):
+    """
+    Leading run of 2-4 capitalized words at the top of the resume, in proper case.
+    """
+    for line in text.split("\n")[:5]:
+        words = []
+        for word in line.replace("|", " ").replace(",", " ").split():
+            if not NAME_TOKEN.match(word) and not (word.isupper() and word.isalpha()):
+                break
+            if word.lower().strip(".") in NOT_NAME_WORDS:
+                break
+            words.append(word)
+            if len(words) == 4:
+                break
+        if len(words) >= 2:
+            return " ".join(word if word.endswith(".") and len(word) == 2 else word.capitalize() for word in words)
+        if line.strip() and not all(word.lower() in NOT_NAME_WORDS for word in line.split()):
+            # The first non-empty line after any "Resume"/"Curriculum Vitae" title is the header
+            return None
+    return None
+
+
+def extract_name(text: str, email_id: str = ""):
+    """
+    Candidate name from the resume header, checked against the email address.
+
+    Returns:
+        ({"name": ...}, confidence): highest when the header name also appears in the email's local part
+    """
+    name = header_name(text)
+    if name is None:
+        return {"name": "Name Not Found"}, 0.0
+
+    emails = EMAIL.findall(text)
+    local_part = re.sub(r"[^a-z]", "", (email_id or (emails[0] if emails else "")).split("@")[0].lower())
+    parts = [re.sub(r"[^a-z]", "", part.lower()) for part in name.split()]
+    parts = [part for part in parts if len(part) > 1]
+
+    if local_part and parts and any(part in local_part for part in parts):
+        confidence = 0.95
+    else:
+        # No email to confirm it (a title, city or company heading looks like a name too), or the
+        # email names someone else (or is unrelated, e.g. "hr@..."); let the LLM decide
+        confidence = 0.6
+    return {"name": name}, confidence
+
+
+def fast_contacts(data: dict, text: str):
+    return extract_contacts(text)
+
+def fast_names(data: dict, text: str):
+    return extract_name(text, data.get("email_id", "") or "")
+
+
+class FastPathStats:
+
+    def __init__(self):
+        self.counters = defaultdict(lambda: {"attempts": 0, "served": 0, "fallbacks": 0})
+        self._lock = threading.Lock()
+
+    def record(self, name: str, served: bool):
+
+        with self._lock:
+            self.counters[name]["attempts"] += 1
+            self.counters[name]["served" if served else "fallbacks"] += 1
+
+    def snapshot(self):
+
+        with self._lock:
+            return {
+                "enabled": FAST_PATH_ENABLED,
+                "min_confidence": FAST_PATH_MIN_CONFIDENCE,
+                "sections": {name: {**counts, "served_pct": round(counts["served"] / counts["attempts"] * 100, 1)}
+                             for name, counts in self.counters.items()},
+            }
+
+
+fast_path_stats = FastPathStats()
+
+
+def run_fast_path(name: str, extractor, data: dict):
+    """
+    Deterministic result for a section when the extractor is confident enough. Extractors
+    read the full resume, only NFKC-normalized: the prompt preprocessing (hyphen joins,
+    section routing, truncation) could alter or drop the contact details they look for.
+
+    Returns:
+        The section payload, or None when the LLM chain should run
+    """
+    text = data.get("resumeText", None)
+    if not FAST_PATH_ENABLED or not isinstance(text, str) or not text:
+        return None
+
+    try:
+        output, confidence = extractor(data, unicodedata.normalize("NFKC", text))
+    except Exception as e:
+        structlogger.debug(f"API: /{name} - Fast path failed", details=e)
+        output, confidence = None, 0.0
+
+    served = output is not None and confidence >= FAST_PATH_MIN_CONFIDENCE
+    fast_path_stats.record(name, served)
+    structlogger.debug(f"API: /{name} - Fast path", served=served, confidence=confidence)
+    return output if served else None
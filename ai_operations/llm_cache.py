@@ -0,0 +1,190 @@
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from dotenv import load_dotenv
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+load_dotenv()
+
+
+def normalize_text(value):
+
+    if not isinstance(value, str):
+        return value
+    return re.sub(r"\s+", " ", value).strip()
+
+
+def cache_key(prompt_name: str, prompt_version: str, model_name: str, fields: dict, schema_version: str = "") -> str:
+    """
+    Content address of one LLM result.
+
+    Args:
+        prompt_name: Name of the prompt in prompts.yml
+        prompt_version: Hash of the prompt template, so prompt edits invalidate old entries
+        model_name: Model the chain/agent runs on
+        fields: Request fields the output depends on (resume text, job role, ...)
+        schema_version: Hash of the output schema's format instructions, so results in an
+            old schema are not served after it changes
+    """
+    material = {
+        "prompt": prompt_name,
+        "prompt_version": prompt_version,
+        "schema_version": schema_version,
+        "model": model_name,
+        "fields": {key: normalize_text(value) for key, value in sorted(fields.items())},
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMResultCache:
+    """
+    Disk-backed (SQLite) store of validated LLM outputs with TTL and size-based LRU eviction.
+
+    The store's size is kept as a running total, so writes only touch the table to evict
+    when it is over budget; expired entries are swept at most every `sweep_interval` seconds.
+    `aget`/`aset` run the blocking SQLite calls in a worker thread, off the event loop.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: int, enabled: bool = True, sweep_interval: int = 300):
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.sweep_interval = sweep_interval
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expirations": 0}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._size = 0
+        self._last_sweep = 0.0
+
+    def _connection(self):
+
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("pragma journal_mode=wal")
+            conn.execute("""create table if not exists llm_cache (
+                                key text primary key,
+                                value text not null,
+                                size integer not null,
+                                created_at real not null,
+                                last_access real not null)""")
+            conn.execute("create index if not exists llm_cache_last_access on llm_cache (last_access)")
+            conn.execute("create index if not exists llm_cache_created_at on llm_cache (created_at)")
+            # Summed once per process; kept up to date by every write and delete after that
+            self._size = conn.execute("select coalesce(sum(size), 0) from llm_cache").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str):
+
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("select value, size, created_at from llm_cache where key = ?", (key,)).fetchone()
+
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+
+            value, size, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute("delete from llm_cache where key = ?", (key,))
+                self._size -= size
+                self.counters["expirations"] += 1
+                self.counters["misses"] += 1
+                return None
+
+            conn.execute("update llm_cache set last_access = ? where key = ?", (now, key))
+            self.counters["hits"] += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value):
+
+        if not self.enabled:
+            return
+
+        encoded = json.dumps(value, default=str)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            replaced = conn.execute("select size from llm_cache where key = ?", (key,)).fetchone()
+            conn.execute("insert or replace into llm_cache (key, value, size, created_at, last_access) values (?, ?, ?, ?, ?)",
+                         (key, encoded, len(encoded), now, now))
+            self._size += len(encoded) - (replaced[0] if replaced else 0)
+            self.counters["writes"] += 1
+
+            if now - self._last_sweep >= self.sweep_interval:
+                self._expire(conn, now)
+            if self._size > self.max_bytes:
+                self._evict(conn)
+
+    async def aget(self, key: str):
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value):
+        await asyncio.to_thread(self.set, key, value)
+
+    def _expire(self, conn, now):
+
+        self._last_sweep = now
+        cutoff = now - self.ttl_seconds
+        expired = conn.execute("select count(*), coalesce(sum(size), 0) from llm_cache where created_at < ?", (cutoff,)).fetchone()
+        if expired[0]:
+            conn.execute("delete from llm_cache where created_at < ?", (cutoff,))
+            self._size -= expired[1]
+            self.counters["expirations"] += expired[0]
+
+    def _evict(self, conn):
+
+        # Drop least recently used entries until the store is back under 90% of its budget
+        target = int(self.max_bytes * 0.9)
+        victims = []
+        for key, size in conn.execute("select key, size from llm_cache order by last_access asc"):
+            if self._size <= target:
+                break
+            victims.append((key,))
+            self._size -= size
+
+        conn.executemany("delete from llm_cache where key = ?", victims)
+        self.counters["evictions"] += len(victims)
+
+    def stats(self):
+
+        with self._lock:
+            if self.enabled:
+                entries = self._connection().execute("select count(*) from llm_cache").fetchone()[0]
+                size = self._size
+            else:
+                entries, size = 0, 0
+
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "enabled": self.enabled,
+        }
+
+
+llm_cache = LLMResultCache(
+    path = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3")),
+    max_bytes = int(os.getenv("LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+    ttl_seconds = int(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+    enabled = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+    sweep_interval = int(os.getenv("LLM_CACHE_SWEEP_SECONDS", 300)),
+)
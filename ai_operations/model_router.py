@@ -0,0 +1,160 @@
+import os
+import json
+import threading
+from collections import defaultdict, deque
+from functools import lru_cache
+from dotenv import load_dotenv
+from langchain_core.runnables import Runnable
+from ai_operations.execution import execution_stats
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+load_dotenv()
+
+# Model, fallback chain, request timeout (s) and output token cap per tier. Output caps
+# include thinking tokens on 2.5 models. Override or add tiers with e.g.
+# LLM_MODEL_TIERS='{"flash": {"model": "gemini-2.5-flash-lite"}, "pro": {"timeout": 90}}'
+DEFAULT_TIERS = {
+    "pro": {"model": "gemini-2.5-pro", "fallbacks": ["gemini-2.5-flash"], "timeout": 120, "max_output_tokens": 16384},
+    "flash": {"model": "gemini-2.5-flash", "fallbacks": ["gemini-2.5-pro"], "timeout": 45, "max_output_tokens": 8192},
+    "lite": {"model": "gemini-2.5-flash-lite", "fallbacks": ["gemini-2.5-flash"], "timeout": 30, "max_output_tokens": 4096},
+}
+MODEL_TIERS = {tier: dict(config) for tier, config in DEFAULT_TIERS.items()}
+for tier, config in json.loads(os.getenv("LLM_MODEL_TIERS", "{}")).items():
+    MODEL_TIERS[tier] = {**MODEL_TIERS.get(tier, DEFAULT_TIERS["pro"]), **config}
+
+# Tier per task (prompt name); unlisted tasks use LLM_DEFAULT_TIER. Lookups and short
+# extractions run on flash, scoring and writing on pro. Override with e.g.
+# LLM_TASK_TIERS='{"extract_names": "lite", "get_custom_scores": "flash"}'
+LLM_DEFAULT_TIER = os.getenv("LLM_DEFAULT_TIER", "pro")
+TASK_TIERS = {
+    "get_contact_information": "flash",
+    "extract_names": "flash",
+    "extract_location": "flash",
+    "designation_extractor": "flash",
+    "education_extractor": "flash",
+    **json.loads(os.getenv("LLM_TASK_TIERS", "{}")),
+}
+
+
+@lru_cache(maxsize=None)
+def chat_model(model: str, timeout: float = None, max_output_tokens: int = None):
+    # Imported here: the provider SDK takes about a second to import
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(model=model, temperature=0., timeout=timeout, max_output_tokens=max_output_tokens)
+
+
+def task_tier(task: str) -> str:
+
+    tier = TASK_TIERS.get(task, LLM_DEFAULT_TIER)
+    if tier not in MODEL_TIERS:
+        structlogger.debug("Model router - Unknown tier, using default", task=task, tier=tier)
+        return LLM_DEFAULT_TIER
+    return tier
+
+
+def task_model(task: str) -> str:
+    """
+    Primary model of a task; used for rate limiting and in result cache keys.
+    """
+    return MODEL_TIERS[task_tier(task)]["model"]
+
+
+def task_fallbacks(task: str) -> list:
+    """
+    Models tried, in order, when the primary model of a task is throttled or failing.
+    """
+    config = MODEL_TIERS[task_tier(task)]
+    return [model for model in config.get("fallbacks", []) if model != config["model"]]
+
+
+def task_models(task: str) -> dict:
+    """
+    Chat models of a task's tier, primary first, built with the tier's timeout and output cap.
+
+    Returns:
+        Dict of model name -> chat model
+    """
+    config = MODEL_TIERS[task_tier(task)]
+    return {model: chat_model(model, config.get("timeout"), config.get("max_output_tokens"))
+            for model in [config["model"]] + task_fallbacks(task)}
+
+
+class ModelAlternatives(Runnable):
+    """
+    One runnable per model of a tier (a chat model, or an agent built on it), picked by
+    the "model" key of the call's configurable config, the first (primary) one by default.
+
+    Falling back is left to the caller (`execution.ainvoke_limited`), so every attempt
+    goes through the rate limits and adaptive concurrency of the model it actually calls.
+    """
+
+    def __init__(self, alternatives: dict):
+        self.alternatives = alternatives
+        self.default = next(iter(alternatives))
+
+    def select(self, config = None):
+        model = ((config or {}).get("configurable") or {}).get("model", self.default)
+        return self.alternatives.get(model, self.alternatives[self.default])
+
+    def invoke(self, input, config = None, **kwargs):
+        return self.select(config).invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config = None, **kwargs):
+        return await self.select(config).ainvoke(input, config, **kwargs)
+
+
+def task_llm(task: str):
+    """
+    Model runnable for a chain: the tier's model, or one of its fallbacks when selected by the caller.
+    """
+    return ModelAlternatives(task_models(task))
+
+
+class RouterStats:
+    """
+    Latency and outcome of every routed task, to tune the tier assignment from data.
+    """
+
+    def __init__(self, window: int = 512):
+        self.counters = defaultdict(lambda: {"calls": 0, "succeeded": 0, "failed": 0, "cache_hits": 0})
+        self.latencies = defaultdict(lambda: deque(maxlen=window))
+        self.labels = {}
+        self._lock = threading.Lock()
+
+    def record(self, task: str, label: str, latency: float = None, succeeded: bool = True, cache_hit: bool = False):
+
+        with self._lock:
+            counters = self.counters[task]
+            counters["calls"] += 1
+            self.labels[task] = label
+            if cache_hit:
+                counters["cache_hits"] += 1
+                return
+            counters["succeeded" if succeeded else "failed"] += 1
+            self.latencies[task].append(latency)
+
+    def snapshot(self):
+
+        with self._lock:
+            tasks = {}
+            for task, counters in self.counters.items():
+                latencies = sorted(self.latencies[task])
+                percentile = lambda p: round(latencies[int(p * (len(latencies) - 1))] * 1000, 1) if latencies else None
+                # Retries and repairs of the task's calls are the quality signal
+                execution = execution_stats.get(self.labels.get(task), {})
+                calls = execution.get("calls", 0)
+                tasks[task] = {
+                    "tier": task_tier(task),
+                    "model": task_model(task),
+                    **counters,
+                    "p50_ms": percentile(0.5),
+                    "p95_ms": percentile(0.95),
+                    "llm_calls_per_call": round(execution.get("llm_calls", 0) / calls, 2) if calls else None,
+                    "retry_rate": round((execution.get("partial_reasks", 0) + execution.get("full_retries", 0)) / calls, 3) if calls else None,
+                    "repair_rate": round(execution.get("local_repairs", 0) / calls, 3) if calls else None,
+                }
+            return {"default_tier": LLM_DEFAULT_TIER, "tiers": MODEL_TIERS, "tasks": tasks}
+
+
+router_stats = RouterStats()
@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import asyncio
+from dotenv import load_dotenv
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+load_dotenv()
+
+# Defaults apply to every model without an entry in LLM_RATE_LIMITS, e.g.
+# LLM_RATE_LIMITS='{"gemini-2.5-pro": {"rpm": 150, "tpm": 2000000, "max_concurrency": 32}}'
+DEFAULT_LIMITS = {
+    "rpm": int(os.getenv("LLM_DEFAULT_RPM", 150)),
+    "tpm": int(os.getenv("LLM_DEFAULT_TPM", 2_000_000)),
+    "max_concurrency": int(os.getenv("LLM_DEFAULT_MAX_CONCURRENCY", 32)),
+    "min_concurrency": int(os.getenv("LLM_DEFAULT_MIN_CONCURRENCY", 1)),
+}
+MODEL_LIMITS = json.loads(os.getenv("LLM_RATE_LIMITS", "{}"))
+
+# Rough request size used for the tokens-per-minute bucket (characters per token, expected output)
+CHARS_PER_TOKEN = 4
+EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", 1024))
+
+
+def estimate_tokens(payload) -> int:
+    return len(json.dumps(payload, default=str)) // CHARS_PER_TOKEN + EXPECTED_OUTPUT_TOKENS
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Map a provider exception to "throttled", "server_error", "transport" or "other".
+    """
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    response = getattr(error, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+
+    message = f"{type(error).__name__} {error}"
+    if status == 429 or any(marker in message for marker in ("429", "ResourceExhausted", "RateLimit", "RESOURCE_EXHAUSTED")):
+        return "throttled"
+    if isinstance(status, int) and status >= 500:
+        return "server_error"
+    if any(marker in message for marker in ("ServiceUnavailable", "InternalServerError", "DeadlineExceeded", " 500", " 503")):
+        return "server_error"
+    if isinstance(error, (TimeoutError, ConnectionError)) or \
+       any(marker in type(error).__name__ for marker in ("Timeout", "ConnectError", "ConnectionError", "RemoteProtocolError")):
+        return "transport"
+    return "other"
+
+
+class TokenBucket:
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.refill_rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def available(self):
+        self._refill()
+        return self.tokens
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until `amount` is available. Requests larger than the whole bucket
+        go through once it is full.
+        """
+        self._refill()
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.refill_rate)
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class ModelScheduler:
+    """
+    Admission control for one model: requests/min and tokens/min buckets plus an
+    AIMD concurrency limit that halves on 429/5xx and grows by ~1 per healthy window.
+    """
+
+    def __init__(self, model_name: str, rpm: int, tpm: int, max_concurrency: int, min_concurrency: int = 1):
+
+        self.model_name = model_name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency_limit = float(max_concurrency)
+        self.inflight = 0
+        self.queued = 0
+        self.counters = {"admitted": 0, "succeeded": 0, "throttled": 0, "server_errors": 0, "transport_errors": 0, "other_errors": 0, "backoffs": 0}
+        self._last_backoff = 0.0
+        self._slots = asyncio.Condition()
+
+    async def acquire(self, estimated_tokens: int):
+
+        self.queued += 1
+        slot_held = False
+        try:
+            async with self._slots:
+                await self._slots.wait_for(lambda: self.inflight < int(self.concurrency_limit))
+                self.inflight += 1
+                slot_held = True
+
+            # Rate buckets are checked after a slot is held so waiting requests keep their place
+            while True:
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+                if wait == 0.0:
+                    self.requests.take(1)
+                    self.tokens.take(estimated_tokens)
+                    break
+                await asyncio.sleep(wait)
+        except BaseException:
+            # A waiter cancelled while still queued (client gone, stream closed) never took a slot
+            if slot_held:
+                await self._release_slot()
+            raise
+        finally:
+            self.queued -= 1
+
+        self.counters["admitted"] += 1
+
+    async def _release_slot(self):
+
+        async with self._slots:
+            self.inflight -= 1
+            self._slots.notify_all()
+
+    async def release(self, outcome: str):
+
+        if outcome == "success":
+            self.counters["succeeded"] += 1
+            # Additive increase: +1 to the limit after roughly `limit` successful calls
+            self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1.0 / self.concurrency_limit)
+        elif outcome in ("throttled", "server_error"):
+            self.counters["throttled" if outcome == "throttled" else "server_errors"] += 1
+            # Multiplicative decrease, at most once per second so a burst of failures counts once
+            now = time.monotonic()
+            if now - self._last_backoff > 1.0:
+                self._last_backoff = now
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+                self.counters["backoffs"] += 1
+                structlogger.debug("Scheduler - Backing off", model=self.model_name, outcome=outcome,
+                                   concurrency_limit=self.concurrency_limit)
+        elif outcome == "transport":
+            self.counters["transport_errors"] += 1
+        elif outcome == "other":
+            self.counters["other_errors"] += 1
+
+        await self._release_slot()
+
+    def stats(self):
+
+        return {
+            "model": self.model_name,
+            "concurrency_limit": int(self.concurrency_limit),
+            "max_concurrency": self.max_concurrency,
+            "inflight": self.inflight,
+            "queue_depth": self.queued,
+            "rpm": int(self.requests.capacity),
+            "tpm": int(self.tokens.capacity),
+            "available_requests": int(self.requests.available()),
+            "available_tokens": int(self.tokens.available()),
+            **self.counters,
+        }
+
+
+class LLMScheduler:
+
+    def __init__(self):
+        self._models = {}
+
+    def for_model(self, model_name: str) -> ModelScheduler:
+
+        if model_name not in self._models:
+            limits = {**DEFAULT_LIMITS, **MODEL_LIMITS.get(model_name, {})}
+            self._models[model_name] = ModelScheduler(model_name, **limits)
+        return self._models[model_name]
+
+    async def run(self, model_name: str, call, estimated_tokens: int):
+        """
+        Run the coroutine factory `call` once admitted for `model_name`, feeding the
+        outcome back into the model's adaptive concurrency limit.
+        """
+        scheduler = self.for_model(model_name)
+        await scheduler.acquire(estimated_tokens)
+
+        outcome = "cancelled"
+        try:
+            result = await call()
+            outcome = "success"
+            return result
+        except Exception as e:
+            outcome = classify_error(e)
+            raise
+        finally:
+            await scheduler.release(outcome)
+
+    def stats(self):
+        return {model_name: scheduler.stats() for model_name, scheduler in self._models.items()}
+
+
+llm_scheduler = LLMScheduler()
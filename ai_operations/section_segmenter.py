@@ -0,0 +1,160 @@
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SECTION_ROUTING_ENABLED = os.getenv("SECTION_ROUTING_ENABLED", "true").lower() == "true"
+# Share of the core sections (experience, education, skills) that must be found before
+# chains get only their sections; below it they get the full resume
+SECTION_MIN_CONFIDENCE = float(os.getenv("SECTION_MIN_CONFIDENCE", 0.6))
+# Routed input shorter than this means the section was found but is (nearly) empty
+MIN_SECTION_CHARS = 40
+
+SECTION_HEADINGS = {
+    "contact": ["contact", "contact information", "contact details", "personal details", "personal information"],
+    "summary": ["summary", "professional summary", "career summary", "profile", "professional profile", "about me",
+                "objective", "career objective", "professional objective"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "career history", "relevant experience", "industry experience", "internships",
+                   "internship experience"],
+    "education": ["education", "academic background", "academic qualifications", "educational qualifications",
+                  "education and training", "academics", "qualifications"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "selected projects",
+                 "project experience", "side projects"],
+    "skills": ["skills", "technical skills", "core competencies", "key skills", "competencies", "technologies",
+               "tools and technologies", "skills and tools"],
+    # Not routed anywhere, but they end the section before them
+    "other": ["certifications", "certificates", "awards", "achievements", "honors", "publications", "languages",
+              "interests", "hobbies", "volunteering", "volunteer experience", "references", "activities",
+              "extracurricular activities", "courses", "training"],
+}
+CORE_SECTIONS = ("experience", "education", "skills")
+
+# Sections each prompt needs; prompts not listed always get the full resume
+PROMPT_SECTIONS = {
+    "get_contact_information": ("contact",),
+    "extract_names": ("contact",),
+    "extract_location": ("contact", "experience"),
+    "education_extractor": ("education",),
+    "company_extractor": ("experience",),
+    "project_extractor": ("projects", "experience"),
+    "designation_extractor": ("summary", "experience"),
+    # Graduation dates tell full-time experience from internships and study-time work
+    "extract_yoe": ("summary", "experience", "education"),
+}
+
+HEADING_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_PHRASES = sorted(HEADING_SECTION, key=len, reverse=True)
+
+
+def _alternation(phrases) -> str:
+    return "|".join(re.escape(phrase).replace(r"\ ", r"\s+") for phrase in phrases)
+
+
+# A line holding only a heading ("Work Experience", "EDUCATION:", "# Skills")
+LINE_HEADING = re.compile(rf"^[ \t]*(?:[#*\-\u2022]\s*)?({_alternation(_PHRASES)})[ \t]*:?[ \t]*$", re.IGNORECASE | re.MULTILINE)
+# Inline upper-case headings in page-per-line text (pdf.js joins a page into one line). Title-case
+# ones are not matched inline: "Technologies: ..." inside a job entry would end the experience section
+UPPER_HEADING = re.compile(rf"(?<![A-Za-z])({_alternation(phrase.upper() for phrase in _PHRASES)})(?![A-Za-z])")
+
+CONTACT_DETAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+|\+?\d[\d\s().-]{7,}\d|(?:linkedin|github)\.com/\S+", re.IGNORECASE)
+CONTACT_CONTEXT_CHARS = 60
+
+
+@dataclass
+class ResumeSections:
+    """
+    Resume split at its section headings.
+
+    Attributes:
+        sections: Section name -> text (heading included); "contact" also holds the text before
+            the first heading and contact details found anywhere else
+        headings: (position, section, heading text) of every detected heading
+        confidence: Share of the core sections found, lowered when most of the text precedes the first heading
+    """
+    sections: dict = field(default_factory=dict)
+    headings: list = field(default_factory=list)
+    confidence: float = 0.0
+
+    def select(self, names) -> str:
+
+        return "\n\n".join(self.sections[name] for name in names if self.sections.get(name))
+
+
+def find_headings(text: str):
+
+    found = {}
+    for pattern in (LINE_HEADING, UPPER_HEADING):
+        for match in pattern.finditer(text):
+            heading = " ".join(match.group(1).lower().split())
+            if heading in HEADING_SECTION and not any(start <= match.start(1) < end for start, (end, _, _) in found.items()):
+                found[match.start(1)] = (match.end(1), HEADING_SECTION[heading], match.group(1))
+
+    # A heading matched by both patterns is kept once
+    return [(start, section, heading) for start, (_, section, heading) in sorted(found.items())]
+
+
+def contact_details(text: str, start: int) -> list:
+    """
+    Snippets around email addresses, phone numbers and profile links after `start` (e.g. in footers).
+    """
+    snippets = []
+    for match in CONTACT_DETAIL.finditer(text, start):
+        detail = match.group()
+        # Date ranges ("2018 - 2020") look like phone numbers but have too few digits
+        if "@" not in detail and ".com/" not in detail.lower() and not 9 <= sum(char.isdigit() for char in detail) <= 15:
+            continue
+        snippets.append(text[max(match.start() - CONTACT_CONTEXT_CHARS, start):match.end() + CONTACT_CONTEXT_CHARS].strip())
+    return snippets
+
+
+@lru_cache(maxsize=256)
+def segment_resume(text: str) -> ResumeSections:
+    """
+    Split a (normalized) resume into sections by detecting headings for contact, summary,
+    experience, education, projects and skills.
+    """
+    headings = find_headings(text)
+    if not headings:
+        return ResumeSections(sections={"contact": text}, headings=[], confidence=0.0)
+
+    parts = {}
+    bounds = [start for start, _, _ in headings] + [len(text)]
+    for (start, section, _), end in zip(headings, bounds[1:]):
+        parts.setdefault(section, []).append(text[start:end].strip())
+
+    preamble = text[:headings[0][0]].strip()
+    contact = [preamble] + parts.get("contact", []) + contact_details(text, headings[0][0])
+    sections = {section: "\n".join(texts) for section, texts in parts.items() if section != "other"}
+    sections["contact"] = "\n".join(dict.fromkeys(part for part in contact if part))
+
+    confidence = len({section for _, section, _ in headings} & set(CORE_SECTIONS)) / len(CORE_SECTIONS)
+    if len(preamble) > len(text) / 2:
+        # Most of the resume before the first heading: headings were likely missed
+        confidence /= 2
+    return ResumeSections(sections=sections, headings=headings, confidence=round(confidence, 2))
+
+
+def route_sections(prompt_name: str, text: str):
+    """
+    Part of the resume a prompt needs.
+
+    Returns:
+        (text, routed): only the prompt's sections and True, or the full `text` and False when the
+        prompt needs the whole resume, segmentation confidence is low or its sections are missing
+    """
+    names = PROMPT_SECTIONS.get(prompt_name, None)
+    if not SECTION_ROUTING_ENABLED or names is None:
+        return text, False
+
+    segmented = segment_resume(text)
+    if segmented.confidence < SECTION_MIN_CONFIDENCE:
+        return text, False
+
+    selected = segmented.select(names)
+    if len(selected) < MIN_SECTION_CHARS:
+        return text, False
+    return selected, True
@@ -0,0 +1,88 @@
+import os
+import copy
+import json
+import asyncio
+import hashlib
+from dotenv import load_dotenv
+from ai_operations.llm_cache import normalize_text
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+load_dotenv()
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+
+def request_key(name: str, data: dict, fields) -> str:
+    """
+    Identity of an analysis request: the route and its whitespace-normalized input fields.
+    """
+    material = {"name": name, "fields": {field: normalize_text(data.get(field, "")) for field in sorted(fields)}}
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller for a key starts the work as a
+    task and every caller arriving while it runs awaits that same task.
+
+    Errors reach every waiting caller, and the key is released as soon as the task
+    finishes, so the next call after a failure starts fresh. A cancelled caller (e.g. a
+    closed browser tab) stops waiting without cancelling the shared task: the other
+    callers still get the result, and a re-submitted request joins the running call
+    instead of paying for a new one.
+    """
+
+    def __init__(self):
+        self.counters = {"leaders": 0, "coalesced": 0, "failed": 0, "cancelled_waiters": 0, "abandoned": 0}
+        self._inflight = {}
+        self._waiters = {}
+
+    def _finished(self, key: str, task: asyncio.Task):
+
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        waiters = self._waiters.pop(task, 0)
+        if task.cancelled():
+            return
+        # Retrieving the exception here also keeps asyncio from logging it as never retrieved
+        if task.exception() is not None:
+            self.counters["failed"] += 1
+        if not waiters:
+            self.counters["abandoned"] += 1
+
+    async def run(self, key: str, fn):
+        """
+        Result of `fn()` (a coroutine function), shared with concurrent callers using the same key.
+        """
+        task = self._inflight.get(key)
+        leader = task is None
+        if leader:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self.counters["leaders"] += 1
+        else:
+            self.counters["coalesced"] += 1
+            structlogger.debug("Single flight - Joined in-flight call", key=key[:12], waiters=self._waiters[task] + 1)
+
+        self._waiters[task] += 1
+        try:
+            result = await asyncio.shield(task)
+            # Joined callers get their own copy, so no caller sees another one's changes
+            return result if leader else copy.deepcopy(result)
+        except asyncio.CancelledError:
+            if not task.done():
+                self.counters["cancelled_waiters"] += 1
+            raise
+        finally:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+
+    def stats(self):
+
+        return {"enabled": SINGLE_FLIGHT_ENABLED, "inflight": len(self._inflight), **self.counters}
+
+
+single_flight = SingleFlight()
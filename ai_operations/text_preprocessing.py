@@ -0,0 +1,284 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from dotenv import load_dotenv
+from ai_operations.scheduler import CHARS_PER_TOKEN
+from ai_operations.section_segmenter import route_sections
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+load_dotenv()
+
+PREPROCESSING_ENABLED = os.getenv("PREPROCESSING_ENABLED", "true").lower() == "true"
+
+# Resume tokens sent per prompt. Prompts reading the header (contact details, name,
+# location) get small budgets; everything else gets RESUME_TOKEN_BUDGET, which only
+# trims unusually long resumes. Override per prompt with e.g.
+# RESUME_TOKEN_BUDGETS='{"extract_names": 1000, "project_extractor": 5000}'
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", 6000))
+PROMPT_TOKEN_BUDGETS = {
+    "get_contact_information": 1500,
+    "extract_names": 1500,
+    "extract_location": 1500,
+    "designation_extractor": 3000,
+    **json.loads(os.getenv("RESUME_TOKEN_BUDGETS", "{}")),
+}
+
+# Share of a truncated resume kept from the start (contact, summary, recent roles);
+# the rest comes from the end (education, certifications)
+TRUNCATION_HEAD_SHARE = 0.7
+
+# pdf.js output has one line per page; page-level lines are at least this long
+PAGE_LINE_CHARS = 400
+# Repeated lines shorter than this (headings, dates, skills) are kept
+MIN_DUPLICATE_LINE_CHARS = 12
+MAX_EDGE_WORDS = 20
+
+CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\ufffd\u200b-\u200d\u2060\ufeff]")
+# A word split across a line break ("manage-\nment"); groups hold the whole tokens on both sides
+HYPHEN_BREAK = re.compile(r"(?<!\S)(\S*?)([a-z]{2,})-[ \t]*\n[ \t]*(?!(?:and|or|to)\b)([a-z]{2,})(\S*)")
+# Emails, URLs and paths keep their hyphens
+NON_WORD_TOKEN = re.compile(r"[@/.]")
+DECORATION = re.compile(r"([_=~*.\-\u2022\u00b7])\1{3,}")
+SPACES = re.compile(r"[ \t]+")
+BLANK_LINES = re.compile(r"\n{3,}")
+DIGITS = re.compile(r"\d+")
+
+
+def estimate_text_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _join_hyphen_break(match) -> str:
+
+    prefix, head, tail, suffix = match.groups()
+    if NON_WORD_TOKEN.search(prefix) or NON_WORD_TOKEN.search(suffix.rstrip(".,;:!?)")):
+        return match.group(0)
+    return f"{prefix}{head}{tail}{suffix}"
+
+
+def _masked(text: str) -> str:
+    # Page numbers differ from page to page ("Page 2 of 3"), so compare with digits masked
+    return DIGITS.sub("#", text.lower())
+
+
+def _edge_words(pages: list, from_end: bool):
+    """
+    Number of leading (or trailing) words every page shares, ignoring digits.
+    """
+    words = [page.split() for page in pages]
+    if from_end:
+        words = [list(reversed(page)) for page in words]
+
+    shared = 0
+    limit = min(MAX_EDGE_WORDS, *(len(page) - 1 for page in words))
+    while shared < limit and len({_masked(page[shared]) for page in words}) == 1:
+        shared += 1
+    return shared
+
+
+def strip_page_edges(lines: list) -> list:
+    """
+    Remove running headers and footers from page-level lines (the pdf.js extraction
+    joins each page into one line), keeping them on the first page.
+    """
+    pages = [idx for idx, line in enumerate(lines) if len(line) >= PAGE_LINE_CHARS]
+    if len(pages) < 2:
+        return lines
+
+    texts = [lines[idx] for idx in pages]
+    head = _edge_words(texts, from_end=False)
+    tail = _edge_words(texts, from_end=True)
+    # One shared word is usually coincidence (e.g. a bullet character)
+    head = head if head >= 2 else 0
+    tail = tail if tail >= 2 else 0
+    if not head and not tail:
+        return lines
+
+    lines = list(lines)
+    for idx in pages[1:]:
+        words = lines[idx].split()
+        lines[idx] = " ".join(words[head:len(words) - tail])
+    first = lines[pages[0]].split()
+    lines[pages[0]] = " ".join(first[:len(first) - tail])
+    return lines
+
+
+def drop_repeated_lines(lines: list) -> list:
+
+    seen = set()
+    kept = []
+    for line in lines:
+        key = _masked(line)
+        if len(line) >= MIN_DUPLICATE_LINE_CHARS and key in seen:
+            continue
+        seen.add(key)
+        kept.append(line)
+    return kept
+
+
+@lru_cache(maxsize=256)
+def normalize_resume_text(text: str) -> str:
+    """
+    Clean extracted resume text before it reaches a prompt: Unicode normalization
+    (ligatures, non-breaking spaces), control/replacement characters, hyphenation
+    breaks, decorative rules, whitespace runs, running page headers/footers and
+    repeated lines.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = CONTROL_CHARS.sub("", text.replace("\r\n", "\n").replace("\r", "\n"))
+    text = HYPHEN_BREAK.sub(_join_hyphen_break, text)
+    text = DECORATION.sub(" ", text)
+
+    lines = [SPACES.sub(" ", line).strip() for line in text.split("\n")]
+    lines = drop_repeated_lines(strip_page_edges(lines))
+    return BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _boundary(text: str, position: int, backwards: bool) -> int:
+    """
+    Nearest line (or else word) boundary to `position`, within a fifth of the way.
+    """
+    window = max(position // 5, 1) if backwards else max((len(text) - position) // 5, 1)
+    for separator in ("\n", " "):
+        if backwards:
+            found = text.rfind(separator, position - window, position)
+        else:
+            found = text.find(separator, position, position + window)
+        if found != -1:
+            return found if backwards else found + 1
+    return position
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Truncate `text` to about `max_tokens`, keeping the start and the end of the
+    resume on line boundaries and marking the omitted middle.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    head_end = _boundary(text, int(max_chars * TRUNCATION_HEAD_SHARE), backwards=True)
+    tail_start = _boundary(text, len(text) - (max_chars - head_end), backwards=False)
+    omitted = tail_start - head_end
+    return f"{text[:head_end].rstrip()}\n[... {omitted} characters omitted ...]\n{text[tail_start:].lstrip()}"
+
+
+def token_budget(prompt_name: str) -> int:
+    return PROMPT_TOKEN_BUDGETS.get(prompt_name, RESUME_TOKEN_BUDGET)
+
+
+class PreprocessingStats:
+    """
+    Token savings of the preprocessing stage, overall and for the most recent resumes.
+    """
+
+    def __init__(self, window: int = 20):
+        self.counters = {"resumes": 0, "raw_tokens": 0, "normalized_tokens": 0, "prompt_calls": 0,
+                         "prompt_raw_tokens": 0, "prompt_sent_tokens": 0, "routed": 0, "truncated": 0}
+        self.recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_resume(self, report: dict):
+
+        with self._lock:
+            self.counters["resumes"] += 1
+            self.counters["raw_tokens"] += report["raw_tokens"]
+            self.counters["normalized_tokens"] += report["normalized_tokens"]
+            self.recent.append(report)
+
+    def record_prompt(self, raw_tokens: int, sent_tokens: int, routed: bool, truncated: bool):
+
+        with self._lock:
+            self.counters["prompt_calls"] += 1
+            self.counters["prompt_raw_tokens"] += raw_tokens
+            self.counters["prompt_sent_tokens"] += sent_tokens
+            self.counters["routed"] += int(routed)
+            self.counters["truncated"] += int(truncated)
+
+    def snapshot(self):
+
+        with self._lock:
+            raw = self.counters["prompt_raw_tokens"]
+            return {
+                "enabled": PREPROCESSING_ENABLED,
+                **self.counters,
+                "saved_tokens": raw - self.counters["prompt_sent_tokens"],
+                "saved_pct": round((raw - self.counters["prompt_sent_tokens"]) / raw * 100, 1) if raw else 0.0,
+                "budgets": {"default": RESUME_TOKEN_BUDGET, **PROMPT_TOKEN_BUDGETS},
+                "recent": list(self.recent),
+            }
+
+
+preprocessing_stats = PreprocessingStats()
+
+
+def prepare_text(prompt_name: str, text: str):
+    """
+    Resume text as sent to one prompt: normalized, restricted to the prompt's sections
+    and fitted to its token budget.
+
+    Returns:
+        (prepared text, routed to sections, truncated)
+    """
+    routed_text, routed = route_sections(prompt_name, normalize_resume_text(text))
+    prepared = fit_to_budget(routed_text, token_budget(prompt_name))
+    return prepared, routed, len(prepared) != len(routed_text)
+
+
+def resume_token_report(text: str, prompt_names = ()):
+    """
+    Tokens of one resume before and after preprocessing, per prompt and in total.
+
+    Returns:
+        Dict with the resume fingerprint, raw and normalized tokens, tokens sent per prompt
+        and the tokens saved over sending the raw text to every prompt
+    """
+    raw_tokens = estimate_text_tokens(text)
+    normalized = normalize_resume_text(text)
+    sent = {name: estimate_text_tokens(prepare_text(name, text)[0]) for name in prompt_names}
+    saved = raw_tokens * len(sent) - sum(sent.values())
+    return {
+        "resume": hashlib.sha256(text.encode("utf-8")).hexdigest()[:12],
+        "raw_tokens": raw_tokens,
+        "normalized_tokens": estimate_text_tokens(normalized),
+        "sent_tokens": sent,
+        "saved_tokens": saved,
+        "saved_pct": round(saved / (raw_tokens * len(sent)) * 100, 1) if raw_tokens and sent else 0.0,
+    }
+
+
+def preprocess_input(prompt_name: str, data: dict, field: str = "resumeText"):
+    """
+    Request payload with its resume text prepared for the prompt (see `prepare_text`).
+    """
+    text = data.get(field, None)
+    if not PREPROCESSING_ENABLED or not isinstance(text, str) or not text:
+        return data
+
+    prepared, routed, truncated = prepare_text(prompt_name, text)
+    preprocessing_stats.record_prompt(estimate_text_tokens(text), estimate_text_tokens(prepared),
+                                      routed = routed, truncated = truncated)
+    return {**data, field: prepared}
+
+
+def report_resume(data: dict, prompt_names, field: str = "resumeText"):
+    """
+    Log and record the token savings of one resume across the prompts it is sent to.
+    """
+    text = data.get(field, None)
+    if not PREPROCESSING_ENABLED or not isinstance(text, str) or not text:
+        return None
+
+    report = resume_token_report(text, prompt_names)
+    preprocessing_stats.record_resume(report)
+    structlogger.info("Preprocessing - Token savings", resume=report["resume"], raw_tokens=report["raw_tokens"],
+                      normalized_tokens=report["normalized_tokens"], saved_tokens=report["saved_tokens"],
+                      saved_pct=report["saved_pct"])
+    return report
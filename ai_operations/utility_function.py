@@ -1,371 +1,479 @@
 from langchain_core.prompts import PromptTemplate
-from pydantic import BaseModel, Field, RootModel, conint
+from pydantic import BaseModel, Field, RootModel, conint, create_model, ValidationError
 from langchain_core.output_parsers import PydanticOutputParser, JsonOutputParser
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI, AzureChatOpenAI
-from langchain.agents import create_agent
-from langchain.agents.middleware import TodoListMiddleware, ModelFallbackMiddleware
 from enum import Enum
 from typing import Dict, List, Union, Literal, Optional
 from datetime import datetime
-from ai_operations.utils import load_prompt
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from ai_operations.utils import load_prompt_section, prompt_version, prompt_registry, format_instructions, schema_version
+from ai_operations.llm_cache import llm_cache, cache_key
+from ai_operations.execution import ainvoke_limited
+from ai_operations.model_router import task_llm, task_model, task_models, task_fallbacks, ModelAlternatives
+from ai_operations.text_preprocessing import preprocess_input
+from ai_operations.vector_index import as_matrix, cosine_scores, top_k
+from functools import lru_cache
 import numpy as np
-import pandas as pd
 from typing import Annotated
 import operator
 from typing import TypedDict
+import os
+import structlog
 load_dotenv(override=True)
 
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", temperature=0.)
-llm_fallback = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.)
-embeddings = GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-001")
-constant_middlewares = [ModelFallbackMiddleware(llm_fallback)]
+structlogger = structlog.get_logger(__name__)
+
+# Each task's model, fallbacks, timeout and output cap come from its tier in model_router.py
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "models/gemini-embedding-001")
+# Candidate pools smaller than this are scored exactly even when an ANN index is available
+ANN_MIN_CANDIDATES = int(os.getenv("ANN_MIN_CANDIDATES", 20000))
+
+# Provider SDKs take seconds to import, so clients (and agents) are created on first use
+@lru_cache(maxsize=None)
+def get_embeddings():
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    return GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)
+
+#from langchain_openai import ChatOpenAI, AzureChatOpenAI
 #llm = ChatOpenAI(model="gpt-4.1", temperature=0.)
 #llm = AzureChatOpenAI(model="gpt-4o-mini", api_version="2025-04-01-preview")
 
-def create_resume_score():
+def structured_agent(response_format, task: str):
 
-    class ResumeScore(BaseModel):
-    
-        score: int = Field("Overall score of the resume, an Applicant Tracking System would give to the resume.")
-        items: list[str] = Field("Pointwise, very crisp and concise suggestions for improvement in the resume.", min_items=1, max_items=7)
+    from langchain.agents import create_agent
 
-    # output_format = PydanticOutputParser(pydantic_object = ResumeScore).get_format_instructions()
-    agent = create_agent(model = llm, 
-                        middleware = constant_middlewares, 
-                        response_format = ResumeScore)
-    
-    instruction_prompt = load_prompt(prompt_name = "create_resume_score", filename = "prompts.yml")
+    # One agent per model of the task's tier; the caller picks the fallback (see ModelAlternatives)
+    return ModelAlternatives({name: create_agent(model = model, response_format = response_format)
+                              for name, model in task_models(task).items()})
 
-    scoring_prompt = PromptTemplate.from_template(template=instruction_prompt)
-    
-    return agent, scoring_prompt
+def current_date():
+    return str(datetime.now().date())
 
+class ResumeScore(BaseModel):
 
-def get_contact_information():
+    score: int = Field("Overall score of the resume, an Applicant Tracking System would give to the resume.")
+    items: list[str] = Field("Pointwise, very crisp and concise suggestions for improvement in the resume.", min_items=1, max_items=7)
 
-    class contact_extractor(BaseModel):
 
-        color: str = Field("`'green'` if both mobile number and email id are present, otherwise `'red'`")
-        comment: str = Field("What is missing in the resume, mobile number or email? If both are present, return a positive message")
-        email_id: str = Field("Extracted email id, If Email id is not present, then return blank space")
-        mobile_number: str = Field("Extracted mobile number, If mobile number is not present, then return blank space")
+class contact_extractor(BaseModel):
 
-    output_parser = PydanticOutputParser(pydantic_object = contact_extractor).get_format_instructions()
-    
-    instruction_format = load_prompt(prompt_name = "get_contact_information", filename = "prompts.yml")
+    color: str = Field("`'green'` if both mobile number and email id are present, otherwise `'red'`")
+    comment: str = Field("What is missing in the resume, mobile number or email? If both are present, return a positive message")
+    email_id: str = Field("Extracted email id, If Email id is not present, then return blank space")
+    mobile_number: str = Field("Extracted mobile number, If mobile number is not present, then return blank space")
 
-    prompt_template = PromptTemplate.from_template(template = instruction_format, 
-                                                   partial_variables={"output_information": output_parser})
 
-    chain = prompt_template | llm | JsonOutputParser()
+class ResumeSummaryScore(BaseModel):
+    summary: List[str] = Field(..., description="List of bullet points extracted from the summary section")
+    score: conint(ge=0, le=100) = Field(..., description="Integer score between 0 and 100")
+    label: Literal["critical", "warning", "good"] = Field(..., description="Label based on score range")
+    color: Literal["red", "orange", "green"] = Field(..., description="Color indicating severity level")
+    comment: str = Field(..., description="Short justification for the score")
 
-    return chain
 
+class custom_scores(BaseModel):
+    searchibility_score: int = Field("How well the resume is optimized for ATS systems and keyword-rich")
+    hard_skills_score: int = Field("Relevance and presence of technical/domain-specific skills")
+    soft_skill_score: int = Field("Presence of communication, leadership, teamwork, adaptability, etc.")
+    formatting_score: int = Field("Visual clarity, structure, readability, and professional layout")
 
-def get_summary_overview():
 
-    class ResumeSummaryScore(BaseModel):
-        summary: List[str] = Field(..., description="List of bullet points extracted from the summary section")
-        score: conint(ge=0, le=100) = Field(..., description="Integer score between 0 and 100")
-        label: Literal["critical", "warning", "good"] = Field(..., description="Label based on score range")
-        color: Literal["red", "orange", "green"] = Field(..., description="Color indicating severity level")
-        comment: str = Field(..., description="Short justification for the score")
+class AspectFeedback(BaseModel):
+    score: conint(ge=0, le=100) = Field(..., description="Score between 0 and 100")
+    comment: str = Field(..., description="1–2 line feedback")
 
-    #output_parser = PydanticOutputParser(pydantic_object = ResumeSummaryScore).get_format_instructions()
-    agent = create_agent(model = llm, 
-                        middleware = constant_middlewares, 
-                        response_format = ResumeSummaryScore)
 
-    instruction_format = load_prompt(prompt_name = "get_summary_overview", filename = "prompts.yml")
+class ResumeReview(BaseModel):
+    headings_feedback: AspectFeedback
+    title_match: AspectFeedback
+    formatting_feedback: AspectFeedback
 
-    prompt_template = PromptTemplate.from_template(template = instruction_format)
 
-    return agent, prompt_template 
+class IndustryEnum(str, Enum):
+    IT = "IT"
+    Telecom = "Telecom"
+    Banking = "Banking"
+    Insurance = "Insurance"
+    Healthcare = "Healthcare"
+    Retail = "Retail"
+    Manufacturing = "Manufacturing"
+    Logistics = "Logistics"
+    Education = "Education"
+    Consulting = "Consulting"
+    Ecommerce = "E-commerce"
+    Government = "Government"
+    RealEstate = "Real Estate"
+    Energy = "Energy"
+    Hospitality = "Hospitality"
+    Aerospace = "Aerospace"
+    Automotive = "Automotive"
+    Media = "Media"
+    Agriculture = "Agriculture"
+    Construction = "Construction"
+    Other = "Other"
 
 
-def get_custom_scores():
+class FunctionalExposure(BaseModel):
+    has_industry_experience: bool = Field(description="True if the candidate has any relevant work experience (including internships); else False")
+    has_completed_college: bool = Field(description="True if the candidate has finished their college education; else False")
+    constituent: Dict[str, str] = Field(default_factory=dict, description="Industry-to-percentage mapping based on functional exposure (e.g., {'Telecom': '40%'}). Must sum to 100%.")
+    industries: List[str] = Field(default_factory=list, description="List of industries the candidate has worked in or been exposed to")
+
+
+class TechnicalExposureGrouped(BaseModel):
+    high: List[str]
+    medium: List[str]
+    low: List[str]
+
+
+class EducationEntry(BaseModel):
+    degree: str
+    institution: str
+    start_year: int
+    end_year: Union[int, str]  # Can be an integer (year) or "ongoing"
+
+
+class EducationHistory(RootModel[List[EducationEntry]]):
+    pass
+
+
+class Project(BaseModel):
+    title: str
+    description: str = Field(default="")
+    technologies: List[str] = Field(default_factory=list)
+    score: conint(ge=0, le=100)
+    color: Literal["light red", "light orange", "light green"]
+    comment: str
+    stage: Literal["POC", "Production", "Intern"]
+
+
+class ProjectEvaluationResult(BaseModel):
+    projects: List[Project] = Field(default_factory=list)
+
+
+class EmploymentEntry(BaseModel):
+    company: str = Field(..., description="Name of the company or organization")
+    position: str = Field(..., description="Role or job title held by the candidate")
+    start_year: int = Field(..., ge=1900, le=2100, description="4-digit year of job start")
+    end_year: Union[int, str] = Field(
+        ..., description="4-digit year of job end or 'Currently Working'"
+    )
+    employment_type: Literal[
+        "Permanent", "Intern", "Part Time", "Contractual", "Non Permanent"
+    ] = Field(..., description="Type of employment")
+
+
+class EmploymentHistory(BaseModel):
+    employment_history: List[EmploymentEntry]
+
+
+class ResumeName(BaseModel):
+    name: str = Field("Name of the person mentioned in resume")
+
 
-    class custom_scores(BaseModel):
-        searchibility_score: int = Field("How well the resume is optimized for ATS systems and keyword-rich")
-        hard_skills_score: int = Field("Relevance and presence of technical/domain-specific skills")
-        soft_skill_score: int = Field("Presence of communication, leadership, teamwork, adaptability, etc.")
-        formatting_score: int = Field("Visual clarity, structure, readability, and professional layout")
+class ExperienceSummary(BaseModel):
+    yoe: float = Field(..., description="Total years of corporate experience, rounded to 1 decimal place")
+    ryoe: float = Field(..., description="Relevant years of experience with respect to the job role, rounded to 1 decimal place")
 
-    output_parser = PydanticOutputParser(pydantic_object=custom_scores).get_format_instructions()
+
+class RecruiterOverview(BaseModel):
+    bullets: List[str] = Field(description="List of recruiter-friendly bullet points summarizing the candidate's skills, experience, and traits.")
+    relevant_experience: str = Field(description="A line summarizing the candidate’s relevant years of experience.")
+    technical_proficiency: List[str] = Field(description="Detailed technical proficiencies, grouped by technology or domain area.")
+
+
+class CandidateLocation(BaseModel):
+    location: str = Field(..., description="Predicted location of the candidate (city/state/country)")
+    confidence_score: float = Field(..., ge=0, le=100, description="Confidence score of the predicted location between 0 and 100")
+
+
+class DesignationResponse(BaseModel):
+    current_designation: Optional[str] = Field(None, description="The candidate's most recent or current job title. Null if not found.")
+    previous_designation: Optional[str] = Field(None, description="The candidate's immediate past job title before the current one. Null if not found.")
+
+
+def create_resume_score():
+
+    # output_format = PydanticOutputParser(pydantic_object = ResumeScore).get_format_instructions()
+    agent = structured_agent(response_format = ResumeScore, task = "create_resume_score")
     
-    instructions_format = load_prompt(prompt_name = "get_custom_scores", filename = "prompts.yml")
+    scoring_prompt = prompt_registry.prompt(prompt_name = "create_resume_score", filename = "prompts.yml")
+    
+    return agent, scoring_prompt
 
-    prompt_instruction = PromptTemplate.from_template(template=instructions_format, 
-                                                      partial_variables={"output_format": output_parser})
 
-    chain = prompt_instruction | llm | JsonOutputParser()
+def get_contact_information():
+
+    prompt_template = prompt_registry.prompt(prompt_name = "get_contact_information", filename = "prompts.yml",
+                                             output_schema = contact_extractor, format_variable = "output_information")
+
+    chain = prompt_template | task_llm("get_contact_information") | JsonOutputParser()
 
     return chain
 
 
-def get_other_comments():
+def get_summary_overview():
+
+    #output_parser = PydanticOutputParser(pydantic_object = ResumeSummaryScore).get_format_instructions()
+    agent = structured_agent(response_format = ResumeSummaryScore, task = "get_summary_overview")
 
-    class AspectFeedback(BaseModel):
-        score: conint(ge=0, le=100) = Field(..., description="Score between 0 and 100")
-        comment: str = Field(..., description="1–2 line feedback")
+    prompt_template = prompt_registry.prompt(prompt_name = "get_summary_overview", filename = "prompts.yml")
 
-    class ResumeReview(BaseModel):
-        headings_feedback: AspectFeedback
-        title_match: AspectFeedback
-        formatting_feedback: AspectFeedback
-    
-    output_parser = PydanticOutputParser(pydantic_object=ResumeReview).get_format_instructions()
-        
-    instruction_format = load_prompt(prompt_name = "get_other_comments", filename = "prompts.yml")
+    return agent, prompt_template 
+
+
+def get_custom_scores():
 
-    prompt_template = PromptTemplate.from_template(template=instruction_format,
-                                                   partial_variables={"output_format": output_parser})
+    prompt_instruction = prompt_registry.prompt(prompt_name = "get_custom_scores", filename = "prompts.yml",
+                                                output_schema = custom_scores)
 
-    chain = prompt_template | llm | JsonOutputParser()
+    chain = prompt_instruction | task_llm("get_custom_scores") | JsonOutputParser()
 
     return chain
 
 
-def functional_constituent():
+def get_other_comments():
+
+    prompt_template = prompt_registry.prompt(prompt_name = "get_other_comments", filename = "prompts.yml",
+                                             output_schema = ResumeReview)
+
+    chain = prompt_template | task_llm("get_other_comments") | JsonOutputParser()
+
+    return chain
 
-    class IndustryEnum(str, Enum):
-        IT = "IT"
-        Telecom = "Telecom"
-        Banking = "Banking"
-        Insurance = "Insurance"
-        Healthcare = "Healthcare"
-        Retail = "Retail"
-        Manufacturing = "Manufacturing"
-        Logistics = "Logistics"
-        Education = "Education"
-        Consulting = "Consulting"
-        Ecommerce = "E-commerce"
-        Government = "Government"
-        RealEstate = "Real Estate"
-        Energy = "Energy"
-        Hospitality = "Hospitality"
-        Aerospace = "Aerospace"
-        Automotive = "Automotive"
-        Media = "Media"
-        Agriculture = "Agriculture"
-        Construction = "Construction"
-        Other = "Other"
-        
-    class FunctionalExposure(BaseModel):
-        has_industry_experience: bool = Field(description="True if the candidate has any relevant work experience (including internships); else False")
-        has_completed_college: bool = Field(description="True if the candidate has finished their college education; else False")
-        constituent: Dict[str, str] = Field(default_factory=dict, description="Industry-to-percentage mapping based on functional exposure (e.g., {'Telecom': '40%'}). Must sum to 100%.")
-        industries: List[str] = Field(default_factory=list, description="List of industries the candidate has worked in or been exposed to")
-    
-    output_parser = PydanticOutputParser(pydantic_object=FunctionalExposure).get_format_instructions()
-    
-    instruction_format = load_prompt(prompt_name = "functional_constituent", filename = "prompts.yml")
 
-    prompt_template = PromptTemplate.from_template(template=instruction_format,
-                                                   partial_variables = {"output_format": output_parser})
+def functional_constituent():
+
+    prompt_template = prompt_registry.prompt(prompt_name = "functional_constituent", filename = "prompts.yml",
+                                             output_schema = FunctionalExposure)
 
-    chain = prompt_template | llm | JsonOutputParser()
+    chain = prompt_template | task_llm("functional_constituent") | JsonOutputParser()
 
     return chain
 
 
 def technical_constituent():
 
-    class TechnicalExposureGrouped(BaseModel):
-        high: List[str]
-        medium: List[str]
-        low: List[str]
-        
-    output_parser = PydanticOutputParser(pydantic_object=TechnicalExposureGrouped).get_format_instructions()
-    
-    instruction_format = load_prompt(prompt_name = "technical_constituent", filename = "prompts.yml")
+    prompt_template = prompt_registry.prompt(prompt_name = "technical_constituent", filename = "prompts.yml",
+                                             output_schema = TechnicalExposureGrouped)
 
-    prompt_template = PromptTemplate.from_template(template=instruction_format, 
-                                                   partial_variables={"output_format": output_parser})
-
-    chain = prompt_template | llm | JsonOutputParser()
+    chain = prompt_template | task_llm("technical_constituent") | JsonOutputParser()
     
     return chain
 
     
 def education_extractor():
 
-    class EducationEntry(BaseModel):
-        degree: str
-        institution: str
-        start_year: int
-        end_year: Union[int, str]  # Can be an integer (year) or "ongoing"
-    
-    class EducationHistory(RootModel[List[EducationEntry]]):
-        pass
-        
-    
-    output_parser = PydanticOutputParser(pydantic_object=EducationHistory).get_format_instructions()
-    
-    instruction_format = load_prompt(prompt_name = "education_extractor", filename = "prompts.yml")
+    prompt_template = prompt_registry.prompt(prompt_name = "education_extractor", filename = "prompts.yml",
+                                             output_schema = EducationHistory)
 
-    prompt_template = PromptTemplate.from_template(template=instruction_format, 
-                                                   partial_variables={"output_format": output_parser})
-
-    chain = prompt_template | llm | JsonOutputParser()
+    chain = prompt_template | task_llm("education_extractor") | JsonOutputParser()
     
     return chain
 
 
 def project_extractor():
 
-    class Project(BaseModel):
-        title: str
-        description: str = Field(default="")
-        technologies: List[str] = Field(default_factory=list)
-        score: conint(ge=0, le=100)
-        color: Literal["light red", "light orange", "light green"]
-        comment: str
-        stage: Literal["POC", "Production", "Intern"]
+    prompt = prompt_registry.prompt(prompt_name = "project_extractor", filename = "prompts.yml",
+                                    output_schema = ProjectEvaluationResult)
 
+    chain = prompt | task_llm("project_extractor") | JsonOutputParser()
 
-    class ProjectEvaluationResult(BaseModel):
-        projects: List[Project] = Field(default_factory=list)
+    return chain
 
-    output_parser = PydanticOutputParser(pydantic_object=ProjectEvaluationResult).get_format_instructions()
 
-    instruction_format = load_prompt(prompt_name = "project_extractor", filename = "prompts.yml")
+def company_extractor():
+
+    agent = structured_agent(response_format = EmploymentHistory, task = "company_extractor")
+    
+    prompt = prompt_registry.prompt(prompt_name = "company_extractor", filename = "prompts.yml")
+
+    return agent, prompt
+
+
+def extract_names():
 
-    prompt = PromptTemplate.from_template(template=instruction_format, 
-                                     partial_variables={"output_format": output_parser})
+    prompt = prompt_registry.prompt(prompt_name = "extract_names", filename = "prompts.yml",
+                                    output_schema = ResumeName)
 
-    chain = prompt | llm | JsonOutputParser()
+    chain = prompt | task_llm("extract_names") | JsonOutputParser()
 
     return chain
 
 
-def company_extractor():
+def extract_yoe():
+
+    agent = structured_agent(response_format = ExperienceSummary, task = "extract_yoe")
+                        
+    prompt = prompt_registry.prompt(prompt_name = "extract_yoe", filename = "prompts.yml",
+                                    partial_variables = {"current_date": current_date})
 
-    class EmploymentEntry(BaseModel):
-        company: str = Field(..., description="Name of the company or organization")
-        position: str = Field(..., description="Role or job title held by the candidate")
-        start_year: int = Field(..., ge=1900, le=2100, description="4-digit year of job start")
-        end_year: Union[int, str] = Field(
-            ..., description="4-digit year of job end or 'Currently Working'"
-        )
-        employment_type: Literal[
-            "Permanent", "Intern", "Part Time", "Contractual", "Non Permanent"
-        ] = Field(..., description="Type of employment")
-
-    class EmploymentHistory(BaseModel):
-        employment_history: List[EmploymentEntry]
-
-    agent = create_agent(model = llm, 
-                        middleware = constant_middlewares, 
-                        response_format = EmploymentHistory)
+    return agent, prompt 
     
-    instruction_format = load_prompt(prompt_name = "company_extractor", filename = "prompts.yml")
 
-    prompt = PromptTemplate.from_template(template=instruction_format)
+def extract_recruiters_overview():
 
-    return agent, prompt
+    agent = structured_agent(response_format = RecruiterOverview, task = "extract_recruiters_overview")
+                        
+    prompt = prompt_registry.prompt(prompt_name = "extract_recruiters_overview", filename = "prompts.yml",
+                                    partial_variables = {"current_date": current_date})
 
+    return agent, prompt
 
-def extract_names():
 
-    class ResumeName(BaseModel):
-        name: str = Field("Name of the person mentioned in resume")
+def extract_location():
 
-    output_parser = PydanticOutputParser(pydantic_object=ResumeName)
+    prompt = prompt_registry.prompt(prompt_name = "extract_location", filename = "prompts.yml",
+                                    output_schema = CandidateLocation)
     
-    instruction_format = load_prompt(prompt_name = "extract_names", filename = "prompts.yml")
+    chain = prompt | task_llm("extract_location") | JsonOutputParser()
+
+    return chain
+
+
+def designation_extractor():
 
-    prompt = PromptTemplate.from_template(template=instruction_format, 
-                            partial_variables={"output_format": output_parser})
+    prompt = prompt_registry.prompt(prompt_name = "designation_extractor", filename = "prompts.yml",
+                                    output_schema = DesignationResponse)
 
-    chain = prompt | llm | JsonOutputParser()
+    chain = prompt | task_llm("designation_extractor") | JsonOutputParser()
 
     return chain
 
 
-def extract_yoe():
+def field_reasker():
 
-    class ExperienceSummary(BaseModel):
-        yoe: float = Field(..., description="Total years of corporate experience, rounded to 1 decimal place")
-        ryoe: float = Field(..., description="Relevant years of experience with respect to the job role, rounded to 1 decimal place")
+    prompt = prompt_registry.prompt(prompt_name = "repair_fields", filename = "prompts.yml")
 
-    agent = create_agent(model = llm, 
-                        middleware = constant_middlewares, 
-                        response_format = ExperienceSummary)
-                        
-    instruction_format = load_prompt(prompt_name = "extract_yoe", filename = "prompts.yml")
+    chain = prompt | task_llm("repair_fields") | JsonOutputParser()
 
-    prompt = PromptTemplate.from_template(template=instruction_format, 
-                                          partial_variables={
-                                              "current_date": str(datetime.now().date())
-                                          })
+    return chain
 
-    return agent, prompt 
-    
+# Section name (as used by the API routes and the assembled payload) -> output schema
+SECTION_SCHEMAS = {
+    "getContacts": contact_extractor,
+    "getNames": ResumeName,
+    "getCustomScores": custom_scores,
+    "getSummaryOverview": ResumeSummaryScore,
+    "getFunctionalConstituent": FunctionalExposure,
+    "getOtherComments": ResumeReview,
+    "getEducation": EducationHistory,
+    "scoreResume": ResumeScore,
+    "getTechnicalConstituent": TechnicalExposureGrouped,
+    "getCompany": EmploymentHistory,
+    "getProjects": ProjectEvaluationResult,
+    "getYoe": ExperienceSummary,
+    "getLocation": CandidateLocation,
+    "getRecruitersOverview": RecruiterOverview,
+    "getDesignation": DesignationResponse,
+}
 
-def extract_recruiters_overview():
 
-    class RecruiterOverview(BaseModel):
-        bullets: List[str] = Field(description="List of recruiter-friendly bullet points summarizing the candidate's skills, experience, and traits.")
-        relevant_experience: str = Field(description="A line summarizing the candidate’s relevant years of experience.")
-        technical_proficiency: List[str] = Field(description="Detailed technical proficiencies, grouped by technology or domain area.")
+def validate_section(section, payload):
+    """
+    Validate a single extracted section against its schema.
 
-    agent = create_agent(model = llm, 
-                        middleware = constant_middlewares, 
-                        response_format = RecruiterOverview)
-                        
-    instruction_format = load_prompt(prompt_name = "extract_recruiters_overview", filename = "prompts.yml")
+    Every declared field must be present in the raw payload (several schemas carry
+    description strings as defaults, so pydantic alone would accept an empty dict).
 
-    prompt = PromptTemplate.from_template(template = instruction_format,
-                                          partial_variables = {
-                                              "current_date": str(datetime.now().date())
-                                          })
+    Returns:
+        The validated payload as JSON-compatible data, or None if it is invalid.
+    """
+    schema = SECTION_SCHEMAS[section]
 
-    return agent, prompt
+    if payload is None:
+        return None
 
+    if not issubclass(schema, RootModel):
+        if not isinstance(payload, dict) or not all(key in payload for key in schema.model_fields):
+            return None
 
-def extract_location():
+    try:
+        return schema.model_validate(payload).model_dump(mode="json")
+    except ValidationError:
+        return None
 
-    class CandidateLocation(BaseModel):
-        location: str = Field(..., description="Predicted location of the candidate (city/state/country)")
-        confidence_score: float = Field(..., ge=0, le=100, description="Confidence score of the predicted location between 0 and 100")
 
-    location_format = PydanticOutputParser(pydantic_object = CandidateLocation).get_format_instructions()
+def consolidated_extractor(sections: tuple):
+    return _consolidated_extractor(sections, prompt_registry.generation)
 
-    instruction_format = load_prompt(prompt_name = "extract_location", filename = "prompts.yml")
 
-    prompt = PromptTemplate.from_template(template = instruction_format,
-                                          partial_variables={
-                                              "output_format": location_format
+@lru_cache(maxsize=None)
+def _consolidated_extractor(sections: tuple, generation: int):
+    # Section guidance is read from the prompt file, so the chain is rebuilt per registry generation
+
+    ConsolidatedExtraction = create_model(
+        "ConsolidatedExtraction",
+        **{section: (Optional[SECTION_SCHEMAS[section]], None) for section in sections}
+    )
+
+    guidance = load_prompt_section(prompt_name = "consolidated_extractor", section = "section_guidance", filename = "prompts.yml")
+    section_guidance = "\n".join(f"- {section}: {guidance[section].strip()}" for section in sections)
+
+    prompt = PromptTemplate.from_template(template = prompt_registry.template("consolidated_extractor", filename = "prompts.yml"),
+                                          partial_variables = {
+                                              "output_format": format_instructions(ConsolidatedExtraction),
+                                              "section_guidance": section_guidance,
+                                              "current_date": current_date
                                           })
-    
-    chain = prompt | llm | JsonOutputParser()
+
+    chain = prompt | task_llm("consolidated_extractor") | JsonOutputParser()
 
     return chain
 
 
-def designation_extractor():
+async def extract_consolidated(data: dict, sections = None, max_reasks: int = 1):
+    """
+    Extract several analysis sections with one structured-output call.
 
-    class DesignationResponse(BaseModel):
-        current_designation: Optional[str] = Field(None, description="The candidate's most recent or current job title. Null if not found.")
-        previous_designation: Optional[str] = Field(None, description="The candidate's immediate past job title before the current one. Null if not found.")
+    Sections already in the result cache are not requested again. Sections that are
+    missing or fail validation are re-asked together in a smaller follow-up call, up
+    to `max_reasks` times.
 
-    
-    designation_output = PydanticOutputParser(pydantic_object=DesignationResponse).get_format_instructions()
-    
-    instruction_format = load_prompt(prompt_name = "designation_extractor", filename = "prompts.yml")
+    Returns:
+        Dict of section -> validated payload, with None for sections that never validated.
+    """
+    pending = tuple(sections or SECTION_SCHEMAS.keys())
+    data = preprocess_input("consolidated_extractor", data)
 
-    prompt = PromptTemplate.from_template(template=instruction_format, 
-                                          partial_variables={
-                                              "output_format": designation_output
-                                          })
+    inputs = {
+        "resume_text": data.get("resumeText", ""),
+        "job_role": data.get("jobRole", ""),
+        "job_description": data.get("jobDescription", ""),
+        "email_id": data.get("email_id", ""),
+    }
 
-    chain = prompt | llm | JsonOutputParser()
+    version = prompt_version("consolidated_extractor", filename = "prompts.yml")
+    model_name = task_model("consolidated_extractor")
+    keys = {section: cache_key("consolidated_extractor", version, model_name, {"section": section, **inputs},
+                               schema_version = schema_version(SECTION_SCHEMAS[section]))
+            for section in pending}
 
-    return chain
+    results = {section: await llm_cache.aget(keys[section]) for section in pending}
+    pending = tuple(section for section in pending if results[section] is None)
+
+    for attempt in range(max_reasks + 1):
+        if not pending:
+            break
+
+        try:
+            response = await ainvoke_limited(consolidated_extractor(pending), inputs, model_name,
+                                             fallbacks = task_fallbacks("consolidated_extractor"))
+        except Exception as e:
+            structlogger.debug("Consolidated extraction - Exception occurred", details=e, attempt=attempt)
+            response = {}
+
+        if not isinstance(response, dict):
+            response = {}
+
+        for section in pending:
+            results[section] = validate_section(section, response.get(section))
+            if results[section] is not None:
+                await llm_cache.aset(keys[section], results[section])
+
+        pending = tuple(section for section in pending if results[section] is None)
+        structlogger.debug("Consolidated extraction - Attempt completed", attempt=attempt, failed_sections=pending)
+
+    return results
 
 
 def create_similarity_score(job_description_emb, recruiter_overview_emb):
@@ -378,38 +486,93 @@ def create_similarity_score(job_description_emb, recruiter_overview_emb):
     return similarity_score
 
 
-def refined_search_results(data, jobDescription, num_results=10):
-    
-    name_list, overview_list, resume_score_list = [], [], []
-    for candidate in data:
-        name_list.append(candidate['name'])
-        overview = candidate['get_recruiters_overview'].get("bullets", None)#['bullets']
-        #overview_str = " ".join(overview)
-        if overview is not None:
-            overview_list.append(overview[0])
-        else:
-            overview_list.append(" ")
-        
-        resume_score_list.append(candidate['score_resume']['score'])
-
-    overview_emb = embeddings.embed_documents(overview_list)
-    jobDescription_emb = embeddings.embed_query(jobDescription)
-
-    final_list = []
-    for idx, name in enumerate(name_list):
-        final_list.append([name, overview_list[idx], round(create_similarity_score(jobDescription_emb, overview_emb[idx]), 3), ])
-        
-    final_list.sort(key = lambda x: x[2], reverse=True)
-    final_list = final_list[:num_results]
-    name_list_desc = [name for name, _, _ in final_list]
-
-    # Get all the required data for candidates
-    df = pd.DataFrame.from_records(data)
-    df = df[df['name'].isin(name_list_desc)]
-    
-    # Sort by resume score in descending order
-    df['resume_score'] = df['score_resume'].apply(lambda x: x.get('score', 0) if isinstance(x, dict) else 0)
-    df = df.sort_values(by='resume_score', ascending=False).drop(columns=['resume_score'])
-    
-    return df.to_dict("records")
+def overview_text(recruiters_overview):
+    """
+    Text of the recruiter overview that candidate search compares against the job description.
+    """
+    bullets = (recruiters_overview or {}).get("bullets", None) if isinstance(recruiters_overview, dict) else None
+    return bullets[0] if bullets else " "
+
+
+def embed_overviews(recruiters_overviews: list):
+    """
+    Embed recruiter overviews in one batch call.
+
+    Returns:
+        List of embedding vectors, in the same order as the input
+    """
+    if not recruiters_overviews:
+        return []
+    return get_embeddings().embed_documents([overview_text(overview) for overview in recruiters_overviews])
+
+
+def stored_embedding(candidate: dict, dimension: int = None):
+    """
+    Embedding persisted with the candidate row, or None if it is missing or was
+    produced by a different embedding model/dimension.
+    """
+    vector = candidate.get("overview_embedding", None)
+    if vector is None or candidate.get("embedding_model", None) != EMBEDDING_MODEL:
+        return None
+    if dimension is not None and len(vector) != dimension:
+        return None
+    return vector
+
+
+def _exact_matches(data, rows, jobDescription_emb, num_results):
+
+    # Embeddings are stored at ingest; only rows not yet backfilled are embedded here
+    overview_emb = [stored_embedding(data[idx], len(jobDescription_emb)) for idx in rows]
+    missing = [pos for pos, vector in enumerate(overview_emb) if vector is None]
+    if missing:
+        structlogger.debug("Embedding candidates without a stored embedding", count=len(missing))
+        for pos, vector in zip(missing, embed_overviews([data[rows[pos]]['get_recruiters_overview'] for pos in missing])):
+            overview_emb[pos] = vector
+
+    matrix, norms = as_matrix(overview_emb)
+    scores = cosine_scores(jobDescription_emb, matrix, norms)
+    return [(rows[pos], float(scores[pos])) for pos in top_k(scores, num_results)]
+
+
+def refined_search_results(data, jobDescription, num_results=10, search=None, load_embeddings=None):
+    """
+    Top `num_results` candidates of `data` by similarity of their recruiter overview
+    to the job description, in descending order of resume score.
+
+    Args:
+        data: Candidate rows that passed the SQL filters
+        jobDescription: Job description text
+        num_results: Number of candidates to return
+        search: Optional ANN search `search(query, k, keys) -> (keys, scores, indexed keys)`
+            over email ids; used once `data` has at least ANN_MIN_CANDIDATES rows, rows
+            it does not hold are scored exactly
+        load_embeddings: Optional callable filling in the stored embeddings of rows
+            fetched without them; only called for the rows scored exactly
+    """
+    if not data:
+        return []
+
+    jobDescription_emb = get_embeddings().embed_query(jobDescription)
+
+    matches, covered = [], set()
+    if search is not None and len(data) >= ANN_MIN_CANDIDATES:
+        positions = {candidate.get('email_id'): idx for idx, candidate in enumerate(data) if candidate.get('email_id') is not None}
+        keys, scores, indexed = search(jobDescription_emb, num_results, set(positions))
+        matches = [(positions[key], float(score)) for key, score in zip(keys, scores)]
+        covered = {positions[key] for key in indexed}
+
+    rest = [idx for idx in range(len(data)) if idx not in covered]
+    if rest:
+        if load_embeddings is not None:
+            load_embeddings([data[idx] for idx in rest])
+        matches += _exact_matches(data, rest, jobDescription_emb, num_results)
+
+    matches.sort(key = lambda match: match[1], reverse=True)
+
+    # Top matches by similarity, presented in descending order of resume score
+    results = [{key: value for key, value in data[idx].items() if key not in ('overview_embedding', 'embedding_model', 'embedding_dim')}
+               for idx, _ in matches[:num_results]]
+    results.sort(key = lambda x: x['score_resume'].get('score', 0) if isinstance(x.get('score_resume'), dict) else 0, reverse=True)
+
+    return results
 
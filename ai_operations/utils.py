@@ -1,23 +1,190 @@
 import os
+import json
 import yaml
+import hashlib
+import threading
+from functools import lru_cache
+from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.runnables import Runnable
+import structlog
 
-def load_prompt(prompt_name: str, filename: str = None) -> str:
+structlogger = structlog.get_logger(__name__)
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
+DEFAULT_PROMPT_FILE = "prompts.yml"
+
+
+@lru_cache(maxsize=None)
+def format_instructions(output_schema) -> str:
+    return PydanticOutputParser(pydantic_object = output_schema).get_format_instructions()
+
+
+@lru_cache(maxsize=None)
+def schema_version(output_schema) -> str:
+    """
+    Content hash of an output schema's format instructions, for cache keys.
+    """
+    if output_schema is None:
+        return ""
+    return hashlib.sha256(format_instructions(output_schema).encode("utf-8")).hexdigest()[:16]
+
+
+class RegisteredPrompt(Runnable):
+    """
+    Prompt template owned by a `PromptRegistry`. Behaves like the compiled `PromptTemplate`
+    (`invoke`, `ainvoke`, `format`, `prompt | llm`) and follows registry reloads, so
+    chains built from it never need rebuilding.
+    """
+
+    def __init__(self, prompt_name: str, filename: str, output_schema = None,
+                 format_variable: str = "output_format", partial_variables: dict = None):
+        self.prompt_name = prompt_name
+        self.filename = filename
+        self.format_schema = output_schema
+        self.format_variable = format_variable
+        self.partial_variables = partial_variables or {}
+        self.compiled = None
+
+    def compile(self, template: str) -> PromptTemplate:
+
+        partial_variables = dict(self.partial_variables)
+        if self.format_schema is not None:
+            partial_variables[self.format_variable] = format_instructions(self.format_schema)
+        return PromptTemplate.from_template(template = template, partial_variables = partial_variables)
+
+    def format(self, **kwargs) -> str:
+        return self.compiled.format(**kwargs)
+
+    def invoke(self, input, config = None, **kwargs):
+        return self.compiled.invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config = None, **kwargs):
+        return await self.compiled.ainvoke(input, config, **kwargs)
+
+
+class PromptRegistry:
+    """
+    Prompt files parsed once, with every registered prompt compiled up front.
+
+    `version` is a content hash of a prompt's entry, for cache keys. `reload` re-reads
+    the files and recompiles every registered prompt; the swap only happens once all
+    of them compile, so a broken edit leaves the running prompts untouched.
+    """
+
+    def __init__(self, directory: str = PROMPTS_DIR):
+        self.directory = directory
+        self.generation = 0
+        self._files = {}
+        self._versions = {}
+        self._prompts = []
+        self._lock = threading.RLock()
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename or DEFAULT_PROMPT_FILE)
+
+    def _parse(self, filename: str):
 
-    base_dir = os.path.join(os.getcwd(), r"ai_operations/prompts")
-    path = os.path.join(base_dir, filename)
+        path = self._path(filename)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Prompt file not found: {path}")
 
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Prompt file not found: {path}")
+        with open(path, "r", encoding="utf-8") as f:
+            prompts = yaml.safe_load(f)
 
-    with open(path, "r", encoding="utf-8") as f:
-        prompts = yaml.safe_load(f)
+        versions = {name: hashlib.sha256(json.dumps(entry, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+                    for name, entry in prompts.items()}
+        return prompts, versions
 
-    if prompt_name not in prompts:
-        raise ValueError(f"Prompt '{prompt_name}' not found in {path}.")
+    def _entries(self, filename: str) -> dict:
 
-    prompt_entry = prompts[prompt_name]
+        filename = filename or DEFAULT_PROMPT_FILE
+        if filename not in self._files:
+            with self._lock:
+                if filename not in self._files:
+                    self._files[filename], self._versions[filename] = self._parse(filename)
+        return self._files[filename]
+
+    def _field(self, entries: dict, prompt_name: str, field: str, filename: str):
+
+        if prompt_name not in entries:
+            raise ValueError(f"Prompt '{prompt_name}' not found in {self._path(filename)}.")
+        if field not in entries[prompt_name]:
+            raise ValueError(f"Prompt '{prompt_name}' is missing a '{field}' field.")
+        return entries[prompt_name][field]
+
+    def template(self, prompt_name: str, filename: str = None) -> str:
+        return self._field(self._entries(filename), prompt_name, "template", filename)
+
+    def section(self, prompt_name: str, section: str, filename: str = None):
+        return self._field(self._entries(filename), prompt_name, section, filename)
+
+    def version(self, prompt_name: str, filename: str = None) -> str:
+
+        if prompt_name not in self._entries(filename):
+            raise ValueError(f"Prompt '{prompt_name}' not found in {self._path(filename)}.")
+        return self._versions[filename or DEFAULT_PROMPT_FILE][prompt_name]
+
+    def prompt(self, prompt_name: str, filename: str = None, output_schema = None,
+               format_variable: str = "output_format", partial_variables: dict = None) -> RegisteredPrompt:
+        """
+        Register and compile a prompt.
+
+        Args:
+            prompt_name: Entry in the prompt file
+            filename: Prompt file in the prompts directory (default prompts.yml)
+            output_schema: Pydantic model whose format instructions are filled into `format_variable`
+            format_variable: Template variable receiving the format instructions
+            partial_variables: Other fixed variables; callables are evaluated on every format
+        """
+        prompt = RegisteredPrompt(prompt_name, filename or DEFAULT_PROMPT_FILE, output_schema, format_variable, partial_variables)
+        prompt.compiled = prompt.compile(self.template(prompt_name, prompt.filename))
+        with self._lock:
+            self._prompts.append(prompt)
+        return prompt
+
+    def reload(self):
+        """
+        Re-read every loaded prompt file and recompile the registered prompts.
+
+        Returns:
+            Names of the prompts whose content changed
+        """
+        with self._lock:
+            parsed = {filename: self._parse(filename) for filename in self._files}
+            compiled = [(prompt, prompt.compile(self._field(parsed[prompt.filename][0], prompt.prompt_name, "template", prompt.filename)))
+                        for prompt in self._prompts]
+
+            changed = sorted(name for filename, (_, versions) in parsed.items()
+                             for name, version in versions.items()
+                             if self._versions[filename].get(name) != version)
+            for filename, (entries, versions) in parsed.items():
+                self._files[filename], self._versions[filename] = entries, versions
+            for prompt, template in compiled:
+                prompt.compiled = template
+            self.generation += 1
+
+        structlogger.info("Prompt registry - Reloaded", changed=changed, generation=self.generation)
+        return changed
+
+    def status(self):
+
+        with self._lock:
+            return {
+                "generation": self.generation,
+                "compiled_prompts": len(self._prompts),
+                "versions": {filename: dict(versions) for filename, versions in self._versions.items()},
+            }
+
+
+prompt_registry = PromptRegistry()
+
+
+def load_prompt(prompt_name: str, filename: str = None) -> str:
+    return prompt_registry.template(prompt_name, filename)
 
-    if "template" not in prompt_entry:
-        raise ValueError(f"Prompt '{prompt_name}' is missing a 'template' field.")
+def load_prompt_section(prompt_name: str, section: str, filename: str = None):
+    return prompt_registry.section(prompt_name, section, filename)
 
-    return prompt_entry["template"]
\ No newline at end of file
+def prompt_version(prompt_name: str, filename: str = None) -> str:
+    return prompt_registry.version(prompt_name, filename)
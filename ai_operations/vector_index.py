@@ -0,0 +1,257 @@
+import os
+import json
+import numpy as np
+
+
+def as_matrix(vectors):
+    """
+    Stack embeddings into a contiguous float32 matrix and precompute the row norms.
+
+    Returns:
+        Tuple of (matrix of shape (n, dim), norms of shape (n,))
+    """
+    matrix = np.ascontiguousarray(np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1))
+    return matrix, np.linalg.norm(matrix, axis=1)
+
+
+def cosine_scores(query, matrix, norms):
+    """
+    Cosine similarity of `query` against every row of `matrix` in one matrix-vector product.
+    Rows (or a query) with zero norm score 0.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    denominator = norms * np.linalg.norm(query)
+    return np.divide(matrix @ query, denominator, out=np.zeros(len(matrix), dtype=np.float32), where=denominator > 0)
+
+
+def top_k(scores, k: int):
+    """
+    Indices of the `k` highest scores, best first, without sorting the whole array.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _normalize(matrix):
+
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def kmeans(vectors, n_clusters: int, n_iter: int = 10, seed: int = 0):
+    """
+    Spherical k-means (cosine) on unit-normalized rows.
+
+    Returns:
+        Centroids of shape (n_clusters, dim), unit-normalized
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        # Empty clusters are re-seeded from random points
+        empty = np.flatnonzero(np.bincount(assignment, minlength=n_clusters) == 0)
+        sums[empty] = vectors[rng.choice(len(vectors), size=len(empty), replace=False)]
+        centroids = _normalize(sums)
+
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file (IVF) approximate nearest-neighbour index for cosine similarity.
+
+    Vectors are clustered with k-means; a query only scores the rows of the `n_probe`
+    clusters closest to it. Rows are keyed (e.g. by email id) so a candidate can be
+    added, replaced or removed incrementally. Below `min_train_size` rows the index
+    is not clustered and every search is exact.
+    """
+
+    def __init__(self, dim: int = None, n_lists: int = None, n_probe: int = 8, min_train_size: int = 4096):
+
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.keys = []
+        self.positions = {}
+        self.vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.centroids = None
+        self.lists = []
+        self._trained_size = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    @property
+    def trained(self):
+        return self.centroids is not None
+
+    def _grow(self, rows: int):
+
+        capacity = len(self.vectors)
+        if len(self.keys) + rows <= capacity:
+            return
+        capacity = max(len(self.keys) + rows, 2 * capacity, 1024)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:len(self.keys)] = self.vectors[:len(self.keys)]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self.keys)] = self.alive[:len(self.keys)]
+        self.vectors, self.alive = vectors, alive
+
+    def add(self, keys: list, vectors):
+        """
+        Insert or replace the vectors stored under `keys`.
+        """
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1))
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self.vectors = np.zeros((0, self.dim), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+        self.remove(keys)
+        self._grow(len(keys))
+        start = len(self.keys)
+        rows = np.arange(start, start + len(keys))
+        self.vectors[rows] = vectors
+        self.alive[rows] = True
+        for key, row in zip(keys, rows):
+            self.keys.append(key)
+            self.positions[key] = int(row)
+
+        if self.trained:
+            for row, cluster in zip(rows, np.argmax(vectors @ self.centroids.T, axis=1)):
+                self.lists[cluster].append(int(row))
+
+        # (Re)cluster once the index is large enough, and again each time it doubles
+        if len(self) >= self.min_train_size and len(self) >= 2 * self._trained_size:
+            self.train()
+
+    def remove(self, keys: list):
+
+        for key in keys:
+            row = self.positions.pop(key, None)
+            if row is not None:
+                self.alive[row] = False
+
+    def train(self, sample_size: int = 50_000, n_iter: int = 10):
+        """
+        Cluster the live rows and rebuild the inverted lists, compacting removed rows.
+        """
+        self._compact()
+        count = len(self.keys)
+        n_lists = self.n_lists or max(1, int(np.sqrt(count)))
+        n_lists = min(n_lists, count)
+
+        rng = np.random.default_rng(0)
+        sample = self.vectors[rng.choice(count, size=min(sample_size, count), replace=False)]
+        self.centroids = kmeans(sample, n_lists, n_iter=n_iter)
+        assignment = np.argmax(self.vectors[:count] @ self.centroids.T, axis=1)
+        self.lists = [list(rows) for rows in np.split(np.argsort(assignment, kind="stable"),
+                                                       np.cumsum(np.bincount(assignment, minlength=n_lists))[:-1])]
+        self._trained_size = count
+
+    def _compact(self):
+
+        live = np.flatnonzero(self.alive[:len(self.keys)])
+        renumber = np.full(len(self.keys), -1, dtype=np.int64)
+        renumber[live] = np.arange(len(live))
+        self.lists = [[int(renumber[row]) for row in rows if renumber[row] >= 0] for rows in self.lists]
+        self.keys = [self.keys[row] for row in live]
+        self.vectors = np.ascontiguousarray(self.vectors[live])
+        self.alive = np.ones(len(live), dtype=bool)
+        self.positions = {key: row for row, key in enumerate(self.keys)}
+
+    def search(self, query, k: int, allowed = None, n_probe: int = None):
+        """
+        Approximate top-k by cosine similarity.
+
+        Args:
+            query: Query vector
+            k: Number of results
+            allowed: Optional set of keys the results are restricted to (e.g. rows
+                matching the SQL filters); if probing finds fewer than k of them, the
+                allowed rows are scored exactly
+            n_probe: Clusters scanned per query (defaults to the index setting)
+
+        Returns:
+            Tuple of (keys, scores), best first
+        """
+        query = _normalize(np.asarray(query, dtype=np.float32))
+
+        if self.trained:
+            probes = top_k(self.centroids @ query, n_probe or self.n_probe)
+            rows = np.fromiter((row for cluster in probes for row in self.lists[cluster]), dtype=np.int64)
+            rows = self._filter(rows, allowed)
+            if allowed is None or len(rows) >= k:
+                return self._rank(rows, query, k)
+
+        rows = np.flatnonzero(self.alive[:len(self.keys)]) if allowed is None else \
+               np.fromiter((self.positions[key] for key in allowed if key in self.positions), dtype=np.int64)
+        return self._rank(rows, query, k)
+
+    def _filter(self, rows, allowed):
+
+        rows = rows[self.alive[rows]]
+        if allowed is not None:
+            rows = rows[np.fromiter((self.keys[row] in allowed for row in rows), dtype=bool, count=len(rows))]
+        return rows
+
+    def _rank(self, rows, query, k: int):
+
+        scores = self.vectors[rows] @ query
+        best = top_k(scores, k)
+        return [self.keys[row] for row in rows[best]], scores[best]
+
+    def save(self, path: str, **metadata):
+        """
+        Write the index to a single .npz file (removed rows are dropped). The file is
+        replaced atomically so concurrent readers never see a partial index.
+        """
+        self._compact()
+        lists = self.lists if self.trained else []
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            np.savez(handle,
+                     keys = np.asarray(self.keys, dtype=str),
+                     vectors = self.vectors[:len(self.keys)],
+                     centroids = self.centroids if self.trained else np.zeros((0, self.dim or 0), dtype=np.float32),
+                     list_sizes = np.asarray([len(rows) for rows in lists], dtype=np.int64),
+                     list_rows = np.asarray([row for rows in lists for row in rows], dtype=np.int64),
+                     config = np.asarray([self.n_lists or 0, self.n_probe, self.min_train_size, self._trained_size]),
+                     metadata = np.asarray(json.dumps(metadata)))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Returns:
+            Tuple of (index, metadata passed to `save`)
+        """
+        with np.load(path) as stored:
+            n_lists, n_probe, min_train_size, trained_size = (int(value) for value in stored["config"])
+            vectors = stored["vectors"]
+            index = cls(dim=vectors.shape[1], n_lists=n_lists or None, n_probe=n_probe, min_train_size=min_train_size)
+            index.keys = [str(key) for key in stored["keys"]]
+            index.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            index.alive = np.ones(len(index.keys), dtype=bool)
+            index.positions = {key: row for row, key in enumerate(index.keys)}
+            if len(stored["centroids"]):
+                index.centroids = stored["centroids"]
+                index.lists = [rows.tolist() for rows in np.split(stored["list_rows"], np.cumsum(stored["list_sizes"])[:-1])]
+                index._trained_size = trained_size
+            metadata = json.loads(str(stored["metadata"]))
+        return index, metadata
@@ -0,0 +1,60 @@
+"""
+Recall and latency of the IVF candidate index against exact search, on synthetic
+clustered embeddings (real resume embeddings cluster by role and industry).
+
+Usage:
+    python benchmarks/ann_recall.py --size 100000 --dim 768 --n-probe 1 4 8 16 32
+"""
+import argparse
+import time
+import numpy as np
+from ai_operations.vector_index import IVFIndex, as_matrix, cosine_scores, top_k
+
+
+def make_embeddings(size: int, dim: int, n_topics: int, rng):
+
+    topics = rng.standard_normal((n_topics, dim), dtype=np.float32)
+    noise = rng.standard_normal((size, dim), dtype=np.float32)
+    return topics[rng.integers(0, n_topics, size)] + 0.6 * noise
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--n-probe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = make_embeddings(args.size, args.dim, args.topics, rng)
+    queries = make_embeddings(args.queries, args.dim, args.topics, rng)
+    keys = [f"candidate-{idx}@example.com" for idx in range(args.size)]
+
+    start = time.perf_counter()
+    index = IVFIndex(min_train_size=0)
+    index.add(keys, vectors)
+    print(f"index build: {time.perf_counter() - start:.1f}s, {len(index.lists)} lists")
+
+    matrix, norms = as_matrix(vectors)
+    start = time.perf_counter()
+    truth = [set(top_k(cosine_scores(query, matrix, norms), args.top_k)) for query in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / args.queries
+    print(f"exact: {exact_ms:.2f} ms/query")
+
+    print(f"{'n_probe':>8} {'recall@' + str(args.top_k):>10} {'ms/query':>10} {'speedup':>8}")
+    for n_probe in args.n_probe:
+        start = time.perf_counter()
+        results = [index.search(query, args.top_k, n_probe=n_probe)[0] for query in queries]
+        ann_ms = (time.perf_counter() - start) * 1000 / args.queries
+
+        recall = np.mean([len(expected & {index.positions[key] for key in found}) / args.top_k
+                          for expected, found in zip(truth, results)])
+        print(f"{n_probe:>8} {recall:>10.3f} {ann_ms:>10.2f} {exact_ms / ann_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Worker startup cost: imports `action_server` (or --module) in fresh interpreters with
+`python -X importtime`, reports the cumulative import time and the heaviest modules,
+and fails when a budget is exceeded or a module that should load lazily shows up.
+
+Track the --json report next to the code so startup regressions show up in review.
+
+Usage:
+    PYTHONPATH=. python benchmarks/import_time.py --runs 5 --top 15
+    PYTHONPATH=. python benchmarks/import_time.py --budget-ms 2500 --json import_time.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Provider SDKs and unused heavy packages that must not load at import time
+LAZY_MODULES = ["langchain_google_genai", "google.genai", "langchain_openai", "langchain.agents", "pandas"]
+
+
+def parse_importtime(stderr: str):
+    """
+    Parse `-X importtime` output into {module: (self_us, cumulative_us, depth)}, in trace order.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def direct_imports(modules: dict, target: str):
+    """
+    Modules imported by `target` itself: a child is reported just before its parent,
+    one level deeper, so walk back from the target until its own depth comes round again.
+    """
+    names = list(modules)
+    depth = modules[target][2]
+    children = []
+    for name in reversed(names[:names.index(target)]):
+        if modules[name][2] <= depth:
+            break
+        if modules[name][2] == depth + 1:
+            children.append(name)
+    return children
+
+
+def measure(module: str):
+
+    env = dict(os.environ)
+    env.setdefault("PYTHONPATH", os.getcwd())
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="action_server")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail when the median import time exceeds this")
+    parser.add_argument("--lazy", nargs="*", default=LAZY_MODULES, help="Modules that must not be imported")
+    parser.add_argument("--json", default=None, help="Write the report to this file")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    totals = [run[args.module][1] / 1000 for run in runs]
+    median_ms = statistics.median(totals)
+
+    # Per-module numbers from the run closest to the median
+    run = min(runs, key=lambda modules: abs(modules[args.module][1] / 1000 - median_ms))
+    heaviest = sorted(((name, run[name]) for name in direct_imports(run, args.module)),
+                      key=lambda item: item[1][1], reverse=True)[:args.top]
+
+    print(f"import {args.module}: median {median_ms:.0f} ms, min {min(totals):.0f} ms, "
+          f"max {max(totals):.0f} ms over {args.runs} runs, {len(run)} modules")
+    print(f"{'imported by ' + args.module:<32} {'cumulative (ms)':>16} {'self (ms)':>10}")
+    for name, (self_us, cumulative_us, _) in heaviest:
+        print(f"{name:<32} {cumulative_us / 1000:>16.1f} {self_us / 1000:>10.1f}")
+
+    failures = []
+    loaded = [name for name in args.lazy if name in run]
+    if loaded:
+        failures.append(f"imported eagerly: {', '.join(loaded)}")
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        failures.append(f"median {median_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "module": args.module,
+                "python": sys.version.split()[0],
+                "runs_ms": [round(total, 1) for total in totals],
+                "median_ms": round(median_ms, 1),
+                "modules": len(run),
+                "top": {name: round(cumulative_us / 1000, 1) for name, (_, cumulative_us, _) in heaviest},
+                "failures": failures,
+            }, f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
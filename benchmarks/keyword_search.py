@@ -0,0 +1,85 @@
+"""
+Latency of /filterCandidate keyword filtering on a synthetic table of resumes:
+the previous ILIKE '%word%' scan against the full-text (GIN) / trigram indexed filter.
+
+Needs the Postgres instance configured in db_operations/utility_db.py. Rows go to a
+scratch table (dropped afterwards unless --keep), never to the candidate table.
+
+Usage:
+    python benchmarks/keyword_search.py --rows 100000 --keywords python kubernetes "data engineer" c++
+"""
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+
+WORDS = ("python java kubernetes docker terraform spark airflow kafka react node.js c++ golang rust sql "
+         "postgres snowflake tableau pandas pytorch tensorflow aws azure gcp linux agile scrum leadership "
+         "data engineer analyst scientist developer manager designer marketing finance sales operations "
+         "pipeline dashboard deployment migration optimization architecture mentoring stakeholder").split()
+
+
+def make_resumes(rows: int, words_per_resume: int, rng):
+
+    # Mostly filler text with a few skills each, so a keyword matches a small share of resumes
+    filler = np.asarray([f"term{idx}" for idx in range(20_000)])
+    skills = np.asarray(WORDS)
+    return [" ".join(np.concatenate([rng.choice(filler, size=words_per_resume), rng.choice(skills, size=3)]))
+            for _ in range(rows)]
+
+
+def timed(conn, sql, params, repeats: int):
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        samples.append(time.perf_counter() - start)
+    return min(samples) * 1000
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--words-per-resume", type=int, default=400)
+    parser.add_argument("--keywords", nargs="+", default=["kubernetes", "data engineer", "pyth*", "c++"])
+    parser.add_argument("--table", default="keyword_search_bench")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["TABLE_NAME"] = args.table
+    from db_operations import utility_db
+
+    resumes = make_resumes(args.rows, args.words_per_resume, np.random.default_rng(0))
+    with utility_db.engine.begin() as conn:
+        conn.execute(text(f"drop table if exists {args.table}"))
+    pd.DataFrame({"email_id": [f"bench-{idx}@example.com" for idx in range(args.rows)], "resume_raw_text": resumes})\
+      .to_sql(args.table, utility_db.engine, index=False, chunksize=10_000)
+
+    start = time.perf_counter()
+    utility_db.ensure_schema()
+    print(f"{args.rows} rows, index build {time.perf_counter() - start:.1f}s")
+
+    condition, relevance, params = utility_db.keyword_filter(args.keywords)
+    scan_conditions = " or ".join(f"resume_raw_text ilike '%{word.strip('*')}%'" for word in args.keywords)
+
+    with utility_db.engine.connect() as conn:
+        conn.execute(text(f"analyze {args.table}"))
+        scan_ms = timed(conn, f"select email_id from {args.table} where {scan_conditions}", {}, args.repeats)
+        indexed_ms = timed(conn, f"select email_id, {relevance} as keyword_score from {args.table} where {condition}",
+                           params, args.repeats)
+
+    print(f"ILIKE scan: {scan_ms:.1f} ms, indexed: {indexed_ms:.1f} ms ({scan_ms / indexed_ms:.1f}x)")
+
+    if not args.keep:
+        with utility_db.engine.begin() as conn:
+            conn.execute(text(f"drop table if exists {args.table}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Latency of candidate ranking in refined_search_results: the previous per-candidate
+loop (create_similarity_score + full sort + DataFrame isin) against the vectorized
+matrix-vector product with argpartition top-k.
+
+Usage:
+    python benchmarks/search_similarity.py --sizes 1000 10000 100000 --dim 768 --top-k 10
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from ai_operations.vector_index import as_matrix, cosine_scores, top_k
+
+
+def create_similarity_score(job_description_emb, recruiter_overview_emb):
+
+    dot_product = np.dot(job_description_emb, recruiter_overview_emb)
+    magnitude_jd = np.linalg.norm(job_description_emb)
+    magnitude_ro = np.linalg.norm(recruiter_overview_emb)
+    return dot_product / (magnitude_jd * magnitude_ro)
+
+
+def make_candidates(size: int, dim: int, rng):
+
+    vectors = rng.standard_normal((size, dim), dtype=np.float32)
+    return [{"name": f"candidate-{idx}",
+             "score_resume": {"score": float(rng.integers(0, 100))},
+             "overview_embedding": vectors[idx]} for idx in range(size)]
+
+
+def loop_ranking(data, query, num_results):
+
+    final_list = []
+    for candidate in data:
+        final_list.append([candidate["name"], round(create_similarity_score(query, candidate["overview_embedding"]), 3)])
+    final_list.sort(key = lambda x: x[1], reverse=True)
+    names = [name for name, _ in final_list[:num_results]]
+
+    df = pd.DataFrame.from_records(data)
+    df = df[df["name"].isin(names)]
+    df["resume_score"] = df["score_resume"].apply(lambda x: x.get("score", 0))
+    return df.sort_values(by="resume_score", ascending=False).drop(columns=["resume_score"]).to_dict("records")
+
+
+def vectorized_ranking(data, query, num_results):
+
+    matrix, norms = as_matrix([candidate["overview_embedding"] for candidate in data])
+    best = top_k(cosine_scores(query, matrix, norms), num_results)
+    results = [data[idx] for idx in best]
+    results.sort(key = lambda x: x["score_resume"].get("score", 0), reverse=True)
+    return results
+
+
+def timed(fn, *args, repeats: int):
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return min(samples) * 1000
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'candidates':>10} {'loop (ms)':>12} {'vectorized (ms)':>16} {'speedup':>8}")
+    for size in args.sizes:
+        data = make_candidates(size, args.dim, rng)
+        query = rng.standard_normal(args.dim, dtype=np.float32)
+
+        loop_ms = timed(loop_ranking, data, query, args.top_k, repeats=args.repeats)
+        vectorized_ms = timed(vectorized_ranking, data, query, args.top_k, repeats=args.repeats)
+        print(f"{size:>10} {loop_ms:>12.1f} {vectorized_ms:>16.1f} {loop_ms / vectorized_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
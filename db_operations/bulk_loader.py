@@ -0,0 +1,223 @@
+"""
+Offline loader for pre-analyzed candidates: streams a JSONL file of assembled analysis
+payloads (one `/assembleData` body per line), maps each line to candidate columns the
+way `insert_data` does and loads them with Postgres COPY, chunk by chunk.
+
+Chunks are copied into a temporary staging table and merged with one
+`INSERT ... SELECT ... ON CONFLICT (email_id) DO UPDATE`, so re-loading a candidate
+replaces its row; within the file, the last line per email_id wins.
+
+Usage:
+    python -m db_operations.bulk_loader candidates.jsonl --chunk-size 5000
+    python -m db_operations.bulk_loader candidates.jsonl --table resume_store --embed
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import structlog
+from db_operations.utility_db import (engine, ensure_schema, candidate_row, sanitize_data, embed_overviews,
+                                      EMBEDDING_MODEL, CANDIDATE_COLUMNS, CANDIDATE_JSON_COLUMNS)
+
+structlogger = structlog.get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("BULK_LOADER_CHUNK_SIZE", 5000))
+
+
+def copy_text(value):
+    """
+    One field in COPY text format: backslash escapes, `\\N` for NULL.
+    """
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def copy_line(row: dict, columns: list, json_columns: set, extra = ()) -> str:
+
+    fields = []
+    for column in columns:
+        value = row.get(column, None)
+        if value is not None and column in json_columns:
+            value = json.dumps(value, default=str)
+        elif value is not None and column == "overview_embedding":
+            value = "{" + ",".join(repr(float(component)) for component in value) + "}"
+        fields.append(copy_text(value))
+    fields.extend(copy_text(value) for value in extra)
+    return "\t".join(fields) + "\n"
+
+
+def as_float(value):
+
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return float(value)
+
+
+def read_records(handle):
+    """
+    Yield (line_number, row, error) for every non-empty line; `row` is None when the line is rejected.
+    """
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("line is not a JSON object")
+            row = candidate_row(sanitize_data(record, remove_chars=['\x00', '\ufffd'], strip_whitespace=True))
+            if row is None:
+                raise ValueError("Name/Job-Role/Resume cant be None")
+            if not row["email_id"]:
+                raise ValueError("email_id is required for the upsert")
+            row["get_yoe"], row["get_ryoe"] = as_float(row["get_yoe"]), as_float(row["get_ryoe"])
+        except (ValueError, TypeError, AttributeError) as e:
+            yield line_number, None, str(e)
+            continue
+        yield line_number, row, None
+
+
+class BulkLoader:
+    """
+    Loads candidate rows into the candidate table through a session-local staging table.
+    """
+
+    def __init__(self, engine, table_name: str, columns: list, json_columns: list):
+
+        self.table_name = table_name
+        self.stage_name = f"{table_name}_load"
+        self.columns = columns
+        self.json_columns = set(json_columns)
+        self.connection = engine.raw_connection()
+
+        column_list = ", ".join(columns)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "email_id")
+        # DISTINCT ON keeps one row per email_id: ON CONFLICT cannot update the same row twice
+        self.merge_sql = (f"insert into {table_name} ({column_list}) "
+                          f"select distinct on (email_id) {column_list} from {self.stage_name} "
+                          f"order by email_id, load_line desc "
+                          f"on conflict (email_id) do update set {updates}, created_at = now()")
+        self.copy_sql = f"copy {self.stage_name} ({column_list}, load_line) from stdin"
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"create temp table if not exists {self.stage_name} as "
+                           f"select {column_list} from {table_name} with no data")
+            cursor.execute(f"alter table {self.stage_name} add column if not exists load_line bigint")
+        self.connection.commit()
+
+    def load_chunk(self, rows: list) -> int:
+        """
+        COPY `rows` (list of (line_number, row)) into staging and merge them in one transaction.
+
+        Returns:
+            Number of candidate rows inserted or updated
+        """
+        buffer = io.StringIO()
+        for line_number, row in rows:
+            buffer.write(copy_line(row, self.columns, self.json_columns, extra = (line_number,)))
+        buffer.seek(0)
+
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.copy_expert(self.copy_sql, buffer)
+                cursor.execute(self.merge_sql)
+                merged = cursor.rowcount
+                cursor.execute(f"truncate {self.stage_name}")
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        return merged
+
+    def close(self):
+        self.connection.close()
+
+
+def embed_rows(rows: list):
+    """
+    Batch-embed the recruiter overviews of a chunk; on failure the rows are loaded without
+    embeddings and picked up by `/backfillEmbeddings`.
+    """
+    try:
+        vectors = embed_overviews([row["get_recruiters_overview"] for _, row in rows])
+    except Exception as e:
+        structlogger.debug("Embedding - Exception occurred", details=e)
+        return
+    for (_, row), vector in zip(rows, vectors):
+        row.update({"overview_embedding": vector, "embedding_model": EMBEDDING_MODEL, "embedding_dim": len(vector)})
+
+
+def load(handle, chunk_size: int = DEFAULT_CHUNK_SIZE, embed: bool = False, report = print):
+    """
+    Stream `handle` into the candidate table.
+
+    Returns:
+        Dict with lines read, rows loaded (inserted or updated), rejected lines, seconds and
+        valid rows processed per second
+    """
+    table_name = os.getenv("TABLE_NAME", None)
+    ensure_schema()
+    loader = BulkLoader(engine, table_name, CANDIDATE_COLUMNS, CANDIDATE_JSON_COLUMNS)
+
+    stats = {"read": 0, "loaded": 0, "rejected": 0}
+    start = time.perf_counter()
+
+    def flush(chunk):
+        if embed:
+            embed_rows(chunk)
+        stats["loaded"] += loader.load_chunk(chunk)
+        elapsed = time.perf_counter() - start
+        report(f"{stats['read']} lines read, {stats['loaded']} rows loaded, {stats['rejected']} rejected "
+               f"({(stats['read'] - stats['rejected']) / elapsed:.0f} rows/s)")
+
+    try:
+        chunk = []
+        for line_number, row, error in read_records(handle):
+            stats["read"] += 1
+            if row is None:
+                stats["rejected"] += 1
+                structlogger.debug("Bulk loader - Rejected line", line=line_number, details=error)
+                continue
+            chunk.append((line_number, row))
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+    finally:
+        loader.close()
+
+    stats["seconds"] = round(time.perf_counter() - start, 2)
+    stats["rows_per_second"] = round((stats["read"] - stats["rejected"]) / stats["seconds"], 1) if stats["seconds"] else 0.0
+    return stats
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="JSONL file of assembled payloads, or - for stdin")
+    parser.add_argument("--table", default=None, help="Target table (default: TABLE_NAME)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--embed", action="store_true",
+                        help="Embed recruiter overviews while loading instead of leaving them to /backfillEmbeddings")
+    args = parser.parse_args()
+
+    if args.table:
+        os.environ["TABLE_NAME"] = args.table
+
+    handle = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    try:
+        stats = load(handle, chunk_size = args.chunk_size, embed = args.embed)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+    print(f"Loaded {stats['loaded']} rows from {stats['read']} lines ({stats['rejected']} rejected) "
+          f"in {stats['seconds']}s, {stats['rows_per_second']} rows/s")
+
+
+if __name__ == "__main__":
+    main()
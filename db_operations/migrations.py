@@ -0,0 +1,170 @@
+"""
+Schema migrations of the candidate table, run explicitly (never from a request):
+
+1. columns: embedding columns and created_at (metadata-only, no table rewrite)
+2. unique_email: collapses duplicate email_id rows to the most recently created one
+   (copies of the removed rows are kept in <table>_duplicates), then adds the unique
+   email_id index upserts rely on
+3. search_document: the generated resume_tsv column (rewrites the whole table) and its GIN index
+4. trigram_index: pg_trgm substring index for keywords with symbols (skipped when the
+   extension is unavailable)
+
+Every step checks whether it is still needed, so re-running is safe. Run it before
+starting a version that needs it; requests only create a missing table.
+
+Usage:
+    python -m db_operations.migrations --dry-run
+    python -m db_operations.migrations --table resume_store
+"""
+import os
+import time
+import argparse
+from sqlalchemy import text
+from db_operations.database import engine
+import structlog
+
+structlogger = structlog.get_logger(__name__)
+
+
+def _exists(conn, name: str) -> bool:
+    return conn.execute(text("select to_regclass(:name)"), {"name": name}).scalar() is not None
+
+
+def _columns(conn, table_name: str) -> set:
+
+    rows = conn.execute(text("select column_name from information_schema.columns where table_name = :table_name"),
+                        {"table_name": table_name})
+    return {row[0] for row in rows}
+
+
+# Duplicates ranked newest first; rows from before created_at existed share its default, so ctid breaks the tie
+RANKED_DUPLICATES = ("select ctid as row_id from (select ctid, row_number() over (partition by email_id "
+                     "order by created_at desc nulls last, ctid desc) as position from {table} "
+                     "where email_id is not null) ranked where position > 1")
+
+
+def duplicate_count(conn, table_name: str) -> int:
+
+    if "created_at" not in _columns(conn, table_name):
+        return conn.execute(text(f"select count(*) - count(distinct email_id) from {table_name} "
+                                 "where email_id is not null")).scalar()
+    return conn.execute(text(f"select count(*) from ({RANKED_DUPLICATES.format(table=table_name)}) duplicates")).scalar()
+
+
+def pending_migrations(conn, table_name: str) -> list:
+    """
+    Names of the migration steps `table_name` still needs.
+    """
+    columns = _columns(conn, table_name)
+    pending = []
+    if not {"overview_embedding", "embedding_model", "embedding_dim", "created_at"} <= columns:
+        pending.append("columns")
+    if not _exists(conn, f"{table_name}_email_id_key"):
+        pending.append("unique_email")
+    if "resume_tsv" not in columns or not _exists(conn, f"{table_name}_resume_tsv_idx"):
+        pending.append("search_document")
+    if not _exists(conn, f"{table_name}_resume_trgm_idx"):
+        pending.append("trigram_index")
+    return pending
+
+
+def add_columns(conn, table_name: str):
+
+    conn.execute(text(f"alter table {table_name} "
+                      "add column if not exists overview_embedding real[], "
+                      "add column if not exists embedding_model text, "
+                      "add column if not exists embedding_dim integer, "
+                      "add column if not exists created_at timestamp default now()"))
+
+
+def add_unique_email(conn, table_name: str):
+
+    duplicates = duplicate_count(conn, table_name)
+    if duplicates:
+        ranked = RANKED_DUPLICATES.format(table=table_name)
+        conn.execute(text(f"create table if not exists {table_name}_duplicates as select * from {table_name} with no data"))
+        conn.execute(text(f"insert into {table_name}_duplicates select * from {table_name} where ctid in ({ranked})"))
+        removed = conn.execute(text(f"delete from {table_name} where ctid in ({ranked})")).rowcount
+        structlogger.info("Migration - Removed duplicate email_id rows", table=table_name, removed=removed,
+                          kept_in=f"{table_name}_duplicates")
+    conn.execute(text(f"create unique index if not exists {table_name}_email_id_key on {table_name} (email_id)"))
+
+
+def add_search_document(conn, table_name: str):
+
+    conn.execute(text(f"alter table {table_name} add column if not exists resume_tsv tsvector generated always as "
+                      "(to_tsvector('english', coalesce(resume_raw_text, ''))) stored"))
+    conn.execute(text(f"create index if not exists {table_name}_resume_tsv_idx on {table_name} using gin (resume_tsv)"))
+
+
+def add_trigram_index(conn, table_name: str):
+
+    conn.execute(text("create extension if not exists pg_trgm"))
+    conn.execute(text(f"create index if not exists {table_name}_resume_trgm_idx on {table_name} "
+                      "using gin (resume_raw_text gin_trgm_ops)"))
+
+
+MIGRATIONS = {
+    "columns": add_columns,
+    "unique_email": add_unique_email,
+    "search_document": add_search_document,
+    "trigram_index": add_trigram_index,
+}
+# Steps the application still works without (substring keywords fall back to a scan)
+OPTIONAL_MIGRATIONS = {"trigram_index"}
+
+
+def migrate(table_name: str = None, dry_run: bool = False, report = print):
+    """
+    Apply the pending migration steps to `table_name` (default TABLE_NAME), one transaction each.
+
+    Returns:
+        Dict of step -> "applied", "pending" (dry run), "failed" (optional steps only) or "done"
+    """
+    table_name = table_name or os.getenv("TABLE_NAME", None)
+    with engine.connect() as conn:
+        if not _exists(conn, table_name):
+            raise ValueError(f"Table {table_name} does not exist; it is created by the first insert")
+        pending = pending_migrations(conn, table_name)
+        if dry_run and "unique_email" in pending:
+            report(f"{table_name}: {duplicate_count(conn, table_name)} duplicate email_id rows would be removed")
+
+    results = {}
+    for step, apply in MIGRATIONS.items():
+        if step not in pending:
+            results[step] = "done"
+            continue
+        if dry_run:
+            results[step] = "pending"
+            continue
+
+        start = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                apply(conn, table_name)
+        except Exception as e:
+            if step not in OPTIONAL_MIGRATIONS:
+                raise
+            structlogger.info("Migration - Optional step failed", table=table_name, step=step, details=str(e))
+            results[step] = "failed"
+            continue
+        seconds = round(time.perf_counter() - start, 2)
+        structlogger.info("Migration - Step applied", table=table_name, step=step, seconds=seconds)
+        report(f"{table_name}: {step} applied in {seconds}s")
+        results[step] = "applied"
+    return results
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", default=None, help="Table to migrate (default: TABLE_NAME)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the pending steps and duplicate rows")
+    args = parser.parse_args()
+
+    results = migrate(args.table, dry_run = args.dry_run)
+    print(", ".join(f"{step}: {status}" for step, status in results.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import json
+import math
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, TypedDict
+from sqlalchemy import text
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the standard library encoder is used without it
+    orjson = None
+
+
+class CandidateRecord(TypedDict, total=False):
+    """
+    One row of the candidate table as returned by the read helpers.
+    """
+    candidate_id: str
+    name: str
+    job_role: str
+    resume_raw_text: str
+    email_id: str
+    mobile_number: str
+    get_yoe: Optional[float]
+    get_ryoe: Optional[float]
+    score_resume: Dict[str, Any]
+    get_contacts: Dict[str, Any]
+    get_summary_overview: Dict[str, Any]
+    get_custom_scores: Dict[str, Any]
+    get_other_comments: Dict[str, Any]
+    get_functional_constituent: Dict[str, Any]
+    get_technical_constituent: Dict[str, Any]
+    get_education: List[Dict[str, Any]]
+    get_projects: Dict[str, Any]
+    get_company: Dict[str, Any]
+    get_location: Dict[str, Any]
+    get_recruiters_overview: Dict[str, Any]
+    get_designation: Dict[str, Any]
+    mode: str
+    created_at: datetime
+    overview_embedding: List[float]
+    embedding_model: str
+    embedding_dim: int
+    keyword_score: float
+
+
+class CandidateOption(TypedDict):
+    name: str
+    email_id: str
+
+
+def row_to_dict(row) -> dict:
+    """
+    Plain dict of a SQLAlchemy row mapping. NaN floats become None so the row is valid JSON.
+    """
+    return {key: None if isinstance(value, float) and math.isnan(value) else value for key, value in row.items()}
+
+
+def fetch_records(engine, sql: str, params: dict = None) -> List[dict]:
+
+    with engine.connect() as conn:
+        return [row_to_dict(row) for row in conn.execute(text(sql), params or {}).mappings()]
+
+
+def iter_records(engine, sql: str, params: dict = None, fetch_size: int = 500):
+    """
+    Like `fetch_records`, but streams rows through a server-side cursor `fetch_size` at a time.
+    """
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=fetch_size).execute(text(sql), params or {})
+        for row in result.mappings():
+            yield row_to_dict(row)
+
+
+async def afetch_records(conn, sql: str, params: dict = None) -> List[dict]:
+    """
+    `fetch_records` on an open async connection.
+    """
+    result = await conn.execute(text(sql), params or {})
+    return [row_to_dict(row) for row in result.mappings()]
+
+
+async def aiter_records(conn, sql: str, params: dict = None, fetch_size: int = 500):
+    """
+    `iter_records` on an open async connection; the connection must stay open while iterating.
+    """
+    result = await conn.stream(text(sql).execution_options(yield_per=fetch_size), params or {})
+    async for row in result.mappings():
+        yield row_to_dict(row)
+
+
+def _default(value):
+
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps_json(value) -> bytes:
+    """
+    Encode to JSON bytes with orjson when installed, falling back to the standard library.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=_default).encode("utf-8")
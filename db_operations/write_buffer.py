@@ -0,0 +1,291 @@
+import os
+import glob
+import json
+import time
+import uuid
+import random
+import asyncio
+import inspect
+import threading
+import structlog
+
+try:
+    import fcntl
+except ImportError:  # No advisory locks (Windows): spill directories must not be shared between processes
+    fcntl = None
+
+structlogger = structlog.get_logger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Collects payloads and writes them in groups: a flush runs once `max_rows` payloads
+    are pending or `max_delay_ms` after the first one arrived, whichever comes first.
+
+    Every payload is appended (and fsynced) to a spill file before `submit` returns, so
+    work accepted by the buffer survives a crash; spill files are deleted only after the
+    flush that covers them has committed, and are replayed by `recover` on startup. A
+    process holds an exclusive lock on each spill file it owns until it is deleted, so
+    workers sharing a spill directory only replay the files of processes that are gone.
+
+    A failed flush keeps the batch and retries it with backoff. After `max_attempts`
+    failures in a row the batch is written row by row: rows that still fail while others
+    commit are moved to the dead-letter directory instead of blocking the buffer.
+    """
+
+    def __init__(self, flush, spill_dir: str, max_rows: int = 50, max_delay_ms: int = 500, max_retry_delay: float = 30.0,
+                 max_attempts: int = 3):
+        """
+        Args:
+            flush: Callable receiving a list of payloads; a coroutine function is awaited,
+                a blocking one runs in a worker thread
+            spill_dir: Directory for the spill files
+            max_rows: Pending payloads that trigger an immediate flush
+            max_delay_ms: Longest time a payload waits before being flushed
+            max_retry_delay: Cap in seconds of the backoff between failed flushes
+            max_attempts: Failed flushes of a batch before its rows are written one by one
+        """
+        self.flush_fn = flush
+        self.spill_dir = spill_dir
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max_attempts
+        self.dead_letter_dir = os.path.join(spill_dir, "dead_letter")
+        self.counters = {"submitted": 0, "flushed": 0, "flushes": 0, "failed_flushes": 0, "recovered": 0,
+                         "row_flushes": 0, "dead_lettered": 0}
+        self.last_flush_ms = None
+        self._pending = []
+        self._spill_files = []
+        self._handles = {}
+        self._spill = None
+        self._spill_lock = threading.Lock()
+        self._flush_lock = None
+        self._timer = None
+        self._tasks = set()
+        self._failures = 0
+
+    def _open_spill(self):
+
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"{time.time():.6f}-{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl")
+        self._spill = open(path, "a", encoding="utf-8")
+        if fcntl is not None:
+            fcntl.flock(self._spill, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._handles[path] = self._spill
+        self._spill_files.append(path)
+
+    def _claim(self, path: str):
+        """
+        Open and lock a spill file left by another process; None while its owner is alive
+        (or when it was deleted meanwhile).
+        """
+        try:
+            handle = open(path, "r+", encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return None
+        # The owner deletes its file before unlocking it: a lock won on a deleted file is stale
+        try:
+            if os.stat(path).st_ino != os.fstat(handle.fileno()).st_ino:
+                raise FileNotFoundError(path)
+        except FileNotFoundError:
+            handle.close()
+            return None
+        return handle
+
+    def _remove_files(self, files: list):
+
+        for path in files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            handle = self._handles.pop(path, None)
+            if handle is not None:
+                handle.close()
+
+    def _dead_letter(self, failed: list):
+        """
+        Append rows that keep failing, with their error, to this process's dead-letter file.
+        """
+        os.makedirs(self.dead_letter_dir, exist_ok=True)
+        path = os.path.join(self.dead_letter_dir, f"{os.getpid()}.jsonl")
+        with open(path, "a", encoding="utf-8") as handle:
+            for payload, error in failed:
+                handle.write(json.dumps({"failed_at": time.time(), "error": str(error), "payload": payload}, default=str) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.counters["dead_lettered"] += len(failed)
+        structlogger.info("Write buffer - Dead-lettered failing rows", rows=len(failed), path=path,
+                          details=str(failed[0][1]))
+
+    def _append(self, payload: dict):
+
+        # The payload joins the pending list under the same lock as its spill write, so a
+        # batch never covers a spill file without also holding every payload written to it
+        with self._spill_lock:
+            if self._spill is None:
+                self._open_spill()
+            self._spill.write(json.dumps(payload, default=str) + "\n")
+            self._spill.flush()
+            os.fsync(self._spill.fileno())
+            self._pending.append(payload)
+
+    def _take_batch(self):
+        """
+        Take everything pending and the spill files covering it; later payloads go to a new file.
+        """
+        with self._spill_lock:
+            # The file stays open (and locked) until the flush covering it commits
+            self._spill = None
+            batch, self._pending = self._pending, []
+            files, self._spill_files = self._spill_files, []
+        return batch, files
+
+    def _restore_batch(self, batch: list, files: list):
+
+        with self._spill_lock:
+            self._pending = batch + self._pending
+            self._spill_files = files + self._spill_files
+
+    def _start_flush(self):
+
+        # The loop only keeps weak references to tasks; hold this one until it is done
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _schedule_flush(self, delay: float):
+
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(delay, self._start_flush)
+
+    async def submit(self, payload: dict):
+
+        await asyncio.to_thread(self._append, payload)
+        self.counters["submitted"] += 1
+
+        if len(self._pending) >= self.max_rows:
+            self._start_flush()
+        else:
+            self._schedule_flush(self.max_delay)
+
+    async def _write(self, batch: list):
+
+        if inspect.iscoroutinefunction(self.flush_fn):
+            await self.flush_fn(batch)
+        else:
+            await asyncio.to_thread(self.flush_fn, batch)
+
+    async def _write_rows(self, batch: list):
+        """
+        Write `batch` one row at a time.
+
+        Returns:
+            Rows not written yet (all of them when no row went through, so an outage is not
+            mistaken for bad rows), and the failed rows with their error to dead-letter
+        """
+        self.counters["row_flushes"] += 1
+        written, failed = 0, []
+        for position, payload in enumerate(batch):
+            try:
+                await self._write([payload])
+                written += 1
+            except Exception as e:
+                failed.append((payload, e))
+                if not written and len(failed) >= self.max_attempts:
+                    # Untried rows go first next time, so a run of bad rows cannot hold back the rest
+                    return batch[position + 1:] + [payload for payload, _ in failed], []
+        if not written:
+            return batch, []
+        return [], failed
+
+    async def flush(self):
+
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, files = self._take_batch()
+            if not batch:
+                return
+
+            start = time.perf_counter()
+            remaining, failed = batch, []
+            try:
+                if self._failures < self.max_attempts:
+                    await self._write(batch)
+                else:
+                    remaining, failed = await self._write_rows(batch)
+                    if remaining:
+                        raise RuntimeError(f"No row of the batch could be written ({len(remaining)} rows)")
+            except Exception as e:
+                # Keep the rows (and the spill files covering them) and try again later
+                self._restore_batch(remaining, files)
+                self._failures += 1
+                self.counters["failed_flushes"] += 1
+                delay = random.uniform(0, min(self.max_retry_delay, self.max_delay * 2 ** self._failures))
+                structlogger.debug("Write buffer - Flush failed", rows=len(batch), retry_in=round(delay, 2), details=e)
+                self._schedule_flush(delay)
+                return
+
+            if failed:
+                await asyncio.to_thread(self._dead_letter, failed)
+            self._failures = 0
+            self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.counters["flushes"] += 1
+            self.counters["flushed"] += len(batch) - len(failed)
+            structlogger.debug("Write buffer - Flushed", rows=len(batch) - len(failed), latency_ms=self.last_flush_ms)
+
+            # Every row is now committed or dead-lettered
+            self._remove_files(files)
+
+    async def recover(self):
+        """
+        Re-queue payloads left in spill files by processes that are gone and flush them;
+        files still locked by a running worker are left to it.
+        """
+        recovered = 0
+        for path in sorted(glob.glob(os.path.join(self.spill_dir, "*.jsonl"))):
+            if path in self._handles:
+                continue
+            handle = self._claim(path)
+            if handle is None:
+                continue
+            payloads = []
+            for line in handle:
+                try:
+                    payloads.append(json.loads(line))
+                except ValueError:
+                    # A crash mid-write leaves at most one truncated last line
+                    structlogger.debug("Write buffer - Skipping unreadable spill line", path=path)
+            self._handles[path] = handle
+            self._restore_batch(payloads, [path])
+            recovered += len(payloads)
+
+        if recovered:
+            self.counters["recovered"] += recovered
+            structlogger.info("Write buffer - Recovered spilled payloads", rows=recovered)
+            await self.flush()
+
+    async def close(self):
+        await self.flush()
+
+    def stats(self):
+
+        return {
+            **self.counters,
+            "pending": len(self._pending),
+            "max_rows": self.max_rows,
+            "max_delay_ms": int(self.max_delay * 1000),
+            "last_flush_ms": self.last_flush_ms,
+        }
@@ -239,8 +239,8 @@ export default function BulkImport() {
 
   const handleNext = async () => {
     if (selectedFiles.length > 0 && extractedTexts.length === selectedFiles.length) {
-      // Process the files by sending individual requests to bulk import API
-      console.log('Starting individual resume processing for bulk import:');
+      // Process the files as one server-side bulk import job
+      console.log('Starting bulk import job:');
       console.log('Total files to process:', extractedTexts.length);
       console.log('Selected files:', selectedFiles.map(f => f.name));
       
@@ -252,107 +252,80 @@ export default function BulkImport() {
       const errors = [];
       
       try {
-        // Process each resume individually
-        for (let i = 0; i < extractedTexts.length; i++) {
-          const resumeData = extractedTexts[i];
-          
-          // Update progress at the start of each iteration
-          setCurrentProcessing(i + 1);
-          setProcessingFileName(resumeData.fileName);
-          
-          console.log(`\n--- Processing Resume ${i + 1}/${extractedTexts.length} ---`);
-          console.log(`File: ${resumeData.fileName}`);
-          console.log(`Pages: ${resumeData.pageCount}`);
-          console.log(`Text length: ${resumeData.text.length} characters`);
-          console.log(`Text preview: ${resumeData.text.substring(0, 150)}...`);
-          
-          // Prepare individual resume data
-          const individualResumeData = {
-            fileName: resumeData.fileName,
-            fileSize: resumeData.fileSize,
-            resumeText: resumeData.text,
-            pageCount: resumeData.pageCount,
+        // Submit all resumes as one server-side job and follow its progress over Server-Sent Events
+        const jobResponse = await fetch('http://127.0.0.1:8000/bulkImportJobs', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({
             jobRole: jobRole,
-            processIndex: i + 1,
-            totalFiles: extractedTexts.length,
-            request_type: null
-          };
-          
-          console.log(`Sending individual request ${i + 1} to processBulkImport API:`);
-          console.log('Request data:', {
-            fileName: individualResumeData.fileName,
-            textLength: individualResumeData.resumeText.length,
-            pageCount: individualResumeData.pageCount,
-            jobRole: individualResumeData.jobRole,
-            processIndex: individualResumeData.processIndex
+            request_type: null,
+            resumes: extractedTexts.map((resumeData, i) => ({
+              fileName: resumeData.fileName,
+              fileSize: resumeData.fileSize,
+              resumeText: resumeData.text,
+              pageCount: resumeData.pageCount,
+              processIndex: i + 1,
+              totalFiles: extractedTexts.length
+            }))
+          })
+        });
+
+        const job = await jobResponse.json();
+        if (!jobResponse.ok || !job.job_id) {
+          throw new Error(job.error || jobResponse.statusText);
+        }
+        console.log('Created bulk import job:', job.job_id);
+
+        const jobItems = await new Promise((resolve, reject) => {
+          // EventSource reconnects by itself and resumes from the last event id it received
+          const events = new EventSource(`http://127.0.0.1:8000/bulkImportJobs/${job.job_id}/events`);
+
+          events.addEventListener('started', (event) => {
+            const data = JSON.parse(event.data);
+            setProcessingFileName(data.fileName);
           });
-          
-          try {
-            // Call the API for individual resume
-            const response = await fetch('http://127.0.0.1:8000/processBulkImport', {
-              method: 'POST',
-              headers: { 'Content-Type': 'application/json' },
-              body: JSON.stringify(individualResumeData)
-            });
-            
-            if (response.ok) {
-              const result = await response.json();
-              console.log(`✓ Successfully processed ${resumeData.fileName}:`, result);
-              
-              // Extract values from nested final_payload structure
-              const contactInfo = result.getContacts || {};
-              const inputData = result.input_data || {};
-              const summaryInfo = result.getSummaryOverview || {};
-              
-              // Ensure result is an object and has expected structure
-              const safeResult = {
-                fileName: resumeData.fileName,
-                success: true,
-                email_id: contactInfo.email_id || '',
-                contact_number: contactInfo.mobile_number || '',
-                name: inputData.name || '',
-                summary_overview: summaryInfo.comment || '',
-                parsed_status: result.parsed_status || 'Successful'
-              };
-              
-              results.push(safeResult);
-            } else {
-              console.error(`✗ Failed to process ${resumeData.fileName}:`, response.statusText);
-              const failedResult = {
-                fileName: resumeData.fileName,
-                success: false,
-                email_id: "",
-                contact_number: "",
-                name: "",
-                summary_overview: "",
-                parsed_status: "UnSuccessful",
-                error: response.statusText
-              };
-              results.push(failedResult);
-              errors.push({ fileName: resumeData.fileName, error: response.statusText });
+
+          events.addEventListener('result', (event) => {
+            const data = JSON.parse(event.data);
+            const completed = data.succeeded + data.failed;
+            setCurrentProcessing(completed);
+            console.log(`✓ Finished ${data.fileName} (${completed}/${data.total}):`, data.result);
+          });
+
+          events.addEventListener('completed', async () => {
+            events.close();
+            try {
+              const snapshot = await fetch(`http://127.0.0.1:8000/bulkImportJobs/${job.job_id}`);
+              resolve((await snapshot.json()).items || []);
+            } catch (snapshotError) {
+              reject(snapshotError);
             }
-            
-          } catch (apiError) {
-            console.error(`✗ API Error for ${resumeData.fileName}:`, apiError);
-            const failedResult = {
-              fileName: resumeData.fileName,
-              success: false,
-              email_id: "",
-              contact_number: "",
-              name: "",
-              summary_overview: "",
-              parsed_status: "UnSuccessful",
-              error: apiError.message
-            };
-            results.push(failedResult);
-            errors.push({ fileName: resumeData.fileName, error: apiError.message });
-          }
-          
-          // Small delay between requests to avoid overwhelming the server
-          if (i < extractedTexts.length - 1) {
-            await new Promise(resolve => setTimeout(resolve, 100));
+          });
+
+          events.onerror = () => {
+            if (events.readyState === EventSource.CLOSED) {
+              reject(new Error('Lost connection to bulk import job'));
+            }
+          };
+        });
+
+        jobItems.forEach((item) => {
+          const result = item.result || {};
+          const success = item.status === 'succeeded';
+          results.push({
+            fileName: item.fileName,
+            success: success,
+            email_id: result.email_id || '',
+            contact_number: result.contact_number || '',
+            name: result.name || '',
+            summary_overview: result.summary_overview || '',
+            parsed_status: result.parsed_status || 'UnSuccessful',
+            error: success ? null : 'Processing failed'
+          });
+          if (!success) {
+            errors.push({ fileName: item.fileName, error: 'Processing failed' });
           }
-        }
+        });
         
         // Log final results
         console.log('\n=== BULK IMPORT COMPLETED ===');
@@ -366,18 +366,19 @@ export default function Home() {
       setLoadingDesignation(true);
       setLoadingLocation(true);
 
-      // Call fetchResumeName directly with the resume text
-      fetchResumeName(resumeText);
-
-      // Define API calls with individual handlers
+      // Sections of /analyzeResume with their handlers; all of them come back over one streamed request
       const apiCalls = [
+        {
+          name: 'getNames',
+          handler: (data) => {
+            console.log('Resume Name API Response:', data.name);
+            setResumeName(data.name || 'Unknown');
+            setLoadingResumeName(false);
+          }
+        },
         { 
           name: 'scoreResume',
-          url: 'http://127.0.0.1:8000/scoreResume',
-          body: JSON.stringify({ resumeText, jobRole }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Score Resume API Response:', data);
             setResumeScore(data.score || 0);
             setResumeItems(data.items || []);
@@ -386,11 +387,7 @@ export default function Home() {
         },
         {
           name: 'getContacts',
-          url: 'http://127.0.0.1:8000/getContacts',
-          body: JSON.stringify({ resumeText }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Contacts API Response:', data);
             setContactInfo(data);
             setLoadingContact(false);
@@ -398,11 +395,7 @@ export default function Home() {
         },
         {
           name: 'getSummaryOverview',
-          url: 'http://127.0.0.1:8000/getSummaryOverview',
-          body: JSON.stringify({ resumeText, jobRole }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Summary Overview API Response:', data);
             setSummaryInfo(data);
             setLoadingSummary(false);
@@ -410,11 +403,7 @@ export default function Home() {
         },
         {
           name: 'getCustomScores',
-          url: 'http://127.0.0.1:8000/getCustomScores',
-          body: JSON.stringify({ resumeText, jobRole }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Custom Scores API Response:', data);
             setCustomScores(data);
             setLoadingCustomScores(false);
@@ -422,11 +411,7 @@ export default function Home() {
         },
         {
           name: 'getOtherComments',
-          url: 'http://127.0.0.1:8000/getOtherComments',
-          body: JSON.stringify({ resumeText, jobRole }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Other Comments API Response:', data);
             // Handle the new response structure with AspectFeedback objects
             setOtherComments(data);
@@ -435,11 +420,7 @@ export default function Home() {
         },
         {
           name: 'getFunctionalConstituent',
-          url: 'http://127.0.0.1:8000/getFunctionalConstituent',
-          body: JSON.stringify({ resumeText, jobRole }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Functional Constituent API Response:', data);
             setFunctionalConstituent(data);
             setLoadingFunctionalConstituent(false);
@@ -447,11 +428,7 @@ export default function Home() {
         },
         {
           name: 'getTechnicalConstituent',
-          url: 'http://127.0.0.1:8000/getTechnicalConstituent',
-          body: JSON.stringify({ resumeText, jobRole }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Technical Constituent API Response:', data);
             setTechnicalConstituent(data);
             setLoadingTechnicalConstituent(false);
@@ -459,11 +436,7 @@ export default function Home() {
         },
         {
           name: 'getEducation',
-          url: 'http://127.0.0.1:8000/getEducation',
-          body: JSON.stringify({ resumeText }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Education API Response:', data);
             if (Array.isArray(data)) {
               setEducationHistory(data);
@@ -481,11 +454,7 @@ export default function Home() {
         },
         {
           name: 'getCompany',
-          url: 'http://127.0.0.1:8000/getCompany',
-          body: JSON.stringify({ resumeText }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Company API Response:', data);
             if (Array.isArray(data)) {
               setEmploymentHistory(data);
@@ -503,11 +472,7 @@ export default function Home() {
         },
         {
           name: 'getProjects',
-          url: 'http://127.0.0.1:8000/getProjects',
-          body: JSON.stringify({ resumeText, jobRole }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Projects API Response:', data);
             if (Array.isArray(data)) {
               setProjectsInfo(data);
@@ -525,12 +490,8 @@ export default function Home() {
         },
         {
           name: 'getYoe',
-          url: 'http://127.0.0.1:8000/getYoe',
-          body: JSON.stringify({ resumeText, jobRole }),
-          promise: null,
-          handler: async (response) => {
+          handler: (data) => {
             try {
-              const data = await response.json();
               console.log('Experience API Response:', data);
               
               // Ensure data exists and has the expected properties
@@ -571,11 +532,7 @@ export default function Home() {
         },
         {
           name: 'getRecruitersOverview',
-          url: 'http://127.0.0.1:8000/getRecruitersOverview',
-          body: JSON.stringify({ resumeText, jobRole }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Recruiters Overview API Response:', data);
             if (data && typeof data === 'object') {
               setRecruitersOverview({
@@ -595,11 +552,7 @@ export default function Home() {
         },
         {
           name: 'getDesignation',
-          url: 'http://127.0.0.1:8000/getDesignation',
-          body: JSON.stringify({ resumeText }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Designation API Response:', data);
             if (data && typeof data === 'object') {
               setDesignationInfo({
@@ -614,11 +567,7 @@ export default function Home() {
         },
         {
           name: 'getLocation',
-          url: 'http://127.0.0.1:8000/getLocation',
-          body: JSON.stringify({ resumeText }),
-          promise: null,
-          handler: async (response) => {
-            const data = await response.json();
+          handler: (data) => {
             console.log('Location API Response:', data);
             if (data && typeof data === 'object') {
               setLocationInfo({
@@ -633,70 +582,81 @@ export default function Home() {
         }
       ];
 
-      // Add cache busting parameter to all API calls
-      const timestamp = new Date().getTime();
-      apiCalls.forEach(call => {
-        const url = new URL(call.url);
-        url.searchParams.append('_t', timestamp);
-        call.promise = fetch(url, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: call.body
-        });
-      });
-      
-      // Process each API call properly with Promise.all
-      const processApiCall = async ({ name, promise, handler }) => {
+      // Loading state of a section that failed or never arrived
+      const failSection = (name) => {
+        switch (name) {
+          case 'getNames': setResumeName('Unknown'); setLoadingResumeName(false); break;
+          case 'scoreResume': setLoadingScore(false); break;
+          case 'getContacts': setLoadingContact(false); break;
+          case 'getSummaryOverview': setLoadingSummary(false); break;
+          case 'getCustomScores': setLoadingCustomScores(false); break;
+          case 'getOtherComments': setLoadingOtherComments(false); break;
+          case 'getFunctionalConstituent': setLoadingFunctionalConstituent(false); break;
+          case 'getTechnicalConstituent': setLoadingTechnicalConstituent(false); break;
+          case 'getEducation': setLoadingEducation(false); break;
+          case 'getCompany': setLoadingEmployment(false); break;
+          case 'getProjects': setLoadingProjects(false); break;
+          case 'getYoe': setLoadingExperience(false); setExperienceError('Failed to load experience data'); break;
+          case 'getRecruitersOverview': setLoadingRecruitersOverview(false); setRecruitersOverviewError('Failed to load recruiters overview data'); break;
+          case 'getDesignation': setLoadingDesignation(false); setDesignationError('Failed to load designation data'); break;
+          case 'getLocation': setLoadingLocation(false); setLocationError('Failed to load location data'); break;
+        }
+      };
+
+      // Sections not received yet
+      const pending = new Set(apiCalls.map(({ name }) => name));
+
+      // Each NDJSON line is one section, sent as soon as it is ready, then a final summary line
+      const handleEvent = (event) => {
+        const call = apiCalls.find(({ name }) => name === event.section);
+        if (!call) return;
+        pending.delete(call.name);
+        if (event.error) {
+          console.error(`${call.name} section failed:`, event.error);
+          failSection(call.name);
+          return;
+        }
         try {
-          console.log(`Starting ${name} API call`);
-          const response = await promise;
-          if (response.ok) {
-            await handler(response);
-            console.log(`${name} API call completed successfully`);
-          } else {
-            console.error(`${name} API call failed:`, response.statusText);
-            // Set appropriate loading state to false on error
-            switch (name) {
-              case 'scoreResume': setLoadingScore(false); break;
-              case 'getContacts': setLoadingContact(false); break;
-              case 'getSummaryOverview': setLoadingSummary(false); break;
-              case 'getCustomScores': setLoadingCustomScores(false); break;
-              case 'getOtherComments': setLoadingOtherComments(false); break;
-              case 'getFunctionalConstituent': setLoadingFunctionalConstituent(false); break;
-              case 'getTechnicalConstituent': setLoadingTechnicalConstituent(false); break;
-              case 'getEducation': setLoadingEducation(false); break;
-              case 'getCompany': setLoadingEmployment(false); break;
-              case 'getProjects': setLoadingProjects(false); break;
-              case 'getYoe': setLoadingExperience(false); setExperienceError('Failed to load experience data'); break;
-              case 'getRecruitersOverview': setLoadingRecruitersOverview(false); setRecruitersOverviewError('Failed to load recruiters overview data'); break;
-              case 'getDesignation': setLoadingDesignation(false); setDesignationError('Failed to load designation data'); break;
-              case 'getLocation': setLoadingLocation(false); setLocationError('Failed to load location data'); break;
-            }
-          }
+          call.handler(event.data);
+          console.log(`${call.name} section completed in ${event.elapsed_ms} ms`);
         } catch (error) {
-          console.error(`Error in ${name} API call:`, error);
-          // Set appropriate loading state to false on error
-          switch (name) {
-            case 'scoreResume': setLoadingScore(false); break;
-            case 'getContacts': setLoadingContact(false); break;
-            case 'getSummaryOverview': setLoadingSummary(false); break;
-            case 'getCustomScores': setLoadingCustomScores(false); break;
-            case 'getOtherComments': setLoadingOtherComments(false); break;
-            case 'getFunctionalConstituent': setLoadingFunctionalConstituent(false); break;
-            case 'getTechnicalConstituent': setLoadingTechnicalConstituent(false); break;
-            case 'getEducation': setLoadingEducation(false); break;
-            case 'getCompany': setLoadingEmployment(false); break;
-            case 'getProjects': setLoadingProjects(false); break;
-            case 'getYoe': setLoadingExperience(false); setExperienceError('Failed to load experience data'); break;
-            case 'getRecruitersOverview': setLoadingRecruitersOverview(false); setRecruitersOverviewError('Failed to load recruiters overview data'); break;
-            case 'getDesignation': setLoadingDesignation(false); setDesignationError('Failed to load designation data'); break;
-            case 'getLocation': setLoadingLocation(false); setLocationError('Failed to load location data'); break;
-          }
+          console.error(`Error handling ${call.name} section:`, error);
+          failSection(call.name);
         }
       };
-      
-      // Execute all API calls in parallel but handle each one properly
-      await Promise.all(apiCalls.map(processApiCall));
+
+      const url = new URL('http://127.0.0.1:8000/analyzeResume');
+      url.searchParams.append('format', 'ndjson');
+      // Add cache busting parameter
+      url.searchParams.append('_t', new Date().getTime());
+
+      try {
+        const response = await fetch(url, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ resumeText, jobRole, fields: apiCalls.map(({ name }) => name) })
+        });
+        if (!response.ok) {
+          throw new Error(`API request failed with status ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+        while (true) {
+          const { done, value } = await reader.read();
+          buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+          const lines = buffered.split('\n');
+          buffered = done ? '' : lines.pop();
+          lines.filter((line) => line.trim()).forEach((line) => handleEvent(JSON.parse(line)));
+          if (done) break;
+        }
+      } catch (error) {
+        console.error('Error in analyzeResume stream:', error);
+      } finally {
+        // Sections cut off by a failed or interrupted stream
+        pending.forEach(failSection);
+      }
 
     } catch (error) {
       console.error('Error calling APIs:', error);
@@ -713,34 +673,6 @@ export default function Home() {
       setLoadingProjects(false);
       setLoadingDesignation(false);
       setLoadingLocation(false);
-    }
-  };
-
-  // Handle submit with both resume and job role
-  const fetchResumeName = async (resumeText) => {
-    try {
-      setLoadingResumeName(true);
-      const response = await fetch('http://127.0.0.1:8000/getNames', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          resumeText
-        })
-      });
-
-      if (!response.ok) {
-        throw new Error(`API request failed with status ${response.status}`);
-      }
-
-      const data = await response.json();
-      setResumeName(data.name || 'Unknown');
-      console.log('Resume Name API Response:', data.name);
-    } catch (error) {
-      console.error('Error fetching resume name:', error);
-      setResumeName('Unknown');
-    } finally {
       setLoadingResumeName(false);
     }
   };
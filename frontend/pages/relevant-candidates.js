@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   Box, Typography, Button, Grid, Card, CardContent, TextField, Paper,
   FormControl, Select, MenuItem, Divider, CircularProgress, Chip, Checkbox, 
@@ -54,65 +54,93 @@ export default function RelevantCandidates() {
   });
   const [recentResumesEnabled, setRecentResumesEnabled] = useState(false);
   const [recentResumesCount, setRecentResumesCount] = useState(10);
+  // Bumped whenever a new load/search starts so a paginated load still in flight stops appending
+  const loadRequest = useRef(0);
 
   // Load all candidates on mount
   useEffect(() => {
     loadAllCandidates();
   }, []);
 
+  // Columns the candidate table needs; the backend only reads these
+  const CANDIDATE_FIELDS = [
+    'name', 'job_role', 'email_id', 'mobile_number', 'get_yoe', 'get_ryoe', 'get_location',
+    'get_technical_constituent', 'get_projects', 'get_education', 'get_company',
+    'get_summary_overview', 'score_resume', 'get_designation', 'created_at'
+  ].join(',');
+  const CANDIDATES_PAGE_SIZE = 200;
+
+  const transformCandidate = (candidate, index) => ({
+    id: index + 1,
+    name: candidate.name || 'Unknown',
+    jobRole: candidate.job_role || 'Not Specified',
+    email_id: candidate.email_id || '',
+    mobile_number: candidate.mobile_number || 'N/A',
+    experience: formatExperience(candidate.get_yoe),
+    relevantExperience: formatExperience(candidate.get_ryoe),
+    location: candidate.get_location?.location || 'Not Specified',
+    skills: extractSkills(candidate.get_technical_constituent),
+    technologies: extractTechnologies(candidate.get_projects),
+    education: extractEducation(candidate.get_education),
+    current: extractCurrentJob(candidate.get_company),
+    previous: extractPreviousJob(candidate.get_company),
+    summary: candidate.get_summary_overview?.comment || '',
+    resumeScore: candidate.score_resume?.score || 0,
+    designation: candidate.get_designation?.current_designation || '',
+    addedDate: candidate.created_at ? new Date(candidate.created_at).toLocaleDateString('en-GB', { day: '2-digit', month: 'short', year: 'numeric' }) : new Date().toLocaleDateString('en-GB', { day: '2-digit', month: 'short', year: 'numeric' }),
+    status: 'Sourced',
+    avatar: `https://ui-avatars.com/api/?name=${encodeURIComponent(candidate.name || 'User')}&background=random`
+  });
+
   const loadAllCandidates = async () => {
+    const request = ++loadRequest.current;
     setLoading(true);
     
     try {
-      const response = await fetch('http://127.0.0.1:8000/getAllCandidates', {
-        method: 'GET',
-        headers: {
-          'Content-Type': 'application/json',
-        }
-      });
-      
-      const data = await response.json();
-      
-      if (data && Array.isArray(data) && data.length > 0) {
+      // Keyset pagination: the first page renders right away, the rest is appended as it arrives
+      let cursor = null;
+      let loaded = [];
+
+      while (true) {
+        const params = new URLSearchParams({ limit: CANDIDATES_PAGE_SIZE, fields: CANDIDATE_FIELDS });
+        if (cursor) params.set('cursor', cursor);
+
+        const response = await fetch(`http://127.0.0.1:8000/getAllCandidates?${params.toString()}`, {
+          method: 'GET',
+          headers: {
+            'Content-Type': 'application/json',
+          }
+        });
+        
+        const data = await response.json();
+        const nextCursor = response.headers.get('X-Next-Cursor');
+        if (request !== loadRequest.current) return;
+        if (!Array.isArray(data) || data.length === 0) break;
+
         // Transform database data to frontend format
-        const transformedCandidates = data.map((candidate, index) => ({
-          id: index + 1,
-          name: candidate.name || 'Unknown',
-          jobRole: candidate.job_role || 'Not Specified',
-          email_id: candidate.email_id || '',
-          mobile_number: candidate.mobile_number || 'N/A',
-          experience: formatExperience(candidate.get_yoe),
-          relevantExperience: formatExperience(candidate.get_ryoe),
-          location: candidate.get_location?.location || 'Not Specified',
-          skills: extractSkills(candidate.get_technical_constituent),
-          technologies: extractTechnologies(candidate.get_projects),
-          education: extractEducation(candidate.get_education),
-          current: extractCurrentJob(candidate.get_company),
-          previous: extractPreviousJob(candidate.get_company),
-          summary: candidate.get_summary_overview?.comment || '',
-          resumeScore: candidate.score_resume?.score || 0,
-          designation: candidate.get_designation?.current_designation || '',
-          addedDate: candidate.created_at ? new Date(candidate.created_at).toLocaleDateString('en-GB', { day: '2-digit', month: 'short', year: 'numeric' }) : new Date().toLocaleDateString('en-GB', { day: '2-digit', month: 'short', year: 'numeric' }),
-          status: 'Sourced',
-          avatar: `https://ui-avatars.com/api/?name=${encodeURIComponent(candidate.name || 'User')}&background=random`
-        }));
+        loaded = loaded.concat(data.map((candidate, index) => transformCandidate(candidate, loaded.length + index)));
         
         // Sort by resume score in descending order
-        const sortedCandidates = transformedCandidates.sort((a, b) => b.resumeScore - a.resumeScore);
-        console.log('Candidates sorted by resume score (descending):', sortedCandidates.map(c => ({name: c.name, score: c.resumeScore})));
-        
+        const sortedCandidates = [...loaded].sort((a, b) => b.resumeScore - a.resumeScore);
         setCandidates(sortedCandidates);
         
         // Update status counts (for now all are sourced)
         setStatusCounts({
-          sourced: transformedCandidates.length,
+          sourced: loaded.length,
           applied: 0,
           aptitude: 0,
           interview: 0,
           offer: 0,
           hire: 0
         });
-      } else {
+        setLoading(false);
+
+        // The server sends the cursor of the next page; the last page has none
+        if (!nextCursor) break;
+        cursor = nextCursor;
+      }
+
+      if (loaded.length === 0) {
         console.log('No candidates found in database');
         setCandidates([]);
       }
@@ -120,7 +148,7 @@ export default function RelevantCandidates() {
       console.error('Error loading candidates:', error);
       setCandidates([]);
     } finally {
-      setLoading(false);
+      if (request === loadRequest.current) setLoading(false);
     }
   };
 
@@ -216,6 +244,7 @@ export default function RelevantCandidates() {
     setSearchPerformed(true);
     
     let candidateData = [];
+    loadRequest.current++;
     
     try {
       // Format experience filter for backend
@@ -0,0 +1,6 @@
+import os
+
+# Modules read their configuration at import time; keep the suite off real services
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+os.environ.setdefault("TABLE_NAME", "resume_store")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
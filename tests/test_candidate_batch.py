@@ -0,0 +1,30 @@
+from sqlalchemy.dialects import postgresql
+from db_operations import utility_db
+from db_operations.utility_db import candidate_batch, upsert_many_statement
+
+
+def payload(name: str, email_id):
+    return {"input_data": {"name": name, "job_role": "Data Engineer", "resume_text": f"Resume of {name}"},
+            "getContacts": {"email_id": email_id, "mobile_number": None},
+            "getRecruitersOverview": {"bullets": [name]}}
+
+
+def test_rows_without_email_are_all_kept(monkeypatch):
+
+    monkeypatch.setattr(utility_db, "embed_overviews", lambda overviews: [[1.0, 0.0]] * len(overviews))
+    rows = candidate_batch([payload("A", "a@example.com"), payload("B", None), payload("C", None),
+                            payload("A2", "a@example.com")])
+
+    assert [(row["name"], row["email_id"]) for row in rows] == [("A2", "a@example.com"), ("B", None), ("C", None)]
+    assert all(row["embedding_dim"] == 2 for row in rows)
+
+
+def test_batch_is_one_multi_row_upsert(monkeypatch):
+
+    monkeypatch.setattr(utility_db, "embed_overviews", lambda overviews: [[1.0, 0.0]] * len(overviews))
+    rows = candidate_batch([payload("A", "a@example.com"), payload("B", "b@example.com"), payload("C", None)])
+
+    sql = str(upsert_many_statement("resume_store", rows).compile(dialect=postgresql.dialect()))
+    assert sql.count("INSERT INTO resume_store") == 1
+    assert sql.count("), (") == 2
+    assert "ON CONFLICT (email_id) DO UPDATE SET" in sql and "created_at = now()" in sql
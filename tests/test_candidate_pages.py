@@ -0,0 +1,77 @@
+import ast
+import asyncio
+import contextlib
+from collections import namedtuple
+from db_operations import utility_db
+from db_operations.utility_db import iter_candidates, anext_candidates_cursor, candidates_query
+
+Key = namedtuple("Key", ["email_id", "row_id"])
+
+TABLE = [{"email_id": "b@example.com", "name": "B", "ctid": "(0,2)"},
+         {"email_id": None, "name": "N1", "ctid": "(0,1)"},
+         {"email_id": "a@example.com", "name": "A", "ctid": "(0,4)"},
+         {"email_id": None, "name": "N2", "ctid": "(0,3)"},
+         {"email_id": None, "name": "N3", "ctid": "(1,1)"}]
+
+
+def run_query(sql, params):
+    """
+    Evaluates the queries of `candidates_query` on TABLE.
+    """
+    without_email = "email_id is null" in sql
+    key = (lambda row: ast.literal_eval(row["ctid"])) if without_email else (lambda row: row["email_id"])
+    bound = (lambda value: ast.literal_eval(value)) if without_email else (lambda value: value)
+
+    rows = sorted((row for row in TABLE if (row["email_id"] is None) == without_email), key=key)
+    if "cursor" in params:
+        rows = [row for row in rows if key(row) > bound(params["cursor"])]
+    if "until" in params:
+        rows = [row for row in rows if key(row) <= bound(params["until"])]
+    rows = rows[:params.get("limit")]
+    if "row_id" in sql:
+        return [Key(row["email_id"], row["ctid"]) for row in rows]
+    return [{"email_id": row["email_id"], "name": row["name"]} for row in rows]
+
+
+class FakeConnection:
+
+    async def execute(self, statement, params):
+        rows = run_query(str(statement), params)
+        return type("Result", (), {"all": lambda self: rows})()
+
+
+@contextlib.asynccontextmanager
+async def fake_connect():
+    yield FakeConnection()
+
+
+def test_pages_cover_rows_without_an_email(monkeypatch):
+
+    monkeypatch.setattr(utility_db, "candidate_columns", lambda: ["email_id", "name"])
+    monkeypatch.setattr(utility_db, "iter_records", lambda engine, sql, params, fetch_size: iter(run_query(sql, params)))
+    monkeypatch.setattr(utility_db, "aconnect", fake_connect)
+
+    pages, cursor = [], None
+    while True:
+        next_cursor = asyncio.run(anext_candidates_cursor(2, cursor))
+        if next_cursor:
+            page = list(iter_candidates(["name"], cursor = cursor, until = next_cursor))
+        else:
+            page = list(iter_candidates(["name"], 2, cursor))
+        pages.append([row["name"] for row in page])
+        if not next_cursor:
+            break
+        cursor = next_cursor
+
+    assert pages == [["A", "B"], ["N1", "N2"], ["N3"]]
+
+
+def test_keyset_queries_use_a_non_null_key():
+
+    sql, params = candidates_query(["email_id", "name"], cursor = "a@example.com", limit = 10)
+    assert "email_id is not null and email_id > :cursor order by email_id limit :limit" in sql
+    assert params == {"cursor": "a@example.com", "limit": 10}
+
+    sql, params = candidates_query(["email_id", "name"], cursor = "row:(0,3)", with_email = False)
+    assert "email_id is null and ctid > cast(:cursor as tid) order by ctid" in sql
+    assert params == {"cursor": "(0,3)"}
@@ -0,0 +1,156 @@
+import asyncio
+import dataclasses
+import pytest
+from ai_operations import analysis_engine
+from ai_operations.execution import invalid_fields, apply_patch, ainvoke_limited
+from ai_operations.model_router import ModelAlternatives
+from ai_operations.scheduler import llm_scheduler
+from ai_operations.utility_function import EducationHistory, ProjectEvaluationResult
+
+RESUME = {"resumeText": "Jane Doe\nEDUCATION\nB.Tech, IIT Delhi, 2014 - 2018\nPROJECTS\nResume parser", "jobRole": "Data Engineer"}
+
+
+def project(title, **overrides):
+    return {"title": title, "description": "", "technologies": ["python"], "score": 70, "color": "light green",
+            "comment": "Solid", "stage": "Production", **overrides}
+
+
+def degree(institution, **overrides):
+    return {"degree": "B.Tech", "institution": institution, "start_year": 2014, "end_year": 2018, **overrides}
+
+
+class FakeRunnable:
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    async def ainvoke(self, payload, config = None, **kwargs):
+        self.calls.append(payload)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def section(monkeypatch):
+
+    def install(name, chain, reasker):
+        monkeypatch.setitem(analysis_engine.ANALYSIS_SECTIONS, name,
+                            dataclasses.replace(analysis_engine.ANALYSIS_SECTIONS[name], runnable = chain))
+        monkeypatch.setattr(analysis_engine, "field_reask_chain", reasker)
+        return lambda: asyncio.run(analysis_engine._run_section(name, RESUME))
+
+    return install
+
+
+def test_invalid_fields_reports_list_entries():
+
+    assert invalid_fields(ProjectEvaluationResult, {"projects": [project("A"), project("B", stage = "Prod")]}) == ["projects[1]"]
+    assert invalid_fields(ProjectEvaluationResult, {"projects": "none"}) == ["projects"]
+    assert invalid_fields(EducationHistory, [degree("IIT"), degree("MIT", start_year = None)]) == ["[1]"]
+    assert invalid_fields(EducationHistory, {"education_history": []}) is None
+
+
+def test_apply_patch_replaces_only_the_listed_entries():
+
+    output = [degree("IIT"), degree("MIT", start_year = None)]
+    patched = apply_patch(output, ["[1]"], {"[1]": degree("MIT"), "[0]": "ignored"})
+    assert patched == [degree("IIT"), degree("MIT")]
+    assert output[1]["start_year"] is None
+
+
+def test_get_projects_reasks_only_the_invalid_entry(section):
+
+    chain = FakeRunnable({"projects": [project("Parser"), project("Search", stage = "Prod")]})
+    reasker = FakeRunnable({"projects[1]": project("Search")})
+    result = section("getProjects", chain, reasker)()
+
+    assert result == {"projects": [project("Parser"), project("Search")]}
+    assert len(chain.calls) == 1 and len(reasker.calls) == 1
+    assert reasker.calls[0]["fields"] == "projects[1]"
+
+
+def test_get_projects_keeps_entries_the_schema_rejects_without_full_retries(section):
+
+    chain = FakeRunnable({"projects": [project("Parser", stage = "Research")]})
+    reasker = FakeRunnable({"projects[0]": project("Parser", stage = "Research")})
+    result = section("getProjects", chain, reasker)()
+
+    assert result == {"projects": [project("Parser", stage = "Research")]}
+    assert len(chain.calls) == 1 and len(reasker.calls) == 1
+
+
+def test_get_projects_missing_key_is_repaired_by_reask(section):
+
+    incomplete = project("Parser")
+    del incomplete["stage"]
+    chain = FakeRunnable({"projects": [project("Search"), incomplete]})
+    reasker = FakeRunnable({"projects[1]": project("Parser")})
+    result = section("getProjects", chain, reasker)()
+
+    assert result == {"projects": [project("Search"), project("Parser")]}
+    assert len(chain.calls) == 1
+
+
+def test_get_education_reasks_the_entry_with_a_null_year(section):
+
+    chain = FakeRunnable([degree("IIT"), degree("MIT", start_year = None)])
+    reasker = FakeRunnable({"[1]": degree("MIT", start_year = 2018, end_year = 2020)})
+    result = section("getEducation", chain, reasker)()
+
+    assert result == [degree("IIT"), degree("MIT", start_year = 2018, end_year = 2020)]
+    assert len(chain.calls) == 1 and reasker.calls[0]["fields"] == "[1]"
+
+
+def test_get_education_accepts_a_null_year_when_the_reask_fails(section):
+
+    chain = FakeRunnable([degree("MIT", start_year = None)])
+    reasker = FakeRunnable(ValueError("unparseable"))
+    result = section("getEducation", chain, reasker)()
+
+    assert result == [degree("MIT", start_year = None)]
+    assert len(chain.calls) == 1
+
+
+def test_get_education_retries_output_of_the_wrong_shape(section):
+
+    chain = FakeRunnable({"education": "B.Tech"}, [degree("IIT")])
+    reasker = FakeRunnable({})
+    result = section("getEducation", chain, reasker)()
+
+    assert result == [degree("IIT")]
+    assert len(chain.calls) == 2 and not reasker.calls
+
+
+class ProviderError(Exception):
+
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def test_throttled_model_falls_back_under_the_fallback_schedule():
+
+    primary = FakeRunnable(ProviderError(429))
+    fallback = FakeRunnable({"name": "Jane Doe"})
+    runnable = ModelAlternatives({"test-primary": primary, "test-fallback": fallback})
+    result = asyncio.run(ainvoke_limited(runnable, {"resume_text": "Jane Doe"}, "test-primary",
+                                         fallbacks = ["test-fallback"]))
+
+    assert result == {"name": "Jane Doe"}
+    assert len(primary.calls) == 1 and len(fallback.calls) == 1
+    assert llm_scheduler.for_model("test-primary").counters["throttled"] == 1
+    assert llm_scheduler.for_model("test-fallback").counters["succeeded"] == 1
+
+
+def test_other_errors_do_not_fall_back():
+
+    primary = FakeRunnable(ValueError("bad prompt"))
+    fallback = FakeRunnable({"name": "Jane Doe"})
+    runnable = ModelAlternatives({"test-primary-other": primary, "test-fallback-other": fallback})
+
+    with pytest.raises(ValueError):
+        asyncio.run(ainvoke_limited(runnable, {}, "test-primary-other", fallbacks = ["test-fallback-other"]))
+    assert not fallback.calls
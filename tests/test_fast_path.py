@@ -0,0 +1,37 @@
+import pytest
+from ai_operations.fast_path import run_fast_path, fast_contacts, fast_names, extract_name, FAST_PATH_MIN_CONFIDENCE
+
+RESUME = """Jane Doe
+Email: jane-doe@example.com | Phone: +1 415 555 0134
+
+Experience
+Data engineer at Acme Corp, 2019 - present
+"""
+
+
+def test_hyphenated_email_is_kept():
+
+    output = run_fast_path("getContacts", fast_contacts, {"resumeText": RESUME})
+    assert output["email_id"] == "jane-doe@example.com"
+    assert output["mobile_number"] == "+1 415 555 0134"
+
+
+def test_text_is_nfkc_normalized():
+
+    # Full-width letters as some PDF extractors emit them
+    data = {"resumeText": RESUME.replace("jane-doe", "ｊａｎｅ-doe")}
+    assert run_fast_path("getContacts", fast_contacts, data)["email_id"] == "jane-doe@example.com"
+    assert run_fast_path("getNames", fast_names, data) == {"name": "Jane Doe"}
+
+
+@pytest.mark.parametrize("header", ["Machine Learning Engineer", "New Delhi", "Infosys Limited", "Bangalore Karnataka"])
+def test_header_without_email_is_left_to_the_llm(header):
+
+    text = f"{header}\nPhone: +91 98765 43210\n\nExperience\nData engineer at Acme Corp, 2019 - present\n"
+    assert extract_name(text)[1] < FAST_PATH_MIN_CONFIDENCE
+    assert run_fast_path("getNames", fast_names, {"resumeText": text}) is None
+
+
+def test_name_confirmed_by_the_email_is_served():
+
+    assert extract_name(RESUME) == ({"name": "Jane Doe"}, 0.95)
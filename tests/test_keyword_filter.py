@@ -0,0 +1,33 @@
+from db_operations.utility_db import keyword_filter, rank_candidates
+
+
+def test_plain_words_use_full_text_and_prefixes_are_explicit():
+
+    condition, relevance, params = keyword_filter(["java", "py*"])
+    assert "plainto_tsquery('english', :kw0)" in condition and params["kw0"] == "java"
+    assert "to_tsquery('english', :kw1)" in condition and params["kw1"] == "py:*"
+    assert relevance.startswith("ts_rank_cd(resume_tsv")
+
+
+def test_symbol_keywords_match_substrings_and_count_towards_relevance():
+
+    condition, relevance, params = keyword_filter(["c++", "node.js"])
+    assert condition == "(resume_raw_text ilike :kw0 or resume_raw_text ilike :kw1)"
+    assert params == {"kw0": "%c++%", "kw1": "%node.js%"}
+    assert relevance == "(resume_raw_text ilike :kw0)::int * 0.1 + (resume_raw_text ilike :kw1)::int * 0.1"
+
+
+def test_no_keywords_means_no_condition():
+
+    assert keyword_filter(["", "  "]) == (None, "0.0", {})
+
+
+def test_candidates_are_ranked_by_keyword_score_then_resume_score():
+
+    rows = [
+        {"email_id": "a", "keyword_score": 0.1, "score_resume": {"score": 90}},
+        {"email_id": "b", "keyword_score": 0.4, "score_resume": {"score": 50}},
+        {"email_id": "c", "keyword_score": 0.1, "score_resume": {"score": 95}},
+        {"email_id": "d", "keyword_score": 0.0, "score_resume": None},
+    ]
+    assert [row["email_id"] for row in rank_candidates(rows)] == ["b", "c", "a", "d"]
@@ -0,0 +1,68 @@
+import asyncio
+from ai_operations.llm_cache import LLMResultCache, cache_key
+
+
+def make_cache(tmp_path, **kwargs):
+    return LLMResultCache(path = str(tmp_path / "cache.sqlite3"), **{"max_bytes": 10_000, "ttl_seconds": 3600, **kwargs})
+
+
+def test_round_trip_through_worker_thread(tmp_path):
+
+    cache = make_cache(tmp_path)
+
+    async def scenario():
+        await cache.aset("key", {"name": "Jane Doe"})
+        return await cache.aget("key"), await cache.aget("missing")
+
+    assert asyncio.run(scenario()) == ({"name": "Jane Doe"}, None)
+    assert cache.counters["hits"] == 1 and cache.counters["misses"] == 1
+
+
+def test_running_size_follows_writes_and_replacements(tmp_path):
+
+    cache = make_cache(tmp_path)
+    cache.set("a", "x" * 100)
+    cache.set("b", "y" * 50)
+    cache.set("a", "z" * 10)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["size_bytes"] == cache._connection().execute("select sum(size) from llm_cache").fetchone()[0]
+
+
+def test_evicts_least_recently_used_when_over_budget(tmp_path):
+
+    cache = make_cache(tmp_path, max_bytes = 400)
+    for key in ("a", "b", "c"):
+        cache.set(key, "x" * 100)
+    cache.get("a")
+    cache.set("d", "x" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    assert cache.stats()["size_bytes"] <= 400
+
+
+def test_size_is_restored_when_reopened(tmp_path):
+
+    make_cache(tmp_path).set("a", "x" * 100)
+    assert make_cache(tmp_path).stats()["size_bytes"] == 102
+
+
+def test_expired_entries_are_swept(tmp_path):
+
+    cache = make_cache(tmp_path, sweep_interval = 0)
+    cache.set("a", "x")
+    cache._connection().execute("update llm_cache set created_at = created_at - 7200 where key = 'a'")
+    cache.set("b", "y")
+
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["size_bytes"] == 3
+    assert cache.counters["expirations"] == 1
+
+
+def test_schema_version_is_part_of_the_key():
+
+    fields = {"resumeText": "Jane Doe"}
+    assert cache_key("extract_names", "v1", "model", fields, "schema-1") != cache_key("extract_names", "v1", "model", fields, "schema-2")
+    assert cache_key("extract_names", "v1", "model", fields, "schema-1") == cache_key("extract_names", "v1", "model", fields, "schema-1")
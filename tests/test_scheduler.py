@@ -0,0 +1,54 @@
+import asyncio
+from ai_operations.scheduler import ModelScheduler
+
+
+def make_scheduler(max_concurrency: int = 1, rpm: int = 10_000):
+    return ModelScheduler("test-model", rpm = rpm, tpm = 10_000_000, max_concurrency = max_concurrency)
+
+
+def test_cancelled_queued_waiter_does_not_release_a_slot():
+
+    async def scenario():
+        scheduler = make_scheduler(max_concurrency = 1)
+        await scheduler.acquire(10)
+
+        waiter = asyncio.create_task(scheduler.acquire(10))
+        await asyncio.sleep(0)
+        assert scheduler.queued == 1
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions = True)
+        assert scheduler.inflight == 1 and scheduler.queued == 0
+
+        # The freed slot admits exactly one more caller
+        await scheduler.release("success")
+        await scheduler.acquire(10)
+        blocked = asyncio.create_task(scheduler.acquire(10))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        assert scheduler.inflight == 1
+
+        blocked.cancel()
+        await asyncio.gather(blocked, return_exceptions = True)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.inflight == 1
+
+
+def test_cancelled_admitted_call_releases_its_slot():
+
+    async def scenario():
+        scheduler = make_scheduler(max_concurrency = 1, rpm = 60)
+        scheduler.requests.tokens = 0.0
+        # Holds the slot while waiting for the request bucket to refill
+        waiter = asyncio.create_task(scheduler.acquire(10))
+        await asyncio.sleep(0.01)
+        assert scheduler.inflight == 1
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions = True)
+        return scheduler
+
+    scheduler = asyncio.run(scenario())
+    assert scheduler.inflight == 0 and scheduler.queued == 0
@@ -0,0 +1,26 @@
+from ai_operations.section_segmenter import route_sections
+
+RESUME = """Jane Doe
+jane@example.com
+
+Summary
+Backend engineer working on payment systems.
+
+Experience
+Acme Corp, Software Engineer, 2019 - present. Built the billing service.
+Initech, Intern, 2017 - 2018. Wrote internal tools.
+
+Education
+B.Tech Computer Science, IIT Delhi, 2014 - 2018
+
+Skills
+Python, PostgreSQL, Kafka
+"""
+
+
+def test_years_of_experience_prompt_gets_education():
+
+    routed, was_routed = route_sections("extract_yoe", RESUME)
+    assert was_routed
+    assert "Acme Corp" in routed and "IIT Delhi, 2014 - 2018" in routed
+    assert "PostgreSQL" not in routed
@@ -0,0 +1,73 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from fastapi.testclient import TestClient
+from action_server import StreamingGZipMiddleware
+
+BODY = "x" * 4096
+
+
+def make_client():
+
+    app = FastAPI()
+    app.add_middleware(StreamingGZipMiddleware, minimum_size=1024, live_paths=("/ndjson",))
+
+    async def lines():
+        for _ in range(4):
+            yield (BODY + "\n").encode()
+
+    @app.get("/ndjson")
+    def ndjson():
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/export")
+    def export():
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/sse")
+    def sse():
+        return StreamingResponse(lines(), media_type="text/event-stream")
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse(BODY)
+
+    return TestClient(app)
+
+
+def test_streams_are_not_compressed():
+
+    client = make_client()
+    for path in ("/ndjson", "/sse"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == (BODY + "\n") * 4
+
+
+def test_regular_responses_are_compressed():
+
+    response = make_client().get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == BODY
+
+
+def test_ndjson_exports_are_compressed():
+
+    response = make_client().get("/export", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == (BODY + "\n") * 4
+
+
+def test_candidates_ndjson_export_is_compressed(monkeypatch):
+
+    import action_server
+
+    async def rows(fields = None, limit = None, cursor = None, until = None):
+        for idx in range(50):
+            yield {"email_id": f"c{idx}@example.com", "name": BODY[:100]}
+
+    monkeypatch.setattr(action_server, "aiter_candidates", rows)
+    client = TestClient(action_server.app)
+    response = client.get("/getAllCandidates?format=ndjson", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.text.splitlines()) == 50
@@ -0,0 +1,22 @@
+from ai_operations.text_preprocessing import normalize_resume_text
+
+
+def test_word_hyphenated_across_a_line_break_is_joined():
+    assert normalize_resume_text("Led project manage-\nment for the team.") == "Led project management for the team."
+    assert normalize_resume_text("Product develop- \n ment.") == "Product development."
+
+
+def test_email_keeps_its_hyphen():
+    assert normalize_resume_text("Email: jane-doe@example.com") == "Email: jane-doe@example.com"
+    assert normalize_resume_text("Email: jane.smith-\nlee@example.com") == "Email: jane.smith-\nlee@example.com"
+
+
+def test_url_keeps_its_hyphen():
+    assert normalize_resume_text("https://github.com/jane/resume-parser") == "https://github.com/jane/resume-parser"
+    assert normalize_resume_text("https://example.com/data-\npipeline") == "https://example.com/data-\npipeline"
+
+
+def test_compound_words_on_one_line_are_unchanged():
+    text = "Built state-of-the-art, well-tested full-stack services"
+    assert normalize_resume_text(text) == text
+    assert normalize_resume_text("front- and back-end") == "front- and back-end"
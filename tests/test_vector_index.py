@@ -0,0 +1,95 @@
+import numpy as np
+from ai_operations.vector_index import IVFIndex
+
+
+def random_vectors(count: int, dim: int = 16, seed: int = 0):
+    return np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+
+
+def test_add_replace_remove():
+
+    vectors = random_vectors(3)
+    index = IVFIndex()
+    index.add(["a", "b", "c"], vectors)
+    assert len(index) == 3 and "b" in index
+    assert index.search(vectors[1], 1)[0] == ["b"]
+
+    # Replacing a key moves it to the new vector instead of adding a second row
+    index.add(["b"], [vectors[0]])
+    assert len(index) == 3
+    assert set(index.search(vectors[0], 2)[0]) == {"a", "b"}
+
+    index.remove(["a"])
+    assert "a" not in index and len(index) == 2
+    assert "a" not in index.search(vectors[0], 3)[0]
+
+
+def test_trained_search_restricted_to_allowed_keys():
+
+    vectors = random_vectors(400)
+    keys = [f"k{idx}" for idx in range(len(vectors))]
+    index = IVFIndex(n_lists=20, n_probe=1, min_train_size=100)
+    index.add(keys, vectors)
+    assert index.trained
+
+    # Allowed rows outside the probed cluster are still found by the exact fallback
+    allowed = {"k3", "k250", "k399"}
+    found, scores = index.search(vectors[3], 3, allowed=allowed)
+    assert set(found) == allowed and found[0] == "k3"
+    assert np.all(np.diff(scores) <= 0)
+
+    assert index.search(vectors[3], 3, allowed=set())[0] == []
+
+
+def test_save_load_round_trip(tmp_path):
+
+    vectors = random_vectors(300)
+    keys = [f"k{idx}" for idx in range(len(vectors))]
+    index = IVFIndex(n_lists=10, min_train_size=100)
+    index.add(keys, vectors)
+    index.remove(["k0"])
+
+    path = str(tmp_path / "index.npz")
+    index.save(path, embedding_model="test-model")
+    loaded, metadata = IVFIndex.load(path)
+
+    assert metadata == {"embedding_model": "test-model"}
+    assert len(loaded) == 299 and "k0" not in loaded and loaded.trained
+    for query in vectors[1:20]:
+        assert index.search(query, 5)[0] == loaded.search(query, 5)[0]
+
+
+def test_ranking_loads_embeddings_only_for_rows_outside_the_index(monkeypatch):
+
+    from ai_operations import utility_function
+
+    vectors = random_vectors(4)
+
+    class FakeEmbeddings:
+        def embed_query(self, text):
+            return vectors[0]
+
+    monkeypatch.setattr(utility_function, "get_embeddings", lambda: FakeEmbeddings())
+    monkeypatch.setattr(utility_function, "ANN_MIN_CANDIDATES", 0)
+
+    index = IVFIndex()
+    index.add(["a", "b"], vectors[:2])
+
+    def search(query, k, keys):
+        indexed = {key for key in keys if key in index}
+        found, scores = index.search(query, k, allowed=indexed)
+        return found, scores, indexed
+
+    loaded = []
+
+    def load_embeddings(rows):
+        loaded.extend(row["email_id"] for row in rows)
+        for row in rows:
+            row.update(overview_embedding=vectors[3].tolist(), embedding_model=utility_function.EMBEDDING_MODEL)
+
+    data = [{"email_id": key, "score_resume": {"score": score}} for key, score in (("a", 1), ("b", 2), ("c", 3))]
+    results = utility_function.refined_search_results(data, "job description", num_results=3,
+                                                      search=search, load_embeddings=load_embeddings)
+    assert loaded == ["c"]
+    assert [row["email_id"] for row in results] == ["c", "b", "a"]
+    assert all("overview_embedding" not in row for row in results)
@@ -0,0 +1,105 @@
+import os
+import json
+import glob
+import asyncio
+from db_operations.write_buffer import WriteBehindBuffer
+
+
+def spill_files(spill_dir):
+    return glob.glob(os.path.join(str(spill_dir), "*.jsonl"))
+
+
+def test_rows_that_keep_failing_are_dead_lettered(tmp_path):
+
+    written = []
+
+    async def flush(batch):
+        if any(payload["id"] == "bad" for payload in batch):
+            raise ValueError("bad row")
+        written.extend(payload["id"] for payload in batch)
+
+    async def scenario():
+        buffer = WriteBehindBuffer(flush, str(tmp_path), max_rows = 100, max_delay_ms = 1, max_retry_delay = 0.01,
+                                   max_attempts = 2)
+        for row_id in ("a", "bad", "b"):
+            await buffer.submit({"id": row_id})
+        for _ in range(3):
+            await buffer.flush()
+
+        assert written == ["a", "b"]
+        assert buffer.stats()["pending"] == 0 and buffer.counters["dead_lettered"] == 1
+        assert spill_files(tmp_path) == []
+        with open(glob.glob(os.path.join(buffer.dead_letter_dir, "*.jsonl"))[0]) as handle:
+            assert json.loads(handle.readline())["payload"] == {"id": "bad"}
+
+    asyncio.run(scenario())
+
+
+def test_outage_keeps_every_row(tmp_path):
+
+    async def flush(batch):
+        raise ConnectionError("database down")
+
+    async def scenario():
+        buffer = WriteBehindBuffer(flush, str(tmp_path), max_rows = 100, max_delay_ms = 1, max_retry_delay = 0.01,
+                                   max_attempts = 1)
+        for row_id in ("a", "b"):
+            await buffer.submit({"id": row_id})
+        for _ in range(3):
+            await buffer.flush()
+
+        assert buffer.stats()["pending"] == 2 and buffer.counters["dead_lettered"] == 0
+        assert len(spill_files(tmp_path)) == 1
+        buffer._timer.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_recover_skips_spill_files_of_a_live_worker(tmp_path):
+
+    written = []
+
+    async def failing(batch):
+        raise ConnectionError("database down")
+
+    async def flush(batch):
+        written.extend(payload["id"] for payload in batch)
+
+    async def scenario():
+        live = WriteBehindBuffer(failing, str(tmp_path), max_rows = 100, max_delay_ms = 10_000)
+        await live.submit({"id": "live"})
+
+        # A file left by a process that is gone
+        with open(os.path.join(str(tmp_path), "0.000000-1-dead.jsonl"), "w") as handle:
+            handle.write(json.dumps({"id": "orphan"}) + "\n")
+
+        other = WriteBehindBuffer(flush, str(tmp_path), max_rows = 100, max_delay_ms = 10_000)
+        await other.recover()
+
+        assert written == ["orphan"]
+        assert live.stats()["pending"] == 1 and len(spill_files(tmp_path)) == 1
+        live._timer.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_timer_flush_task_is_referenced(tmp_path):
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def flush(batch):
+            await release.wait()
+
+        buffer = WriteBehindBuffer(flush, str(tmp_path), max_rows = 100, max_delay_ms = 1)
+        await buffer.submit({"id": "a"})
+        await asyncio.sleep(0.05)
+
+        # The timer started a flush that is still running; the buffer holds on to its task
+        assert len(buffer._tasks) == 1
+        task = next(iter(buffer._tasks))
+        release.set()
+        await task
+        assert not buffer._tasks and buffer.counters["flushed"] == 1
+
+    asyncio.run(scenario())